@@ -1,13 +1,24 @@
 """API 라우트 정의"""
 
 import json
-from typing import Optional, List
+from typing import Any, Optional, List, Dict
 from fastapi import APIRouter, HTTPException, Request, Depends, Body
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from app.api.dependencies import verify_auth
-from app.services.stock_service import update_stock_prices
+from app.services.stock_service import validate_shard, UPDATE_PRICES_JOB
+from app.services.intraday_prices import rollup_intraday_prices
+from app.services.price_backfill import (
+    backfill_stock_prices,
+    validate_backfill_range,
+    BACKFILL_PRICES_JOB,
+)
+from app.services.job_manager import JOB_CANCELLED, JOB_SUCCEEDED, Job, job_manager
+from app.services.price_gaps import fill_price_gaps, update_stock_prices_with_gap_fill
+from app.services.quote_providers import quote_router
+from app.services.symbol_quarantine import get_quarantined_symbols
+from app.services.yahoo_session import yahoo_session
 from app.services.listings.fdr_listings import sync_stock_names
 from app.services.exchange_rates_service import sync_exchange_rates, resolve_symbol
 from app.services.apt_sales_service import sync_apt_sales
@@ -15,10 +26,17 @@ from app.repositories.supabase_client import (
     get_stock_name_by_symbol,
     get_exchange_rate,
     get_exchange_rate_history,
+    get_symbol_failures,
+    get_today_date,
 )
+from app.utils.blocking_executor import blocking_executor
+from app.utils.rate_limiter import rate_limiters
 from app.utils.logging_config import get_logger
 from app.utils.slack_notifier import send_slack_error_log
-from app.exceptions import StockPriceUpdaterException
+from app.exceptions import (
+    JobConflictException,
+    ValidationException,
+)
 
 logger = get_logger(__name__)
 
@@ -28,6 +46,15 @@ router = APIRouter()
 class UpdatePricesRequest(BaseModel):
     symbols: Optional[List[str]] = None
     country: Optional[str] = None
+    # 여러 인스턴스/스케줄러 작업으로 나눠 처리할 때의 샤드 (심볼 해시 기준)
+    shard_index: Optional[int] = None
+    shard_count: Optional[int] = None
+    # 기준 거래일 데이터가 이미 있어도 다시 조회 (값이 바뀐 행만 저장)
+    refresh: bool = False
+    # managed_stocks 갱신 등급(hot/warm/cold)별 주기가 지난 심볼만 조회
+    tiered: bool = False
+    # 장중 스냅샷 모드 (일별 행 대신 stock_price_ticks에 시간 버킷 단위로 저장)
+    intraday: bool = False
 
 
 class SymbolResult(BaseModel):
@@ -41,7 +68,58 @@ class UpdatePricesResponse(BaseModel):
     total: int
     successCount: int
     failureCount: int
+    writtenCount: int = 0
+    skippedUnchangedCount: int = 0
+    # 다른 실행이 리스를 잡고 있어 조회하지 않은 심볼 수 (성공/실패에 포함하지 않음)
+    deferredCount: int = 0
     results: List[SymbolResult]
+    # 일별 배치 직후 실행한 누락 거래일 재수집 결과 (실행하지 않았으면 None)
+    gapFill: Optional[Dict[str, Any]] = None
+
+
+class FillPriceGapsRequest(BaseModel):
+    symbols: Optional[List[str]] = None
+    country: Optional[str] = None
+
+
+class FillPriceGapsResponse(BaseModel):
+    success: bool
+    startDate: str
+    scannedSymbols: int
+    gapSymbols: int
+    gapCount: int
+    targetSymbols: int
+    filledCount: int
+    failed: Dict[str, str]
+
+
+class RollupIntradayPricesRequest(BaseModel):
+    country: str
+    date: Optional[str] = None
+
+
+class RollupIntradayPricesResponse(BaseModel):
+    success: bool
+    country: str
+    date: str
+    symbols: int
+    upserted: int
+    failed: Dict[str, str]
+    deletedTicks: int
+
+
+class BackfillPricesRequest(BaseModel):
+    start_date: str
+    # 생략하면 오늘까지
+    end_date: Optional[str] = None
+    symbols: Optional[List[str]] = None
+    country: Optional[str] = None
+
+
+class JobSubmitResponse(BaseModel):
+    jobId: str
+    status: str
+    merged: bool
 
 
 class SyncStocksNameRequest(BaseModel):
@@ -85,6 +163,19 @@ class ExchangeRateResponse(BaseModel):
     name: Optional[str] = None
 
 
+class QuarantinedSymbol(BaseModel):
+    symbol: str
+    failureCount: int
+    lastError: Optional[str] = None
+    lastFailedAt: Optional[str] = None
+    nextRetryAt: Optional[str] = None
+
+
+class QuarantinedSymbolsResponse(BaseModel):
+    total: int
+    symbols: List[QuarantinedSymbol]
+
+
 class SyncAptSalesRequest(BaseModel):
     lawd_codes: Optional[List[str]] = None
     deal_ym: Optional[str] = None
@@ -108,6 +199,92 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@router.get("/stats")
+async def runtime_stats():
+    """런타임 상태 엔드포인트 (업스트림별 rate limiter/블로킹 호출 스레드 풀 대기열, 시세 제공자 상태 등)"""
+    return {
+        "rateLimiters": {name: limiter.stats() for name, limiter in rate_limiters.items()},
+        "blockingExecutor": blocking_executor.stats(),
+        "quoteProviders": quote_router.stats(),
+        "yahooSession": yahoo_session.stats(),
+        "jobs": job_manager.stats(),
+    }
+
+
+@router.get("/quarantined-symbols", response_model=QuarantinedSymbolsResponse)
+async def get_quarantined_symbols_endpoint():
+    """
+    연속 실패로 격리 중인 심볼 목록을 조회합니다.
+    격리된 심볼은 다음 재시도 시각(nextRetryAt) 전까지 가격 업데이트에서 조회하지 않습니다.
+    """
+    try:
+        quarantined = get_quarantined_symbols(await get_symbol_failures())
+        symbols = [
+            QuarantinedSymbol(
+                symbol=symbol,
+                failureCount=failure.get("failure_count") or 0,
+                lastError=failure.get("last_error"),
+                lastFailedAt=failure.get("last_failed_at"),
+                nextRetryAt=failure.get("next_retry_at"),
+            )
+            for symbol, failure in sorted(quarantined.items())
+        ]
+        return QuarantinedSymbolsResponse(total=len(symbols), symbols=symbols)
+    except Exception as e:
+        error_message = f"격리 심볼 조회 중 오류가 발생했습니다: {str(e)}"
+        logger.error(error_message, exc_info=True)
+        send_slack_error_log(None, e)
+        raise HTTPException(status_code=500, detail=error_message)
+
+
+def _submit_update_prices_job(
+    request_body: Optional[UpdatePricesRequest],
+) -> tuple[Job, bool]:
+    """
+    가격 업데이트를 job_manager에 등록합니다 (동기/백그라운드 엔드포인트 공통).
+    같은 파라미터로 실행 중이면 기존 작업에 합치고, 샤드가 잘못되면 400, 다른 파라미터로
+    실행 중이면 409를 반환합니다.
+    """
+    # request_body가 None이면 빈 요청으로 처리
+    request_symbols = request_body.symbols if request_body else None
+    country = request_body.country if request_body else None
+    shard_index = request_body.shard_index if request_body else None
+    shard_count = request_body.shard_count if request_body else None
+    refresh = request_body.refresh if request_body else False
+    tiered = request_body.tiered if request_body else False
+    intraday = request_body.intraday if request_body else False
+    try:
+        validate_shard(shard_index, shard_count)
+    except ValidationException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        return job_manager.submit(
+            UPDATE_PRICES_JOB,
+            lambda job: update_stock_prices_with_gap_fill(
+                request_symbols=request_symbols,
+                country=country,
+                shard_index=shard_index,
+                shard_count=shard_count,
+                refresh=refresh,
+                tiered=tiered,
+                intraday=intraday,
+                job=job,
+            ),
+            params={
+                "symbols": request_symbols,
+                "country": country,
+                "shardIndex": shard_index,
+                "shardCount": shard_count,
+                "refresh": refresh,
+                "tiered": tiered,
+                "intraday": intraday,
+            },
+        )
+    except JobConflictException as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
 @router.post("/update-prices", response_model=UpdatePricesResponse)
 async def update_prices(
     request_body: Optional[UpdatePricesRequest] = Body(None),
@@ -118,42 +295,151 @@ async def update_prices(
 
     성능 최적화:
     1. managed_stocks에서 활성화된 심볼 목록 조회 (쿼리 1번)
-    2. stock_prices에서 오늘 날짜 데이터를 한 번에 조회 (쿼리 1번)
+    2. stock_prices에서 심볼별 기준 거래일 데이터를 한 번에 조회 (쿼리 1번)
     3. 메모리에서 비교하여 실제 API 호출이 필요한 심볼만 필터링
     4. 각 심볼에 대해 개별 try-except로 실패 격리
+    5. shard_index/shard_count 지정 시 해당 샤드의 심볼만 처리
+    6. 일별 배치면 이어서 최근 누락 거래일을 찾아 심볼별 기간 조회로 재수집
+
+    백그라운드 작업(/update-prices/jobs)과 같은 job_manager에 등록하고 끝날 때까지 기다리므로,
+    같은 파라미터로 실행 중인 작업이 있으면 그 결과를 함께 받고 다른 파라미터면 409를 반환합니다.
     """
-    try:
-        # request_body가 None이면 빈 요청으로 처리
-        request_symbols = request_body.symbols if request_body else None
-        country = request_body.country if request_body else None
+    job, _merged = _submit_update_prices_job(request_body)
+    await job_manager.wait(job)
 
-        result = await update_stock_prices(
-            request_symbols=request_symbols,
-            country=country,
+    if job.status == JOB_CANCELLED:
+        raise HTTPException(status_code=503, detail=job.error)
+    if job.status != JOB_SUCCEEDED or job.result is None:
+        raise HTTPException(
+            status_code=500,
+            detail=f"배치 작업 중 오류가 발생했습니다: {job.error}",
         )
+    return UpdatePricesResponse(**job.result)
 
-        return UpdatePricesResponse(**result)
 
-    except json.JSONDecodeError as e:
-        error_message = f"JSON 파싱 오류가 발생했습니다: {str(e)}"
-        logger.error(f"JSON 디코드 오류 (배치 작업): {str(e)}", exc_info=True)
-        send_slack_error_log(None, e)
-        raise HTTPException(
-            status_code=500,
-            detail=error_message,
+@router.post("/update-prices/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_update_prices_job(
+    request_body: Optional[UpdatePricesRequest] = Body(None),
+    _: bool = Depends(verify_auth),
+):
+    """
+    주식 가격 업데이트를 백그라운드 작업으로 시작하고 작업 ID를 즉시 반환합니다.
+
+    - 진행 상황은 GET /jobs/{job_id}로 조회
+    - 같은 파라미터로 실행 중인 작업이 있으면 해당 작업 ID를 반환 (merged=true)
+    - 다른 파라미터로 실행 중인 작업이 있으면 409
+    """
+    job, merged = _submit_update_prices_job(request_body)
+    return JobSubmitResponse(jobId=job.id, status=job.status, merged=merged)
+
+
+@router.post("/backfill-prices", response_model=JobSubmitResponse, status_code=202)
+async def submit_backfill_prices_job(
+    request_body: BackfillPricesRequest,
+    _: bool = Depends(verify_auth),
+):
+    """
+    지정한 기간의 과거 일별 종가를 stock_prices에 채우는 백필을 백그라운드 작업으로 시작합니다.
+
+    - 심볼을 지정하지 않으면 update-prices와 같이 환경변수/managed_stocks 심볼 사용
+    - 진행 상황과 결과는 GET /jobs/{job_id}로 조회
+    - 중단된 백필은 같은 파라미터로 다시 호출하면 남은 심볼부터 이어서 처리
+    - 기간이 잘못되면 400, 다른 파라미터로 실행 중인 백필이 있으면 409
+    """
+    end_date = request_body.end_date or get_today_date()
+    try:
+        validate_backfill_range(request_body.start_date, end_date)
+    except ValidationException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    params = {
+        "symbols": request_body.symbols,
+        "country": request_body.country,
+        "startDate": request_body.start_date,
+        "endDate": end_date,
+    }
+    try:
+        job, merged = job_manager.submit(
+            BACKFILL_PRICES_JOB,
+            lambda job: backfill_stock_prices(
+                start_date=request_body.start_date,
+                end_date=end_date,
+                request_symbols=request_body.symbols,
+                country=request_body.country,
+                job=job,
+            ),
+            params=params,
         )
-    except StockPriceUpdaterException as e:
-        error_message = str(e)
-        logger.error(f"배치 작업 중 오류 발생: {error_message}", exc_info=True)
-        send_slack_error_log(None, e)
-        raise HTTPException(
-            status_code=500,
-            detail=error_message,
+    except JobConflictException as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return JobSubmitResponse(jobId=job.id, status=job.status, merged=merged)
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, _: bool = Depends(verify_auth)):
+    """백그라운드 작업의 상태, 진행 상황, 단계별 소요 시간, 결과를 조회합니다."""
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job.to_dict()
+
+
+@router.post("/fill-price-gaps", response_model=FillPriceGapsResponse)
+async def fill_price_gaps_endpoint(
+    request_body: Optional[FillPriceGapsRequest] = Body(None),
+    _: bool = Depends(verify_auth),
+):
+    """
+    최근 GAP_SCAN_LOOKBACK_DAYS일 동안 stock_prices에 빠진 (심볼, 거래일)을 찾아 다시 채웁니다.
+
+    일별 /update-prices 직후 자동으로 실행되며, 수동으로 다시 돌릴 때 사용합니다.
+    가격 업데이트와 같은 행을 쓰므로 같은 작업 종류(update-prices)로 job_manager에 등록하고
+    끝날 때까지 기다립니다. 같은 파라미터로 실행 중이면 그 결과를 함께 받고,
+    가격 업데이트나 다른 파라미터의 재수집이 실행 중이면 409를 반환합니다.
+    """
+    request_symbols = request_body.symbols if request_body else None
+    country = request_body.country if request_body else None
+    try:
+        job, _merged = job_manager.submit(
+            UPDATE_PRICES_JOB,
+            lambda job: fill_price_gaps(
+                request_symbols=request_symbols, country=country, job=job
+            ),
+            params={"gapFillOnly": True, "symbols": request_symbols, "country": country},
         )
+    except JobConflictException as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    await job_manager.wait(job)
+
+    if job.status == JOB_CANCELLED:
+        raise HTTPException(status_code=503, detail=job.error)
+    if job.status != JOB_SUCCEEDED or job.result is None:
+        raise HTTPException(status_code=500, detail=job.error)
+    return FillPriceGapsResponse(**job.result)
+
+
+@router.post("/rollup-intraday-prices", response_model=RollupIntradayPricesResponse)
+async def rollup_intraday_prices_endpoint(
+    request_body: RollupIntradayPricesRequest,
+    _: bool = Depends(verify_auth),
+):
+    """
+    장 마감 후 심볼별 마지막 장중 스냅샷(stock_price_ticks)을 stock_prices 일별 행으로 반영합니다.
+
+    date를 지정하지 않으면 해당 국가에서 장이 끝난 가장 최근 거래일을 사용합니다.
+    """
+    try:
+        result = await rollup_intraday_prices(
+            country=request_body.country.upper(), date=request_body.date
+        )
+        return RollupIntradayPricesResponse(**result)
     except Exception as e:
-        error_message = f"배치 작업 중 오류가 발생했습니다: {str(e)}"
+        error_message = f"장중 스냅샷 롤업 중 오류가 발생했습니다: {str(e)}"
         logger.error(
-            f"배치 작업 중 예상치 못한 오류 발생: {str(error_message)}", exc_info=True
+            f"장중 스냅샷 롤업 중 예상치 못한 오류 발생: {str(error_message)}",
+            exc_info=True,
         )
         send_slack_error_log(None, e)
         raise HTTPException(
@@ -6,6 +6,7 @@ class Settings(BaseSettings):
     # Supabase 설정
     supabase_url: str
     supabase_anon_key: str
+    supabase_timeout_seconds: int = 30
 
     # 인증
     cron_secret: str
@@ -16,18 +17,114 @@ class Settings(BaseSettings):
     # 오버라이드용 심볼 목록 (선택사항)
     stock_symbols: Optional[str] = None
 
+    # 임시 휴장일 추가 (선택사항, 쉼표로 구분된 YYYY-MM-DD 목록)
+    market_holidays_kr: Optional[str] = None
+    market_holidays_us: Optional[str] = None
+
     # Slack Webhook 설정 (선택사항)
     slack_webhook_url: Optional[str] = None
 
     # CORS 설정 (선택사항, 쉼표로 구분된 도메인 목록)
     allowed_origins: Optional[str] = None
 
-    # Rate Limiting 설정
-    min_request_delay_ms: int = 200
-    max_concurrent_requests: int = 3
+    # Rate Limiting 설정 (업스트림별 토큰 버킷: 초당 요청 수 / 버스트 / 동시 실행 수)
+    yahoo_rate_per_sec: float = 5.0
+    yahoo_burst: int = 1
+    yahoo_max_concurrent: int = 3
+    fdr_listing_rate_per_sec: float = 1.0
+    fdr_listing_burst: int = 2
+    fdr_listing_max_concurrent: int = 2
+    fdr_reader_rate_per_sec: float = 5.0
+    fdr_reader_burst: int = 2
+    fdr_reader_max_concurrent: int = 3
+    data_go_rate_per_sec: float = 10.0
+    data_go_burst: int = 5
+    data_go_max_concurrent: int = 4
+    # 429 응답 시 AIMD 속도 조절 (감소 배율, 성공 1회당 속도 증가량, 최저 속도 비율,
+    # 연속 429를 한 번으로 보는 시간, 동시 실행 한도를 1 올리는 연속 성공 횟수)
+    rate_limit_decrease_factor: float = 0.5
+    rate_limit_increase_per_success: float = 0.05
+    rate_limit_min_rate_fraction: float = 0.05
+    rate_limit_decrease_cooldown_seconds: float = 2.0
+    rate_limit_concurrency_probe_successes: int = 20
+    # 공통 재시도 정책 (총 시도 횟수 = max_retries + 1, full jitter 백오프)
     max_retries: int = 3
     initial_retry_delay_ms: int = 1000
     max_retry_delay_ms: int = 10000
+    # 가격 업데이트 배치의 시세 조회 단계 데드라인 (초, 0이면 제한 없음)
+    batch_deadline_seconds: int = 300
+
+    # Yahoo 개별 시세 조회 방식 ("fast": fast_info 차트 응답, "info": 전체 ticker.info)
+    yahoo_quote_mode: str = "fast"
+    # fast 모드에서 가격을 얻지 못한 심볼을 ticker.info로 한 번 더 조회할지 여부
+    yahoo_info_fallback: bool = False
+    # Yahoo 인증(crumb) 실패 시 crumb 재발급 최소 간격 (초)
+    yahoo_crumb_refresh_interval_seconds: int = 30
+
+    # 배치 시세 조회 설정 (yfinance 멀티 티커 download)
+    quote_batch_size: int = 100
+    quote_batch_threads: int = 4
+
+    # KRX 전 종목 종가 스냅샷 캐시 유지 시간 (초)
+    krx_snapshot_ttl_seconds: int = 300
+
+    # 시세 제공자 라우팅 (국가:제공자 우선순위; 제공자: yahoo, fdr, fake)
+    quote_provider_routes: str = "KR:fdr,yahoo;US:yahoo,fdr;*:yahoo"
+    # 제공자 장애 전환 기준 (최근 window개 결과 중 오류 비율이 error_rate 이상이면 cooldown 동안 건너뜀)
+    provider_health_window: int = 50
+    provider_failover_min_samples: int = 10
+    provider_failover_error_rate: float = 0.5
+    provider_cooldown_seconds: int = 300
+
+    # 배치 작업 단계별 동시성 (시세 조회 / DB 저장)
+    fetch_concurrency: int = 3
+    save_concurrency: int = 5
+
+    # 연속 실패 심볼 격리 (threshold회 연속 실패부터 base분 → 2배씩 → 최대 max분 동안 조회 생략)
+    symbol_failure_threshold: int = 3
+    symbol_cooldown_base_minutes: int = 60
+    symbol_cooldown_max_minutes: int = 60 * 24 * 7
+    # 한 실행에서 이 비율 이상이 실패하면 업스트림 장애로 보고 실패 기록을 남기지 않음
+    symbol_failure_max_ratio: float = 0.5
+
+    # managed_stocks.refresh_tier별 갱신 주기 (분, tiered 실행 시 이 시간이 지난 심볼만 조회)
+    refresh_tier_hot_minutes: int = 15
+    refresh_tier_warm_minutes: int = 240
+    refresh_tier_cold_minutes: int = 1440
+
+    # 장중 스냅샷 모드 (stock_price_ticks 시간 버킷 크기, 보관 기간, 롤업 시 마지막 스냅샷 탐색 범위)
+    intraday_bucket_minutes: int = 5
+    intraday_tick_retention_days: int = 7
+    intraday_rollup_lookback_minutes: int = 120
+
+    # 가격 업데이트 체크포인트 단위 (이 개수만큼 조회/저장할 때마다 update_runs 갱신)
+    update_checkpoint_chunk_size: int = 200
+    # 조회 단계와 저장 단계 사이 큐에 쌓아 둘 수 있는 최대 청크 수 (백프레셔)
+    update_pipeline_queue_size: int = 2
+
+    # 여러 인스턴스가 같은 날 같은 심볼을 중복 조회하지 않도록 stock_price_leases 리스 사용
+    stock_price_lease_enabled: bool = True
+    stock_price_lease_ttl_seconds: int = 900
+
+    # 과거 가격 백필 (기간 조회 1회/체크포인트 1회에 묶는 심볼 수, 동시에 처리하는 청크 수, 최대 기간 일수)
+    backfill_symbols_per_chunk: int = 100
+    backfill_concurrency: int = 2
+    backfill_max_days: int = 3660
+
+    # 누락 거래일 탐지/재수집 (탐지 기간 일수, 한 번에 재수집할 최대 심볼 수 (0이면 제한 없음),
+    # 가격 업데이트 직후 자동 실행 여부)
+    gap_scan_lookback_days: int = 30
+    gap_fill_max_symbols: int = 500
+    gap_fill_after_update: bool = True
+
+    # stock_prices 대량 upsert 청크 크기
+    stock_price_upsert_chunk_size: int = 500
+
+    # 블로킹 외부 호출(yfinance, FinanceDataReader) 전용 스레드 풀 크기
+    blocking_executor_workers: int = 8
+
+    # 백그라운드 작업 기록 보관 개수 (GET /jobs/{job_id} 조회 대상)
+    job_history_limit: int = 50
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -29,3 +29,13 @@ class AuthenticationException(StockPriceUpdaterException):
 class ValidationException(StockPriceUpdaterException):
     """데이터 검증 관련 예외"""
     pass
+
+
+class DeadlineExceededException(StockPriceUpdaterException):
+    """배치 데드라인 초과 예외"""
+    pass
+
+
+class JobConflictException(StockPriceUpdaterException):
+    """같은 종류의 작업이 다른 파라미터로 이미 실행 중인 경우의 예외"""
+    pass
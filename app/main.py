@@ -16,12 +16,23 @@ logger = get_logger(__name__)
 async def lifespan(app: FastAPI):
     """서버 시작/종료 시 실행되는 이벤트 핸들러"""
     # Startup
-    from app.repositories.supabase_client import load_symbol_cache
+    from app.repositories.supabase_client import (
+        close_supabase_client,
+        get_supabase_client,
+        load_symbol_cache,
+    )
 
+    await get_supabase_client()
     await load_symbol_cache()
     logger.info("서버 시작 완료: 심볼 캐시 로드됨")
     yield
-    # Shutdown (필요한 경우 여기에 정리 코드 추가 가능)
+    # Shutdown
+    from app.services.job_manager import job_manager
+    from app.utils.blocking_executor import blocking_executor
+
+    await job_manager.shutdown()
+    await close_supabase_client()
+    blocking_executor.shutdown()
 
 
 # FastAPI 앱 생성
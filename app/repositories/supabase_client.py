@@ -1,16 +1,48 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, List
-from supabase import create_client, Client
+from postgrest.types import CountMethod, ReturnMethod
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
 from app.config import settings
 from app.utils.logging_config import get_logger
+from app.utils.market_calendar import get_session_date, get_trading_date
+from app.utils.retry import retry_async
 from app.utils.slack_notifier import send_slack_error_log
 from app.exceptions import SupabaseException
 import json
 
 logger = get_logger(__name__)
 
-# Supabase 클라이언트 초기화.
-supabase: Client = create_client(settings.supabase_url, settings.supabase_anon_key)
+# Supabase 비동기 클라이언트 (지연 초기화).
+# PostgREST 호출은 클라이언트가 보유한 단일 httpx.AsyncClient(keep-alive 커넥션 풀)를 재사용합니다.
+_supabase_client: Optional[AsyncClient] = None
+_supabase_client_lock = asyncio.Lock()
+
+
+async def get_supabase_client() -> AsyncClient:
+    """Supabase 비동기 클라이언트 반환 (최초 호출 시 생성)"""
+    global _supabase_client
+    if _supabase_client is None:
+        async with _supabase_client_lock:
+            if _supabase_client is None:
+                _supabase_client = await acreate_client(
+                    settings.supabase_url,
+                    settings.supabase_anon_key,
+                    options=AsyncClientOptions(
+                        auto_refresh_token=False,
+                        persist_session=False,
+                        postgrest_client_timeout=settings.supabase_timeout_seconds,
+                    ),
+                )
+    return _supabase_client
+
+
+async def close_supabase_client() -> None:
+    """Supabase 비동기 클라이언트의 HTTP 커넥션 풀 종료"""
+    global _supabase_client
+    if _supabase_client is not None:
+        await _supabase_client.postgrest.aclose()
+        _supabase_client = None
 
 
 def get_today_date() -> str:
@@ -30,12 +62,30 @@ def get_yesterday_date() -> str:
     return yesterday.strftime("%Y-%m-%d")
 
 
-async def get_managed_stocks(country: Optional[str] = None) -> List[Dict[str, str]]:
+async def _execute_with_retry(query, label: str):
+    """
+    PostgREST 요청 실행 (타임아웃/5xx 등 일시적 오류는 공통 재시도 정책으로 재시도)
+
+    요청 빌더는 execute를 다시 호출해도 같은 요청을 보내므로 그대로 재시도합니다.
+    """
+    return await retry_async(query.execute, label)
+
+
+async def get_managed_stocks(
+    country: Optional[str] = None,
+    due_cutoffs: Optional[Dict[str, str]] = None,
+) -> List[Dict[str, str]]:
     """
     managed_stocks 테이블에서 활성화된 심볼 목록 조회
     country가 있으면 해당 국가만, 없으면 전체 조회
+
+    Args:
+        country: 국가 필터
+        due_cutoffs: 갱신 등급(refresh_tier)별 기준 시각. 지정하면 last_fetched_at이 없거나
+            해당 등급의 기준 시각보다 오래된 심볼만 하나의 OR 조건 쿼리로 조회
     """
     try:
+        supabase = await get_supabase_client()
         # symbol과 country를 같이 조회해야 나중에 저장할 때 국가를 알 수 있습니다.
         query = (
             supabase.table("managed_stocks")
@@ -47,7 +97,15 @@ async def get_managed_stocks(country: Optional[str] = None) -> List[Dict[str, st
         if country:
             query = query.eq("country", country)
 
-        response = query.execute()
+        # 갱신 주기가 지난 심볼만 조회 (enabled, refresh_tier, last_fetched_at 인덱스 사용)
+        if due_cutoffs:
+            clauses = ["last_fetched_at.is.null"] + [
+                f"and(refresh_tier.eq.{tier},last_fetched_at.lt.{cutoff})"
+                for tier, cutoff in due_cutoffs.items()
+            ]
+            query = query.or_(",".join(clauses))
+
+        response = await _execute_with_retry(query, "managed_stocks 조회")
 
         # 결과 데이터를 딕셔너리 리스트로 변환
         stocks = [
@@ -58,7 +116,8 @@ async def get_managed_stocks(country: Optional[str] = None) -> List[Dict[str, st
         # 로그에는 심볼만 예쁘게 출력
         symbols_only = [s["symbol"] for s in stocks]
         logger.info(
-            f"활성화된 종목 {len(stocks)}개 조회 (국가: {country}): {symbols_only}"
+            f"활성화된 종목 {len(stocks)}개 조회 (국가: {country}"
+            f"{', 갱신 주기 도래분만' if due_cutoffs else ''}): {symbols_only}"
         )
 
         return stocks
@@ -76,6 +135,39 @@ async def get_managed_stocks(country: Optional[str] = None) -> List[Dict[str, st
         raise SupabaseException(error_message) from e
 
 
+async def touch_managed_stocks_fetched(symbols: List[str]) -> tuple[int, Optional[str]]:
+    """
+    조회한 심볼의 managed_stocks.last_fetched_at을 현재 시각으로 갱신합니다.
+
+    Args:
+        symbols: 시세 조회에 성공한 심볼 목록
+
+    Returns:
+        tuple[int, Optional[str]]: (갱신된 개수, 에러 메시지)
+    """
+    if not symbols:
+        return 0, None
+
+    try:
+        supabase = await get_supabase_client()
+        now = datetime.now(timezone.utc).isoformat()
+        updated = 0
+        batch_size = 100
+        for i in range(0, len(symbols), batch_size):
+            response = await _execute_with_retry(
+                supabase.table("managed_stocks")
+                .update({"last_fetched_at": now})
+                .in_("symbol", symbols[i : i + batch_size]),
+                "managed_stocks last_fetched_at 갱신",
+            )
+            updated += len(response.data) if response.data else 0
+        return updated, None
+    except Exception as e:
+        error_msg = f"managed_stocks last_fetched_at 갱신 실패: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return 0, error_msg
+
+
 async def get_today_stock_prices(symbols: List[str]) -> Dict[str, dict]:
     """
     오늘 날짜의 주식 가격을 한 번에 조회 (N+1 문제 방지)
@@ -93,8 +185,9 @@ async def get_today_stock_prices(symbols: List[str]) -> Dict[str, dict]:
     response = None
 
     try:
+        supabase = await get_supabase_client()
         # 오늘 날짜로 한 번에 조회
-        response = (
+        response = await (
             supabase.table("stock_prices")
             .select("*")
             .in_("symbol", normalized_symbols)
@@ -129,6 +222,115 @@ async def get_today_stock_prices(symbols: List[str]) -> Dict[str, dict]:
     return result
 
 
+async def get_stock_prices_for_dates(symbol_dates: Dict[str, str]) -> Dict[str, dict]:
+    """
+    심볼별 기준 거래일의 주식 가격을 한 번에 조회 (N+1 문제 방지)
+
+    심볼마다 기준 날짜가 다를 수 있으므로(KR/US 거래일 차이),
+    심볼 IN + 날짜 IN 조건으로 한 번에 조회한 뒤 메모리에서 (symbol, date)를 맞춰봅니다.
+
+    Args:
+        symbol_dates: 심볼을 키로 하는 기준 거래일 (YYYY-MM-DD)
+
+    Returns:
+        Dict[symbol, quote_data]: 기준 거래일 데이터가 있는 심볼만 포함
+    """
+    if not symbol_dates:
+        return {}
+
+    normalized = {s.strip().upper(): d for s, d in symbol_dates.items()}
+    symbols = list(normalized.keys())
+    dates = sorted(set(normalized.values()))
+
+    result: Dict[str, dict] = {}
+
+    try:
+        supabase = await get_supabase_client()
+        # 심볼당 최대 len(dates)개 행이 반환되므로 PostgREST 기본 행 제한(1000)을 넘지 않도록 나누어 조회
+        batch_size = max(1, 1000 // len(dates))
+        for i in range(0, len(symbols), batch_size):
+            batch_symbols = symbols[i : i + batch_size]
+            response = await _execute_with_retry(
+                supabase.table("stock_prices")
+                .select("*")
+                .in_("symbol", batch_symbols)
+                .in_("date", dates),
+                "stock_prices 기준 거래일 조회",
+            )
+
+            for row in response.data:
+                symbol = row["symbol"].upper()
+                if normalized.get(symbol) != row["date"]:
+                    continue
+                result[symbol] = {
+                    "symbol": symbol,
+                    "price": float(row["close_price"]),
+                    "currency": row.get("currency"),
+                    "name": row.get("name"),
+                    "changePercent": (
+                        float(row["change_percent"])
+                        if row.get("change_percent") is not None
+                        else None
+                    ),
+                    **ohlcv_from_row(row),
+                }
+
+        logger.info(f"기준 거래일 데이터 {len(result)}개 조회 완료 (날짜: {dates})")
+    except Exception as e:
+        logger.error(f"stock_prices 조회 실패: {str(e)}", exc_info=True)
+        # 에러가 발생해도 조회된 만큼 반환하여 계속 진행
+
+    return result
+
+
+async def get_stock_price_dates(
+    start_date: str, end_date: str, symbols: List[str]
+) -> Dict[str, set]:
+    """
+    기간 안에 stock_prices 행이 있는 날짜를 심볼별로 조회합니다 (누락 거래일 탐지용).
+
+    지정한 심볼만 100개씩 나누어 (symbol, date) 두 컬럼을 페이지 단위로 조회하며,
+    조회 실패 시 누락으로 잘못 판단하지 않도록 예외를 그대로 올립니다.
+
+    Args:
+        start_date: 시작일 (YYYY-MM-DD, 포함)
+        end_date: 종료일 (YYYY-MM-DD, 포함)
+        symbols: 조회할 심볼 목록
+
+    Returns:
+        Dict[str, set]: 심볼별 저장된 날짜(YYYY-MM-DD) 집합
+    """
+    stored: Dict[str, set] = {}
+    if not symbols:
+        return stored
+
+    normalized_symbols = [s.strip().upper() for s in symbols]
+    page_size = 1000
+    batch_size = 100
+    supabase = await get_supabase_client()
+    for i in range(0, len(normalized_symbols), batch_size):
+        batch_symbols = normalized_symbols[i : i + batch_size]
+        offset = 0
+        while True:
+            response = await _execute_with_retry(
+                supabase.table("stock_prices")
+                .select("symbol, date")
+                .in_("symbol", batch_symbols)
+                .gte("date", start_date)
+                .lte("date", end_date)
+                .order("symbol")
+                .order("date")
+                .range(offset, offset + page_size - 1),
+                "stock_prices 저장 날짜 조회",
+            )
+            for row in response.data:
+                stored.setdefault(row["symbol"].upper(), set()).add(row["date"])
+            if len(response.data) < page_size:
+                break
+            offset += page_size
+    return stored
+
+
 async def get_stock_price_from_db(symbol: str) -> Optional[dict]:
     """
     단일 심볼의 주식 종가 조회 (호환성 유지)
@@ -139,8 +341,9 @@ async def get_stock_price_from_db(symbol: str) -> Optional[dict]:
     yesterday = get_yesterday_date()
 
     try:
+        supabase = await get_supabase_client()
         # 먼저 오늘 날짜로 조회
-        response = (
+        response = await (
             supabase.table("stock_prices")
             .select("*")
             .eq("symbol", normalized_symbol)
@@ -162,7 +365,7 @@ async def get_stock_price_from_db(symbol: str) -> Optional[dict]:
             }
 
         # 오늘 데이터가 없으면 어제 날짜로 조회
-        response = (
+        response = await (
             supabase.table("stock_prices")
             .select("*")
             .eq("symbol", normalized_symbol)
@@ -192,6 +395,65 @@ async def get_stock_price_from_db(symbol: str) -> Optional[dict]:
         return None
 
 
+def get_stock_price_target_date(country: Optional[str] = None) -> str:
+    """
+    국가별 stock_prices 저장 날짜 계산
+
+    미국 주식은 시차 때문에 어제 날짜, 그 외 국가는 오늘 날짜 (한국 시간 기준)이며,
+    주말/휴장일이면 시장 캘린더 기준 직전 거래일을 사용합니다.
+    """
+    return get_trading_date(country)
+
+
+def ohlcv_from_row(row: dict) -> dict:
+    """stock_prices/stock_price_ticks 행의 시가/고가/저가/거래량을 quote_data 키로 변환"""
+    return {
+        key: (
+            (int(row[column]) if key == "volume" else float(row[column]))
+            if row.get(column) is not None
+            else None
+        )
+        for key, column in (
+            ("open", "open_price"),
+            ("high", "high_price"),
+            ("low", "low_price"),
+            ("volume", "volume"),
+        )
+    }
+
+
+def build_stock_price_record(
+    symbol: str,
+    quote_data: dict,
+    date: Optional[str] = None,
+    country: Optional[str] = None,
+) -> dict:
+    """
+    quote_data를 stock_prices upsert용 레코드로 변환
+
+    Args:
+        symbol: 종목 코드
+        quote_data: 가격 데이터
+        date: 저장할 날짜 (None이면 국가 기준으로 자동 계산)
+        country: 국가 코드
+
+    Returns:
+        dict: stock_prices 레코드
+    """
+    return {
+        "symbol": symbol.strip().upper(),
+        "date": date or get_stock_price_target_date(country),
+        "close_price": quote_data["price"],
+        "currency": quote_data.get("currency"),
+        "name": quote_data.get("name"),
+        "change_percent": quote_data.get("changePercent"),
+        "open_price": quote_data.get("open"),
+        "high_price": quote_data.get("high"),
+        "low_price": quote_data.get("low"),
+        "volume": quote_data.get("volume"),
+    }
+
+
 async def save_stock_price_to_db(
     symbol: str,
     quote_data: dict,
@@ -211,32 +473,14 @@ async def save_stock_price_to_db(
     Returns:
         tuple[bool, Optional[str]]: (성공 여부, 에러 메시지)
     """
-    normalized_symbol = symbol.strip().upper()
-
-    # date가 명시되지 않았을 때만 자동 계산
-    if not date:
-        if country == "US":
-            # 미국 주식은 시차 때문에 어제 날짜 사용
-            target_date = get_yesterday_date()
-        else:
-            # 그 외 국가는 오늘 날짜 사용
-            target_date = get_today_date()
-    else:
-        target_date = date
+    data = build_stock_price_record(symbol, quote_data, date=date, country=country)
+    target_date = data["date"]
 
     response = None
 
     try:
-        data = {
-            "symbol": normalized_symbol,
-            "date": target_date,
-            "close_price": quote_data["price"],
-            "currency": quote_data.get("currency"),
-            "name": quote_data.get("name"),
-            "change_percent": quote_data.get("changePercent"),
-        }
-
-        response = (
+        supabase = await get_supabase_client()
+        response = await (
             supabase.table("stock_prices")
             .upsert(data, on_conflict="symbol,date")
             .execute()
@@ -279,6 +523,215 @@ async def save_stock_price_to_db(
         return False, error_msg
 
 
+async def _upsert_chunk(table: str, chunk: List[dict], on_conflict: str) -> int:
+    """
+    청크 1개 upsert (일시적 오류는 공통 재시도 정책으로 재시도)
+    저장한 행을 돌려받지 않도록 minimal로 요청하며, 성공하면 청크의 모든 행이 저장된 것으로 셉니다.
+    """
+    supabase = await get_supabase_client()
+    await _execute_with_retry(
+        supabase.table(table).upsert(
+            chunk, on_conflict=on_conflict, returning=ReturnMethod.minimal
+        ),
+        f"{table} 청크 upsert ({len(chunk)}개)",
+    )
+    return len(chunk)
+
+
+async def _bulk_upsert_by_symbol(
+    table: str, records: List[dict], key_fields: tuple[str, ...]
+) -> tuple[int, Dict[str, str]]:
+    """
+    청크 단위 대량 upsert 공통 처리
+
+    청크 크기는 settings.stock_price_upsert_chunk_size, 동시 청크 수는
+    settings.save_concurrency로 조절합니다. 청크마다 재시도하며,
+    재시도 후에도 실패한 청크의 심볼만 실패로 반환합니다.
+
+    Args:
+        table: 테이블 이름
+        records: symbol 필드를 가진 레코드 리스트
+        key_fields: 유니크 키 컬럼 (on_conflict)
+
+    Returns:
+        tuple[int, Dict[str, str]]: (upsert된 개수, 실패한 심볼별 에러 메시지)
+    """
+    if not records:
+        return 0, {}
+
+    # 같은 키가 한 요청에 두 번 들어가면 upsert가 실패하므로 마지막 값만 유지
+    unique_records = list({tuple(r[f] for f in key_fields): r for r in records}.values())
+
+    chunk_size = max(1, settings.stock_price_upsert_chunk_size)
+    chunks = [
+        unique_records[i : i + chunk_size]
+        for i in range(0, len(unique_records), chunk_size)
+    ]
+    semaphore = asyncio.Semaphore(max(1, settings.save_concurrency))
+    on_conflict = ",".join(key_fields)
+
+    upserted_total = 0
+    failed: Dict[str, str] = {}
+
+    async def process_chunk(chunk_no: int, chunk: List[dict]):
+        nonlocal upserted_total
+        async with semaphore:
+            try:
+                upserted = await _upsert_chunk(table, chunk, on_conflict)
+                upserted_total += upserted
+                logger.info(
+                    f"{table} {upserted}개 레코드 upsert 완료 "
+                    f"(청크 {chunk_no}/{len(chunks)})"
+                )
+            except Exception as e:
+                error_msg = f"Supabase 저장 실패: {getattr(e, 'message', None) or str(e)}"
+                logger.error(
+                    f"{table} 청크 {chunk_no}/{len(chunks)} upsert 실패 "
+                    f"({len(chunk)}개 심볼): {str(e)}",
+                    exc_info=True,
+                )
+                send_slack_error_log(None, e)
+                for record in chunk:
+                    failed[record["symbol"]] = error_msg
+
+    await asyncio.gather(
+        *[process_chunk(no, chunk) for no, chunk in enumerate(chunks, start=1)]
+    )
+
+    return upserted_total, failed
+
+
+async def upsert_stock_prices(records: List[dict]) -> tuple[int, Dict[str, str]]:
+    """
+    stock_prices 테이블에 청크 단위 대량 upsert를 수행합니다.
+
+    Args:
+        records: build_stock_price_record로 만든 레코드 리스트
+
+    Returns:
+        tuple[int, Dict[str, str]]: (upsert된 개수, 실패한 심볼별 에러 메시지)
+    """
+    return await _bulk_upsert_by_symbol("stock_prices", records, ("symbol", "date"))
+
+
+def build_stock_price_tick_record(
+    symbol: str,
+    quote_data: dict,
+    bucket_start: datetime,
+    country: Optional[str] = None,
+) -> dict:
+    """
+    quote_data를 stock_price_ticks upsert용 레코드로 변환 (장중 스냅샷)
+
+    Args:
+        symbol: 종목 코드
+        quote_data: 가격 데이터
+        bucket_start: 시간 버킷 시작 시각 (UTC)
+        country: 국가 코드
+
+    Returns:
+        dict: stock_price_ticks 레코드
+    """
+    return {
+        "symbol": symbol.strip().upper(),
+        "country": country,
+        "date": get_session_date(country, bucket_start),
+        "bucket_start": bucket_start.isoformat(),
+        "price": quote_data["price"],
+        "change_percent": quote_data.get("changePercent"),
+        "currency": quote_data.get("currency"),
+        "open_price": quote_data.get("open"),
+        "high_price": quote_data.get("high"),
+        "low_price": quote_data.get("low"),
+        "volume": quote_data.get("volume"),
+    }
+
+
+async def upsert_stock_price_ticks(records: List[dict]) -> tuple[int, Dict[str, str]]:
+    """
+    stock_price_ticks 테이블에 장중 스냅샷을 청크 단위 대량 upsert합니다.
+    (같은 버킷 안에서 다시 조회하면 해당 버킷 행만 갱신)
+
+    Args:
+        records: build_stock_price_tick_record로 만든 레코드 리스트
+
+    Returns:
+        tuple[int, Dict[str, str]]: (upsert된 개수, 실패한 심볼별 에러 메시지)
+    """
+    return await _bulk_upsert_by_symbol(
+        "stock_price_ticks", records, ("symbol", "bucket_start")
+    )
+
+
+async def get_latest_stock_price_ticks(
+    country: str, date: str, since: str
+) -> Dict[str, dict]:
+    """
+    세션 날짜의 심볼별 마지막 장중 스냅샷을 조회합니다.
+
+    since 이후 버킷만 최신순으로 페이지 단위 조회하여 심볼별 첫 행만 남깁니다.
+
+    Args:
+        country: 국가 코드
+        date: 세션 날짜 (YYYY-MM-DD)
+        since: 조회할 가장 이른 버킷 시각 (ISO 8601)
+
+    Returns:
+        Dict[str, dict]: 심볼별 마지막 스냅샷 (price, change_percent, currency, bucket_start,
+            open_price, high_price, low_price, volume)
+    """
+    latest: Dict[str, dict] = {}
+    page_size = 1000
+    supabase = await get_supabase_client()
+    offset = 0
+    while True:
+        response = await _execute_with_retry(
+            supabase.table("stock_price_ticks")
+            .select(
+                "symbol, bucket_start, price, change_percent, currency, "
+                "open_price, high_price, low_price, volume"
+            )
+            .eq("country", country)
+            .eq("date", date)
+            .gte("bucket_start", since)
+            .order("bucket_start", desc=True)
+            .range(offset, offset + page_size - 1),
+            "stock_price_ticks 조회",
+        )
+        for row in response.data:
+            latest.setdefault(row["symbol"].upper(), row)
+        if len(response.data) < page_size:
+            break
+        offset += page_size
+    return latest
+
+
+async def delete_stock_price_ticks_before(date: str) -> tuple[int, Optional[str]]:
+    """
+    보관 기간이 지난 장중 스냅샷을 삭제합니다.
+
+    Args:
+        date: 이 날짜(YYYY-MM-DD) 이전 세션의 스냅샷 삭제
+
+    Returns:
+        tuple[int, Optional[str]]: (삭제된 개수, 에러 메시지)
+    """
+    try:
+        supabase = await get_supabase_client()
+        # 삭제 행을 응답으로 돌려받지 않고 개수만 받음
+        response = await _execute_with_retry(
+            supabase.table("stock_price_ticks")
+            .delete(count=CountMethod.exact, returning=ReturnMethod.minimal)
+            .lt("date", date),
+            "stock_price_ticks 삭제",
+        )
+        return response.count or 0, None
+    except Exception as e:
+        error_msg = f"stock_price_ticks 삭제 실패: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return 0, error_msg
+
+
 async def get_stock_name_by_symbol(
     symbol: str, fields: Optional[List[str]] = None
 ) -> Optional[dict]:
@@ -295,6 +748,7 @@ async def get_stock_name_by_symbol(
     normalized_symbol = symbol.strip().upper()
 
     try:
+        supabase = await get_supabase_client()
         # fields가 지정되면 해당 필드만 조회, 없으면 모든 필드 조회
         # symbol은 항상 포함되어야 하므로 자동으로 추가
         if fields:
@@ -304,7 +758,7 @@ async def get_stock_name_by_symbol(
         else:
             select_str = "*"
 
-        response = (
+        response = await (
             supabase.table("stock_names")
             .select(select_str)
             .eq("symbol", normalized_symbol)
@@ -353,7 +807,8 @@ async def upsert_stock_names(records: List[dict]) -> tuple[int, Optional[str]]:
         return 0, None
 
     try:
-        response = (
+        supabase = await get_supabase_client()
+        response = await (
             supabase.table("stock_names")
             .upsert(records, on_conflict="symbol")
             .execute()
@@ -382,12 +837,13 @@ async def get_active_stock_symbols_by_country(
         List[str]: 활성화된 심볼 리스트
     """
     try:
+        supabase = await get_supabase_client()
         query = supabase.table("stock_names").select("symbol").eq("is_active", True)
 
         if country:
             query = query.eq("country", country)
 
-        response = query.execute()
+        response = await query.execute()
 
         symbols = [row["symbol"] for row in response.data]
         logger.info(f"활성화된 종목 {len(symbols)}개 조회 (국가: {country})")
@@ -423,7 +879,8 @@ async def deactivate_missing_stocks(
             return 0
 
         # 비활성화
-        response = (
+        supabase = await get_supabase_client()
+        response = await (
             supabase.table("stock_names")
             .update({"is_active": False})
             .in_("symbol", missing_symbols)
@@ -451,6 +908,7 @@ async def get_exchange_rate(symbol: str, date: Optional[str] = None) -> Optional
         Optional[dict]: 환율 데이터 (없으면 None)
     """
     try:
+        supabase = await get_supabase_client()
         query = supabase.table("exchange_rates").select("*").eq("symbol", symbol)
 
         if date:
@@ -458,7 +916,7 @@ async def get_exchange_rate(symbol: str, date: Optional[str] = None) -> Optional
         else:
             query = query.order("date", desc=True).limit(1)
 
-        response = query.execute()
+        response = await query.execute()
 
         if response.data:
             row = response.data[0]
@@ -496,7 +954,8 @@ async def get_exchange_rate_history(
         List[dict]: 시계열 데이터 리스트
     """
     try:
-        response = (
+        supabase = await get_supabase_client()
+        response = await (
             supabase.table("exchange_rates")
             .select("*")
             .eq("symbol", symbol)
@@ -532,28 +991,36 @@ async def get_exchange_rate_history(
 
 # 심볼 캐시 (메모리)
 SYMBOL_CACHE: Dict[str, str] = {}
+# 심볼 → 메타데이터(name, currency) 캐시 (시세 조회 시 종목명을 업스트림 대신 여기서 채움)
+SYMBOL_METADATA_CACHE: Dict[str, dict] = {}
 
 
 async def load_symbol_cache() -> None:
     """
     서버 시작 시 stock_names 테이블에서 심볼 캐시를 로드합니다.
-    이름→심볼, 심볼→심볼 매핑을 메모리에 저장합니다.
+    이름→심볼, 심볼→심볼 매핑과 심볼→메타데이터(name, currency)를 메모리에 저장합니다.
     """
     try:
-        response = (
+        supabase = await get_supabase_client()
+        response = await (
             supabase.table("stock_names")
-            .select("symbol, name")
+            .select("symbol, name, currency")
             .eq("is_active", True)
             .execute()
         )
 
         SYMBOL_CACHE.clear()
+        SYMBOL_METADATA_CACHE.clear()
         for row in response.data:
             symbol = row["symbol"]
             name = row.get("name")
 
             # 심볼 → 심볼 매핑
             SYMBOL_CACHE[symbol] = symbol
+            SYMBOL_METADATA_CACHE[symbol.upper()] = {
+                "name": name,
+                "currency": row.get("currency"),
+            }
 
             # 이름 → 심볼 매핑
             if name:
@@ -590,7 +1057,8 @@ async def get_max_date(symbol: str) -> Optional[str]:
         Optional[str]: 최대 날짜 (YYYY-MM-DD 형식, 없으면 None)
     """
     try:
-        response = (
+        supabase = await get_supabase_client()
+        response = await (
             supabase.table("exchange_rates")
             .select("date")
             .eq("symbol", symbol)
@@ -621,7 +1089,8 @@ async def upsert_exchange_rates(records: List[dict]) -> tuple[int, Optional[str]
         return 0, None
 
     try:
-        response = (
+        supabase = await get_supabase_client()
+        response = await (
             supabase.table("exchange_rates")
             .upsert(records, on_conflict="symbol,date")
             .execute()
@@ -645,7 +1114,8 @@ async def get_active_exchange_rate_symbols() -> List[str]:
         List[str]: 활성화된 심볼 리스트
     """
     try:
-        response = (
+        supabase = await get_supabase_client()
+        response = await (
             supabase.table("stock_names")
             .select("symbol")
             .eq("is_active", True)
@@ -672,7 +1142,8 @@ async def get_symbol_metadata(symbol: str) -> Optional[dict]:
         Optional[dict]: 메타데이터 (name, currency 등, 없으면 None)
     """
     try:
-        response = (
+        supabase = await get_supabase_client()
+        response = await (
             supabase.table("stock_names")
             .select("name, currency")
             .eq("symbol", symbol)
@@ -693,6 +1164,284 @@ async def get_symbol_metadata(symbol: str) -> Optional[dict]:
         return None
 
 
+async def get_symbols_metadata(symbols: List[str]) -> Dict[str, dict]:
+    """
+    stock_names 테이블에서 여러 심볼의 메타데이터를 한 번에 조회합니다. (N+1 문제 방지)
+    SYMBOL_METADATA_CACHE에 있는 심볼은 DB를 조회하지 않습니다.
+
+    Args:
+        symbols: 심볼 목록
+
+    Returns:
+        Dict[str, dict]: 심볼을 키로 하는 메타데이터 (name, currency)
+    """
+    if not symbols:
+        return {}
+
+    normalized_symbols = [s.strip().upper() for s in symbols]
+    result: Dict[str, dict] = {
+        s: SYMBOL_METADATA_CACHE[s]
+        for s in normalized_symbols
+        if s in SYMBOL_METADATA_CACHE
+    }
+    missing_symbols = [s for s in normalized_symbols if s not in result]
+    if not missing_symbols:
+        return result
+
+    try:
+        supabase = await get_supabase_client()
+        # 심볼 목록을 100개씩 나누어 조회 (Supabase 제약)
+        batch_size = 100
+        for i in range(0, len(missing_symbols), batch_size):
+            batch_symbols = missing_symbols[i : i + batch_size]
+            response = await _execute_with_retry(
+                supabase.table("stock_names")
+                .select("symbol, name, currency")
+                .in_("symbol", batch_symbols),
+                "stock_names 메타데이터 조회",
+            )
+            for row in response.data:
+                metadata = {
+                    "name": row.get("name"),
+                    "currency": row.get("currency"),
+                }
+                result[row["symbol"].upper()] = metadata
+                SYMBOL_METADATA_CACHE[row["symbol"].upper()] = metadata
+
+        return result
+    except Exception as e:
+        logger.error(f"심볼 메타데이터 일괄 조회 실패: {str(e)}", exc_info=True)
+        return result
+
+
+async def get_symbol_failures() -> Dict[str, dict]:
+    """
+    symbol_failures 테이블 전체를 조회합니다.
+    (연속 실패 중인 심볼만 저장되고 성공 시 삭제되므로 행 수가 작습니다.)
+
+    Returns:
+        Dict[str, dict]: 심볼을 키로 하는 실패 기록
+            (failure_count, last_error, last_failed_at, next_retry_at)
+    """
+    try:
+        supabase = await get_supabase_client()
+        response = await _execute_with_retry(
+            supabase.table("symbol_failures")
+            .select("symbol, failure_count, last_error, last_failed_at, next_retry_at"),
+            "symbol_failures 조회",
+        )
+        return {row["symbol"].upper(): row for row in response.data}
+    except Exception as e:
+        logger.error(f"symbol_failures 조회 실패: {str(e)}", exc_info=True)
+        return {}
+
+
+async def upsert_symbol_failures(records: List[dict]) -> tuple[int, Optional[str]]:
+    """
+    symbol_failures 테이블에 실패 기록을 대량 upsert합니다.
+
+    Args:
+        records: {symbol, failure_count, last_error, last_failed_at, next_retry_at} 리스트
+
+    Returns:
+        tuple[int, Optional[str]]: (upsert된 개수, 에러 메시지)
+    """
+    if not records:
+        return 0, None
+
+    try:
+        supabase = await get_supabase_client()
+        response = await _execute_with_retry(
+            supabase.table("symbol_failures")
+            .upsert(records, on_conflict="symbol"),
+            "symbol_failures upsert",
+        )
+        return len(response.data) if response.data else 0, None
+    except Exception as e:
+        error_msg = f"symbol_failures upsert 실패: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return 0, error_msg
+
+
+async def delete_symbol_failures(symbols: List[str]) -> tuple[int, Optional[str]]:
+    """
+    다시 성공한 심볼의 실패 기록을 삭제합니다.
+
+    Args:
+        symbols: 삭제할 심볼 목록
+
+    Returns:
+        tuple[int, Optional[str]]: (삭제된 개수, 에러 메시지)
+    """
+    if not symbols:
+        return 0, None
+
+    try:
+        supabase = await get_supabase_client()
+        deleted = 0
+        batch_size = 100
+        for i in range(0, len(symbols), batch_size):
+            response = await _execute_with_retry(
+                supabase.table("symbol_failures")
+                .delete()
+                .in_("symbol", symbols[i : i + batch_size]),
+                "symbol_failures 삭제",
+            )
+            deleted += len(response.data) if response.data else 0
+        return deleted, None
+    except Exception as e:
+        error_msg = f"symbol_failures 삭제 실패: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return 0, error_msg
+
+
+async def get_update_run(run_key: str) -> Optional[dict]:
+    """
+    update_runs 테이블에서 가격 업데이트 실행 체크포인트를 조회합니다.
+
+    Args:
+        run_key: 실행 키 (요청 파라미터 + 날짜 해시)
+
+    Returns:
+        Optional[dict]: 체크포인트 (status, pending, done, total) 또는 None
+    """
+    try:
+        supabase = await get_supabase_client()
+        response = await _execute_with_retry(
+            supabase.table("update_runs")
+            .select("run_key, status, pending, done, total, updated_at")
+            .eq("run_key", run_key)
+            .limit(1),
+            "update_runs 조회",
+        )
+        return response.data[0] if response.data else None
+    except Exception as e:
+        logger.error(f"update_runs 조회 실패 ({run_key}): {str(e)}", exc_info=True)
+        return None
+
+
+async def upsert_update_run(record: dict) -> tuple[int, Optional[str]]:
+    """
+    update_runs 테이블에 실행 체크포인트를 저장합니다.
+
+    Args:
+        record: {run_key, status, params, pending, done, total, updated_at}
+
+    Returns:
+        tuple[int, Optional[str]]: (upsert된 개수, 에러 메시지)
+    """
+    try:
+        supabase = await get_supabase_client()
+        response = await _execute_with_retry(
+            supabase.table("update_runs")
+            .upsert(record, on_conflict="run_key"),
+            "update_runs upsert",
+        )
+        return len(response.data) if response.data else 0, None
+    except Exception as e:
+        error_msg = f"update_runs upsert 실패 ({record.get('run_key')}): {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return 0, error_msg
+
+
+async def acquire_stock_price_leases(
+    symbol_dates: Dict[str, str], owner: str, ttl_seconds: int
+) -> tuple[List[str], Optional[str]]:
+    """
+    stock_price_leases 테이블로 (심볼, 기준 거래일) 리스를 획득합니다.
+
+    만료된 리스를 정리한 뒤 ignore_duplicates upsert로 비어 있는 리스만 생성하고,
+    owner가 일치하는 리스(이번에 생성했거나 같은 owner가 이전에 잡아 둔 것)를 획득한 것으로 봅니다.
+
+    Args:
+        symbol_dates: 심볼을 키로 하는 기준 거래일 (YYYY-MM-DD)
+        owner: 리스 소유자 (실행 호출마다 고유)
+        ttl_seconds: 리스 유효 시간 (초)
+
+    Returns:
+        tuple[List[str], Optional[str]]: (획득한 심볼 목록, 에러 메시지)
+    """
+    if not symbol_dates:
+        return [], None
+
+    symbols = list(symbol_dates.keys())
+    now = datetime.now(timezone.utc)
+    try:
+        supabase = await get_supabase_client()
+        # 1. 만료된 리스 정리
+        await _execute_with_retry(
+            supabase.table("stock_price_leases")
+            .delete()
+            .in_("symbol", symbols)
+            .lt("expires_at", now.isoformat()),
+            "만료된 stock_price_leases 정리",
+        )
+        # 2. 비어 있는 리스만 생성 (이미 있으면 무시)
+        expires_at = (now + timedelta(seconds=ttl_seconds)).isoformat()
+        await _execute_with_retry(
+            supabase.table("stock_price_leases")
+            .upsert(
+                [
+                    {"symbol": symbol, "date": date, "owner": owner, "expires_at": expires_at}
+                    for symbol, date in symbol_dates.items()
+                ],
+                on_conflict="symbol,date",
+                ignore_duplicates=True,
+            ),
+            "stock_price_leases 생성",
+        )
+        # 3. 내 리스 확인
+        response = await _execute_with_retry(
+            supabase.table("stock_price_leases")
+            .select("symbol, date")
+            .in_("symbol", symbols)
+            .eq("owner", owner),
+            "stock_price_leases 확인",
+        )
+        acquired = [
+            row["symbol"]
+            for row in response.data
+            if symbol_dates.get(row["symbol"]) == row["date"]
+        ]
+        return acquired, None
+    except Exception as e:
+        error_msg = f"stock_price_leases 획득 실패: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return [], error_msg
+
+
+async def release_stock_price_leases(
+    symbols: List[str], owner: str
+) -> tuple[int, Optional[str]]:
+    """
+    owner가 잡고 있는 심볼 리스를 해제합니다 (저장이 끝난 심볼).
+
+    Args:
+        symbols: 해제할 심볼 목록
+        owner: 리스 소유자
+
+    Returns:
+        tuple[int, Optional[str]]: (해제된 개수, 에러 메시지)
+    """
+    if not symbols:
+        return 0, None
+    try:
+        supabase = await get_supabase_client()
+        response = await _execute_with_retry(
+            supabase.table("stock_price_leases")
+            .delete(count=CountMethod.exact, returning=ReturnMethod.minimal)
+            .in_("symbol", symbols)
+            .eq("owner", owner),
+            "stock_price_leases 해제",
+        )
+        return response.count or 0, None
+    except Exception as e:
+        # 해제에 실패해도 TTL이 지나면 만료되므로 배치는 계속 진행
+        error_msg = f"stock_price_leases 해제 실패: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return 0, error_msg
+
+
 async def get_bjd_codes(
     lawd_codes: Optional[List[str]] = None, priority: Optional[int] = 1
 ) -> List[str]:
@@ -708,6 +1457,7 @@ async def get_bjd_codes(
         List[str]: 법정동코드 리스트
     """
     try:
+        supabase = await get_supabase_client()
         # 명시적으로 법정동코드가 지정된 경우 그대로 반환
         if lawd_codes:
             logger.info(f"명시적으로 지정된 법정동코드 {len(lawd_codes)}개 사용")
@@ -720,7 +1470,7 @@ async def get_bjd_codes(
             # gte(1)로 1 이상만 조회하고 lte로 상한 제한
             query = query.gte("priority", 1).lte("priority", priority)
 
-        response = query.execute()
+        response = await query.execute()
 
         codes = [row["region_cd_5"] for row in response.data if row.get("region_cd_5")]
         logger.info(f"법정동코드 {len(codes)}개 조회 완료 (priority<={priority})")
@@ -743,7 +1493,8 @@ async def get_locatadd_nm(lawd_code: str) -> Optional[str]:
         Optional[str]: 법정동명 (예: "서울특별시 종로구")
     """
     try:
-        response = (
+        supabase = await get_supabase_client()
+        response = await (
             supabase.table("bjd_code")
             .select("locatadd_nm")
             .eq("region_cd_5", lawd_code)
@@ -777,6 +1528,7 @@ async def upsert_apt_sales(records: List[dict]) -> tuple[int, int, int, Optional
         return 0, 0, 0, None
 
     try:
+        supabase = await get_supabase_client()
         # 1. 기존 데이터 확인 (ID 목록으로 조회)
         record_ids = [record["id"] for record in records]
 
@@ -785,7 +1537,7 @@ async def upsert_apt_sales(records: List[dict]) -> tuple[int, int, int, Optional
         batch_size = 100
         for i in range(0, len(record_ids), batch_size):
             batch_ids = record_ids[i : i + batch_size]
-            response = (
+            response = await (
                 supabase.table("apt_sales").select("id").in_("id", batch_ids).execute()
             )
             if response.data:
@@ -796,7 +1548,7 @@ async def upsert_apt_sales(records: List[dict]) -> tuple[int, int, int, Optional
         update_count = len([r for r in records if r["id"] in existing_ids])
 
         # 3. Upsert 실행
-        response = (
+        response = await (
             supabase.table("apt_sales").upsert(records, on_conflict="id").execute()
         )
 
@@ -2,7 +2,6 @@
 
 import asyncio
 import hashlib
-import random
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
@@ -16,6 +15,8 @@ from app.repositories.supabase_client import (
     upsert_apt_sales,
 )
 from app.utils.logging_config import get_logger
+from app.utils.rate_limiter import data_go_limiter
+from app.utils.retry import retry_async
 from app.utils.slack_notifier import send_slack_error_log
 
 logger = get_logger(__name__)
@@ -86,7 +87,8 @@ def fetch_apt_sales_data(
         List[dict]: 파싱된 실거래가 데이터 리스트
 
     Raises:
-        Exception: API 호출 실패 또는 XML 파싱 오류
+        requests.RequestException: API 호출 실패 (타임아웃/연결 오류/HTTP 오류)
+        Exception: API 결과 코드 오류 또는 XML 파싱 오류
     """
     url = (
         f"https://apis.data.go.kr/1613000/RTMSDataSvcAptTrade/getRTMSDataSvcAptTrade"
@@ -218,9 +220,9 @@ def fetch_apt_sales_data(
         logger.error(error_msg, exc_info=True)
         raise Exception(error_msg) from e
     except requests.RequestException as e:
-        error_msg = f"API 호출 실패 ({lawd_code}/{deal_ym}): {str(e)}"
-        logger.error(error_msg, exc_info=True)
-        raise Exception(error_msg) from e
+        # 타임아웃/연결 오류/5xx를 retry_async가 구분할 수 있도록 원래 예외를 그대로 전달
+        logger.error(f"API 호출 실패 ({lawd_code}/{deal_ym}): {str(e)}", exc_info=True)
+        raise
 
 
 async def sync_apt_sales(
@@ -274,17 +276,17 @@ async def sync_apt_sales(
         # 법정동코드 × 연월 조합으로 처리
         async def process_combination(code: str, ym: str) -> List[dict]:
             try:
-                # Rate Limiting: 랜덤 딜레이 (0.5~2초)
-                delay = random.uniform(0.5, 2.0)
-                await asyncio.sleep(delay)
-                logger.debug(f"{code}/{ym}: {delay:.2f}초 대기 후 API 호출")
-
                 # 법정동명 가져오기
                 locatadd_nm = locatadd_nm_cache.get(code)
 
-                # API 호출 (동기 함수를 비동기로 실행)
-                records = await asyncio.to_thread(
-                    fetch_apt_sales_data, code, ym, locatadd_nm
+                # API 호출 (동기 함수를 비동기로 실행, data.go.kr 전용 rate limiter 적용)
+                async def fetch_data():
+                    return await asyncio.to_thread(
+                        fetch_apt_sales_data, code, ym, locatadd_nm
+                    )
+
+                records = await retry_async(
+                    lambda: data_go_limiter.add(fetch_data), f"{code}/{ym} 실거래가 조회"
                 )
 
                 if not records:
@@ -14,8 +14,10 @@ from app.repositories.supabase_client import (
     get_symbol_metadata,
     resolve_symbol_from_cache,
 )
+from app.utils.blocking_executor import blocking_executor
 from app.utils.logging_config import get_logger
-from app.utils.rate_limiter import request_queue
+from app.utils.rate_limiter import fdr_reader_limiter
+from app.utils.retry import retry_async
 from app.utils.slack_notifier import send_slack_error_log
 
 logger = get_logger(__name__)
@@ -32,7 +34,7 @@ def resolve_symbol(name_or_symbol: str) -> str:
 def fetch_exchange_rate_data(symbol: str, start_date: Optional[str] = None) -> pd.DataFrame:
     """
     동기 함수: FinanceDataReader.DataReader 호출.
-    (네트워크/파싱이 있을 수 있어 비동기에서는 to_thread로 감쌉니다.)
+    (네트워크/파싱이 있을 수 있어 비동기에서는 blocking_executor로 감쌉니다.)
     """
     if start_date:
         return fdr.DataReader(symbol, start=start_date)
@@ -140,11 +142,14 @@ async def sync_exchange_rates(symbols: Optional[List[str]] = None) -> Dict:
             last_date = await get_max_date(symbol)
             logger.info(f"{symbol}: 최근 날짜 조회 완료 - last_date={last_date}")
 
-            # 2) FDR DataReader 호출 (last_date 이후만)
+            # 2) FDR DataReader 호출 (last_date 이후만, 전용 스레드 풀에서 실행)
             async def fetch_data():
-                return await asyncio.to_thread(fetch_exchange_rate_data, symbol, last_date)
+                return await blocking_executor.run(fetch_exchange_rate_data, symbol, last_date)
 
-            df = await request_queue.add(fetch_data)
+            df = await retry_async(
+                lambda: fdr_reader_limiter.add(fetch_data),
+                f"{symbol} FDR DataReader 조회",
+            )
 
             if df is None or df.empty:
                 logger.warning(f"{symbol}: FDR DataReader 결과가 비어있습니다")
@@ -0,0 +1,87 @@
+"""장중 시세 스냅샷 (시간 버킷 단위 저장과 장 마감 후 일별 행 롤업)"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from app.config import settings
+from app.repositories.supabase_client import (
+    build_stock_price_record,
+    delete_stock_price_ticks_before,
+    get_latest_stock_price_ticks,
+    get_symbols_metadata,
+    ohlcv_from_row,
+    upsert_stock_prices,
+)
+from app.utils.logging_config import get_logger
+from app.utils.market_calendar import get_latest_closed_session_date, get_market_close
+
+logger = get_logger(__name__)
+
+
+def get_tick_bucket(now: Optional[datetime] = None) -> datetime:
+    """현재 시각이 속한 시간 버킷의 시작 시각 (UTC, settings.intraday_bucket_minutes 단위)"""
+    now = (now or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    bucket_seconds = max(1, settings.intraday_bucket_minutes) * 60
+    epoch_seconds = int(now.timestamp())
+    return datetime.fromtimestamp(epoch_seconds - epoch_seconds % bucket_seconds, timezone.utc)
+
+
+async def rollup_intraday_prices(country: str, date: Optional[str] = None) -> Dict:
+    """
+    장 마감 후 심볼별 마지막 장중 스냅샷을 stock_prices 일별 행으로 반영합니다.
+
+    - 세션 날짜의 마감 전 settings.intraday_rollup_lookback_minutes 안의 스냅샷만 조회
+    - 일별 행은 build_stock_price_record로 만들어 청크 단위 대량 upsert
+    - 보관 기간(settings.intraday_tick_retention_days)이 지난 스냅샷 삭제
+
+    Args:
+        country: 국가 코드 (KR, US)
+        date: 세션 날짜 (YYYY-MM-DD, None이면 장이 끝난 가장 최근 거래일)
+
+    Returns:
+        Dict: 롤업 결과 (success, country, date, symbols, upserted, failed, deletedTicks)
+    """
+    date = date or get_latest_closed_session_date(country)
+    close_at = get_market_close(country, datetime.strptime(date, "%Y-%m-%d").date())
+    since = close_at - timedelta(minutes=settings.intraday_rollup_lookback_minutes)
+
+    latest_ticks = await get_latest_stock_price_ticks(
+        country, date, since.strftime("%Y-%m-%dT%H:%M:%SZ")
+    )
+    metadata = await get_symbols_metadata(list(latest_ticks.keys()))
+
+    records = []
+    for symbol, tick in latest_ticks.items():
+        quote_data = {
+            "price": float(tick["price"]),
+            "changePercent": (
+                float(tick["change_percent"]) if tick.get("change_percent") is not None else None
+            ),
+            "currency": tick.get("currency") or (metadata.get(symbol) or {}).get("currency"),
+            "name": (metadata.get(symbol) or {}).get("name"),
+            # 시가/고가/저가/거래량은 마지막 스냅샷 시점의 당일 누계 값
+            **ohlcv_from_row(tick),
+        }
+        records.append(build_stock_price_record(symbol, quote_data, date=date, country=country))
+
+    upserted, failed = await upsert_stock_prices(records)
+
+    retention_cutoff = (
+        datetime.now(timezone.utc) - timedelta(days=settings.intraday_tick_retention_days)
+    ).strftime("%Y-%m-%d")
+    deleted, _ = await delete_stock_price_ticks_before(retention_cutoff)
+
+    logger.info(
+        f"장중 스냅샷 롤업 완료 ({country} {date}): {len(records)}개 심볼, "
+        f"upsert {upserted}개, 실패 {len(failed)}개, 보관 기간 지난 스냅샷 {deleted}개 삭제"
+    )
+
+    return {
+        "success": not failed,
+        "country": country,
+        "date": date,
+        "symbols": len(records),
+        "upserted": upserted,
+        "failed": failed,
+        "deletedTicks": deleted,
+    }
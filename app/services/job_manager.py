@@ -0,0 +1,227 @@
+"""백그라운드 작업 관리 (작업 ID 발급, 진행 상황/단계별 소요 시간, 작업 종류별 중복 실행 방지)"""
+
+import asyncio
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+from app.config import settings
+from app.exceptions import JobConflictException
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class Job:
+    """
+    작업 1건의 상태
+
+    동기 실행에서도 같은 코드로 진행 상황을 기록할 수 있도록, 등록되지 않은 Job을
+    만들어 넘겨도 됩니다 (이 경우 조회 API에 노출되지 않을 뿐 동작은 동일).
+    """
+
+    def __init__(self, job_type: str, params: Optional[dict] = None):
+        self.id = uuid.uuid4().hex
+        self.job_type = job_type
+        self.params = params or {}
+        self.status = JOB_QUEUED
+        self.created_at = _now_iso()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.current_phase: Optional[str] = None
+        self.phase_timings_ms: Dict[str, float] = {}
+        self.total = 0
+        self.processed = 0
+        self.success_count = 0
+        self.failure_count = 0
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """블록 실행 시간을 단계별 소요 시간(ms)으로 기록 (같은 단계가 반복되면 누적)"""
+        self.current_phase = name
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.monotonic() - started) * 1000
+            self.phase_timings_ms[name] = round(self.phase_timings_ms.get(name, 0) + elapsed_ms, 1)
+
+    def set_total(self, total: int) -> None:
+        self.total = total
+
+    def record(self, success: bool, count: int = 1) -> None:
+        """처리 완료된 심볼 수 반영"""
+        self.processed += count
+        if success:
+            self.success_count += count
+        else:
+            self.failure_count += count
+
+    def to_dict(self, include_result: bool = True) -> dict:
+        data = {
+            "jobId": self.id,
+            "jobType": self.job_type,
+            "status": self.status,
+            "params": self.params,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "currentPhase": self.current_phase,
+            "phaseTimingsMs": self.phase_timings_ms,
+            "progress": {
+                "total": self.total,
+                "processed": self.processed,
+                "successCount": self.success_count,
+                "failureCount": self.failure_count,
+            },
+            "error": self.error,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobManager:
+    """
+    메모리 기반 백그라운드 작업 관리자
+
+    작업 종류(job_type)마다 동시에 하나만 실행합니다. 같은 종류의 작업이 실행 중일 때
+    같은 파라미터로 다시 요청되면(스케줄러 재시도 등) 기존 작업에 합쳐(merge) 같은 작업 ID를
+    반환하고, 다른 파라미터면 JobConflictException으로 거절합니다.
+    완료된 작업은 최근 settings.job_history_limit개까지만 보관합니다.
+    """
+
+    def __init__(self):
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active: Dict[str, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def active(self, job_type: str) -> Optional[Job]:
+        """실행 중인 작업 반환 (없으면 None)"""
+        return self._active.get(job_type)
+
+    def submit(
+        self,
+        job_type: str,
+        run: Callable[[Job], Awaitable[dict]],
+        params: Optional[dict] = None,
+    ) -> tuple[Job, bool]:
+        """
+        작업을 백그라운드로 시작합니다.
+
+        Args:
+            job_type: 작업 종류 (중복 실행 방지 단위)
+            run: Job을 받아 결과 딕셔너리를 반환하는 코루틴 함수
+            params: 작업 파라미터 (중복 요청 판단에 사용)
+
+        Returns:
+            tuple[Job, bool]: (작업, 기존 작업에 합쳐졌는지 여부)
+
+        Raises:
+            JobConflictException: 같은 종류의 작업이 다른 파라미터로 실행 중인 경우
+        """
+        params = params or {}
+        running = self._active.get(job_type)
+        if running:
+            if running.params == params:
+                logger.info(f"'{job_type}' 작업이 이미 실행 중이어서 기존 작업에 합침: {running.id}")
+                return running, True
+            raise JobConflictException(
+                f"'{job_type}' 작업이 이미 다른 파라미터로 실행 중입니다 (jobId={running.id})"
+            )
+
+        job = Job(job_type, params)
+        self._active[job_type] = job
+        self.jobs[job.id] = job
+        self._trim_history()
+
+        self._tasks[job.id] = asyncio.create_task(self._run(job, run))
+        logger.info(f"'{job_type}' 백그라운드 작업 시작: {job.id}")
+        return job, False
+
+    async def wait(self, job: Job) -> Job:
+        """
+        작업이 끝날 때까지 기다립니다 (동기 API도 submit으로 등록해 같은 중복 실행 규칙을 따름).
+        요청이 끊겨도 작업은 계속 진행되도록 shield로 감쌉니다.
+        작업 자체가 취소되면 예외 없이 반환하므로 호출자는 job.status로 결과를 판단합니다.
+        """
+        task = self._tasks.get(job.id)
+        if task is not None:
+            try:
+                await asyncio.shield(task)
+            except asyncio.CancelledError:
+                # 기다리던 요청이 취소된 경우는 그대로 전파
+                if not task.cancelled():
+                    raise
+        return job
+
+    async def _run(self, job: Job, run: Callable[[Job], Awaitable[dict]]) -> None:
+        job.status = JOB_RUNNING
+        job.started_at = _now_iso()
+        try:
+            job.result = await run(job)
+            job.status = JOB_SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = JOB_CANCELLED
+            job.error = "서버 종료로 작업이 취소되었습니다."
+            raise
+        except Exception as e:
+            job.status = JOB_FAILED
+            job.error = str(e)
+            logger.error(
+                f"'{job.job_type}' 백그라운드 작업 실패 ({job.id}): {str(e)}\n"
+                f"Traceback:\n{traceback.format_exc()}"
+            )
+            # Slack 알림은 작업 함수(update_stock_prices 등)가 이미 보내므로 여기서는 로그만 남김
+        finally:
+            job.finished_at = _now_iso()
+            job.current_phase = None
+            if self._active.get(job.job_type) is job:
+                del self._active[job.job_type]
+            self._tasks.pop(job.id, None)
+
+    def _trim_history(self) -> None:
+        """실행 중이 아닌 오래된 작업부터 정리"""
+        limit = max(1, settings.job_history_limit)
+        for job_id in list(self.jobs.keys()):
+            if len(self.jobs) <= limit:
+                break
+            if self.jobs[job_id].status not in (JOB_QUEUED, JOB_RUNNING):
+                del self.jobs[job_id]
+
+    async def shutdown(self) -> None:
+        """실행 중인 작업 취소 (서버 종료 시)"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": {job_type: job.id for job_type, job in self._active.items()},
+            "retained": len(self.jobs),
+        }
+
+
+# 전역 JobManager 인스턴스
+job_manager = JobManager()
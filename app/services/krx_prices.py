@@ -0,0 +1,141 @@
+"""KRX 전 종목 종가 스냅샷 (FinanceDataReader StockListing 1회 호출)"""
+
+import time
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from app.config import settings
+from app.services.listings.fdr_listings import fetch_stock_listing
+from app.utils.blocking_executor import blocking_executor
+from app.utils.logging_config import get_logger
+from app.utils.rate_limiter import fdr_listing_limiter
+from app.utils.retry import retry_async
+from app.utils.slack_notifier import send_slack_error_log
+
+logger = get_logger(__name__)
+
+# Yahoo Finance 형식 한국 종목 접미사 (managed_stocks에 "005930.KS" 형태로 저장된 경우)
+KRX_SYMBOL_SUFFIXES = (".KS", ".KQ")
+
+# 스냅샷 캐시: (조회 시각, 종목코드별 quote_data)
+_snapshot_cache: Optional[tuple[float, Dict[str, dict]]] = None
+
+
+def to_krx_code(symbol: str) -> str:
+    """managed_stocks 심볼을 KRX 종목코드로 변환 (예: "005930.KS" → "005930")"""
+    normalized = symbol.strip().upper()
+    for suffix in KRX_SYMBOL_SUFFIXES:
+        if normalized.endswith(suffix):
+            return normalized[: -len(suffix)]
+    return normalized
+
+
+def _to_float(value) -> Optional[float]:
+    """콤마가 포함된 문자열/NaN을 float로 변환"""
+    if value is None:
+        return None
+    number = pd.to_numeric(str(value).replace(",", ""), errors="coerce")
+    if pd.isna(number):
+        return None
+    return float(number)
+
+
+def normalize_krx_snapshot(df: pd.DataFrame) -> Dict[str, dict]:
+    """
+    StockListing("KRX") 결과를 종목코드별 quote_data로 변환합니다.
+
+    Returns:
+        Dict[str, dict]: 종목코드를 키로 하는 quote_data
+            (price, currency, name, changePercent, open, high, low, volume)
+    """
+    if df is None or df.empty:
+        return {}
+
+    code_col = "Code" if "Code" in df.columns else "Symbol"
+    # FDR 컬럼명 오타(ChagesRatio)를 그대로 따름
+    ratio_col = "ChagesRatio" if "ChagesRatio" in df.columns else "ChangesRatio"
+
+    if code_col not in df.columns or "Close" not in df.columns:
+        logger.warning(f"KRX: 종목코드 또는 Close 컬럼이 없습니다. columns={list(df.columns)}")
+        return {}
+
+    snapshot: Dict[str, dict] = {}
+    for row in df.to_dict("records"):
+        code = str(row.get(code_col) or "").strip().upper()
+        price = _to_float(row.get("Close"))
+        if not code or not price:
+            continue
+
+        name = row.get("Name")
+        volume = _to_float(row.get("Volume"))
+        snapshot[code] = {
+            "symbol": code,
+            "price": price,
+            "currency": "KRW",
+            "name": str(name).strip() if pd.notna(name) else None,
+            "changePercent": _to_float(row.get(ratio_col)),
+            "open": _to_float(row.get("Open")),
+            "high": _to_float(row.get("High")),
+            "low": _to_float(row.get("Low")),
+            "volume": int(volume) if volume is not None else None,
+        }
+
+    return snapshot
+
+
+async def fetch_krx_close_snapshot() -> Dict[str, dict]:
+    """
+    KRX 전 종목 종가 스냅샷을 한 번의 StockListing 호출로 가져옵니다.
+    settings.krx_snapshot_ttl_seconds 동안은 메모리 캐시를 재사용합니다.
+    """
+    global _snapshot_cache
+
+    now = time.monotonic()
+    if _snapshot_cache and now - _snapshot_cache[0] < settings.krx_snapshot_ttl_seconds:
+        return _snapshot_cache[1]
+
+    async def fetch_data():
+        return await blocking_executor.run(fetch_stock_listing, "KRX")
+
+    df = await retry_async(
+        lambda: fdr_listing_limiter.add(fetch_data), "KRX 종가 스냅샷 조회"
+    )
+    snapshot = normalize_krx_snapshot(df)
+    logger.info(f"KRX 종가 스냅샷 {len(snapshot)}개 종목 수신")
+
+    _snapshot_cache = (now, snapshot)
+    return snapshot
+
+
+async def get_krx_quotes(
+    symbols: List[str],
+) -> Dict[str, tuple[Optional[dict], Optional[str]]]:
+    """
+    KRX 스냅샷에서 심볼별 종가를 매핑합니다.
+
+    스냅샷에 없는 심볼(ETF 등)이나 스냅샷 조회 실패 시에는 결과에서 빠지므로,
+    호출자가 Yahoo Finance로 대체 조회합니다.
+
+    Returns:
+        Dict[str, tuple[Optional[dict], Optional[str]]]: 심볼별 (quote_data, None)
+    """
+    if not symbols:
+        return {}
+
+    try:
+        snapshot = await fetch_krx_close_snapshot()
+    except Exception as e:
+        logger.error(f"KRX 종가 스냅샷 조회 실패, Yahoo Finance로 대체: {str(e)}", exc_info=True)
+        send_slack_error_log(None, e)
+        return {}
+
+    results: Dict[str, tuple[Optional[dict], Optional[str]]] = {}
+    for symbol in symbols:
+        normalized = symbol.strip().upper()
+        quote_data = snapshot.get(to_krx_code(normalized))
+        if quote_data:
+            results[normalized] = ({**quote_data, "symbol": normalized}, None)
+
+    logger.info(f"KRX 스냅샷 매핑: {len(results)}/{len(symbols)}개 심볼")
+    return results
@@ -13,8 +13,10 @@ from app.repositories.supabase_client import (
     upsert_stock_names,
     deactivate_missing_stocks,
 )
+from app.utils.blocking_executor import blocking_executor
 from app.utils.logging_config import get_logger
-from app.utils.rate_limiter import request_queue
+from app.utils.rate_limiter import fdr_listing_limiter
+from app.utils.retry import retry_async
 from app.utils.slack_notifier import send_slack_error_log
 
 logger = get_logger(__name__)
@@ -57,11 +59,13 @@ async def fetch_and_normalize_market(market: str) -> List[dict]:
         List[dict]: 정규화된 종목 레코드 리스트
     """
     try:
-        # FDR StockListing 호출 (비동기로 래핑)
+        # FDR StockListing 호출 (전용 스레드 풀에서 실행)
         async def fetch_data():
-            return await asyncio.to_thread(fetch_stock_listing, market)
+            return await blocking_executor.run(fetch_stock_listing, market)
 
-        df = await request_queue.add(fetch_data)
+        df = await retry_async(
+            lambda: fdr_listing_limiter.add(fetch_data), f"{market} StockListing 조회"
+        )
 
         if df is None or df.empty:
             logger.warning(f"{market}: FDR StockListing 결과가 비어있습니다")
@@ -0,0 +1,270 @@
+"""과거 가격 백필 (기간 일봉 대량 조회 → stock_prices 청크 단위 대량 upsert)"""
+
+import asyncio
+import hashlib
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.exceptions import StockPriceUpdaterException, ValidationException
+from app.repositories.supabase_client import (
+    build_stock_price_record,
+    get_symbols_metadata,
+    get_today_date,
+    get_update_run,
+    upsert_stock_prices,
+)
+from app.services.job_manager import Job
+from app.services.quote_providers import quote_router
+from app.services.stock_service import (
+    RUN_COMPLETED,
+    RUN_RUNNING,
+    PriceUpdateRun,
+    SymbolResult,
+    apply_symbol_metadata,
+    determine_symbols,
+)
+from app.utils.logging_config import get_logger
+from app.utils.slack_notifier import send_slack_error_log
+
+logger = get_logger(__name__)
+
+# JobManager 작업 종류 (중복 실행 방지 단위)
+BACKFILL_PRICES_JOB = "backfill-prices"
+
+
+def validate_backfill_range(start_date: str, end_date: str) -> None:
+    """
+    백필 기간 검증
+
+    Raises:
+        ValidationException: 날짜 형식이 잘못되었거나, 시작일이 종료일보다 늦거나,
+            기간이 settings.backfill_max_days를 넘는 경우
+    """
+    try:
+        start_day = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end_day = datetime.strptime(end_date, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValidationException(
+            f"날짜는 YYYY-MM-DD 형식이어야 합니다 (start_date={start_date}, end_date={end_date})"
+        )
+    if start_day > end_day:
+        raise ValidationException(
+            f"start_date({start_date})가 end_date({end_date})보다 늦습니다."
+        )
+    if (end_day - start_day).days + 1 > settings.backfill_max_days:
+        raise ValidationException(
+            f"백필 기간은 최대 {settings.backfill_max_days}일입니다 ({start_date}~{end_date})"
+        )
+
+
+def build_backfill_run_key(
+    request_symbols: Optional[List[str]],
+    country: Optional[str],
+    start_date: str,
+    end_date: str,
+) -> str:
+    """백필 실행 키 (같은 파라미터로 다시 호출하면 이전 체크포인트를 이어받음)"""
+    symbols = sorted({s.strip().upper() for s in request_symbols or [] if s.strip()})
+    payload = json.dumps(
+        {
+            "job": BACKFILL_PRICES_JOB,
+            "symbols": symbols,
+            "country": country,
+            "start": start_date,
+            "end": end_date,
+        },
+        sort_keys=True,
+    )
+    return hashlib.md5(payload.encode()).hexdigest()
+
+
+async def fetch_history_records(
+    chunk: List[Dict[str, str]],
+    start_date: str,
+    end_date: str,
+    dates: Optional[Dict[str, set]] = None,
+) -> tuple[List[dict], Dict[str, str]]:
+    """
+    청크 심볼의 기간 일봉을 한 번에 조회해 stock_prices 레코드로 변환
+
+    Args:
+        chunk: [{"symbol": "...", "country": "..."}]
+        start_date: 시작일 (YYYY-MM-DD, 포함)
+        end_date: 종료일 (YYYY-MM-DD, 포함)
+        dates: 심볼별로 저장할 날짜만 지정 (None이면 기간 전체)
+
+    Returns:
+        tuple[List[dict], Dict[str, str]]: (레코드 목록, 레코드가 하나도 없는 심볼별 실패 원인)
+    """
+    histories = await quote_router.fetch_history(chunk, start_date, end_date)
+    symbols_metadata = await get_symbols_metadata([s["symbol"] for s in chunk])
+
+    records: List[dict] = []
+    errors: Dict[str, str] = {}
+    for stock in chunk:
+        symbol = stock["symbol"]
+        quotes, error_reason = histories.get(symbol, (None, None))
+        if dates is not None:
+            wanted = dates.get(symbol) or set()
+            quotes = [q for q in quotes or [] if q["date"] in wanted]
+        if not quotes:
+            errors[symbol] = error_reason or f"{start_date}~{end_date} 기간의 일봉이 없습니다."
+            continue
+        for quote_data in quotes:
+            quote_data = apply_symbol_metadata(quote_data, symbols_metadata.get(symbol))
+            records.append(
+                build_stock_price_record(
+                    symbol, quote_data, date=quote_data["date"], country=stock.get("country")
+                )
+            )
+    return records, errors
+
+
+async def _backfill_chunk(
+    run: PriceUpdateRun, chunk: List[Dict[str, str]], start_date: str, end_date: str
+) -> None:
+    """청크 심볼의 기간 일봉을 조회해 대량 upsert하고, 결과를 run.done에 기록"""
+    records, errors = await fetch_history_records(chunk, start_date, end_date)
+    written, failed = await upsert_stock_prices(records)
+    run.written += written
+
+    for stock in chunk:
+        symbol = stock["symbol"]
+        error = errors.get(symbol) or failed.get(symbol)
+        run.done[symbol] = error
+        run.job.record(error is None)
+
+
+async def backfill_stock_prices(
+    start_date: str,
+    end_date: Optional[str] = None,
+    request_symbols: Optional[List[str]] = None,
+    country: Optional[str] = None,
+    job: Optional[Job] = None,
+) -> Dict:
+    """
+    지정한 기간의 과거 일별 종가를 stock_prices에 채웁니다.
+
+    - 심볼 결정은 update_stock_prices와 같음 (request body > 환경변수 > managed_stocks)
+    - settings.backfill_symbols_per_chunk개 심볼마다 기간 조회 한 번
+      (Yahoo는 멀티 티커 기간 download, FDR은 심볼별 DataReader 기간 조회)
+    - 조회한 일봉은 청크 단위 대량 upsert (이미 있는 날짜는 덮어씀)
+    - 동시에 처리하는 청크는 settings.backfill_concurrency개로 제한 (메모리/업스트림 부하 제한)
+    - 청크가 끝날 때마다 update_runs 체크포인트를 갱신하여, 같은 파라미터로 다시 호출하면
+      남은 심볼부터 이어서 처리
+
+    Args:
+        start_date: 시작일 (YYYY-MM-DD, 포함)
+        end_date: 종료일 (YYYY-MM-DD, 포함, None이면 오늘)
+        request_symbols: 요청 본문의 심볼 목록
+        country: 국가 필터
+        job: 진행 상황/단계별 소요 시간을 기록할 작업 (백그라운드 실행 시 JobManager가 전달)
+
+    Returns:
+        Dict: 백필 결과 (success, startDate, endDate, total, successCount, failureCount,
+            writtenCount, results)
+
+    Raises:
+        ValidationException: 기간이 잘못된 경우
+    """
+    end_date = end_date or get_today_date()
+    validate_backfill_range(start_date, end_date)
+
+    job = job or Job(BACKFILL_PRICES_JOB)
+    try:
+        run_key = build_backfill_run_key(request_symbols, country, start_date, end_date)
+        run = PriceUpdateRun(
+            run_key,
+            params={
+                "job": BACKFILL_PRICES_JOB,
+                "symbols": request_symbols,
+                "country": country,
+                "startDate": start_date,
+                "endDate": end_date,
+            },
+            job=job,
+        )
+
+        with job.phase("prepare"):
+            checkpoint = await get_update_run(run_key)
+            if checkpoint and checkpoint.get("status") == RUN_RUNNING:
+                run.done = dict(checkpoint.get("done") or {})
+                run.stocks_to_fetch = [
+                    s for s in (checkpoint.get("pending") or []) if s["symbol"] not in run.done
+                ]
+                logger.info(
+                    f"♻️ 중단된 백필 재개 ({run_key}) - "
+                    f"완료 {len(run.done)}개, 남은 종목 {len(run.stocks_to_fetch)}개"
+                )
+            else:
+                stocks = await determine_symbols(request_symbols, country)
+                run.stocks_to_fetch = list({s["symbol"]: s for s in stocks}.values())
+
+        run.total_symbols = len(run.done) + len(run.stocks_to_fetch)
+        job.set_total(run.total_symbols)
+        job.record(True, sum(1 for error in run.done.values() if error is None))
+        job.record(False, sum(1 for error in run.done.values() if error is not None))
+
+        logger.info(
+            f"🚀 백필 시작 ({start_date}~{end_date}) - 대상: {len(run.stocks_to_fetch)}개 종목"
+        )
+
+        if run.stocks_to_fetch:
+            await run.save_checkpoint(RUN_RUNNING)
+
+            chunk_size = max(1, settings.backfill_symbols_per_chunk)
+            chunks = [
+                run.stocks_to_fetch[i : i + chunk_size]
+                for i in range(0, len(run.stocks_to_fetch), chunk_size)
+            ]
+            semaphore = asyncio.Semaphore(max(1, settings.backfill_concurrency))
+            checkpoint_lock = asyncio.Lock()
+
+            async def process_chunk(chunk_no: int, chunk: List[Dict[str, str]]):
+                async with semaphore:
+                    with job.phase("backfill"):
+                        await _backfill_chunk(run, chunk, start_date, end_date)
+                async with checkpoint_lock:
+                    await run.save_checkpoint(RUN_RUNNING)
+                logger.info(
+                    f"백필 청크 {chunk_no}/{len(chunks)} 완료 "
+                    f"(누적 {len(run.done)}/{run.total_symbols}개 종목, {run.written}행 저장)"
+                )
+
+            await asyncio.gather(
+                *[process_chunk(no, chunk) for no, chunk in enumerate(chunks, start=1)]
+            )
+            await run.save_checkpoint(RUN_COMPLETED)
+
+        results = [
+            SymbolResult(symbol=symbol, success=error is None, error=error)
+            for symbol, error in run.done.items()
+        ]
+        success_count = sum(1 for r in results if r.success)
+        failure_count = len(results) - success_count
+
+        logger.info(
+            f"🏁 백필 종료 ({start_date}~{end_date}) - 전체: {len(results)}, "
+            f"성공: {success_count}, 실패: {failure_count}, 저장: {run.written}행"
+        )
+
+        return {
+            "success": True,
+            "startDate": start_date,
+            "endDate": end_date,
+            "total": len(results),
+            "successCount": success_count,
+            "failureCount": failure_count,
+            "writtenCount": run.written,
+            "results": [r.to_dict() for r in results],
+        }
+
+    except Exception as e:
+        error_message = str(e)
+        logger.error(f"백필 중 오류 발생: {error_message}", exc_info=True)
+        send_slack_error_log(None, e)
+        raise StockPriceUpdaterException(
+            f"백필 중 오류가 발생했습니다: {error_message}"
+        ) from e
@@ -0,0 +1,224 @@
+"""stock_prices 누락 거래일 탐지와 심볼별 기간 재수집"""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.exceptions import StockPriceUpdaterException
+from app.repositories.supabase_client import (
+    get_stock_price_dates,
+    get_symbol_failures,
+    get_today_date,
+    upsert_stock_prices,
+)
+from app.services.job_manager import Job
+from app.services.price_backfill import fetch_history_records
+from app.services.stock_service import (
+    UPDATE_PRICES_JOB,
+    determine_symbols,
+    get_symbol_shard,
+    update_stock_prices,
+)
+from app.services.symbol_quarantine import get_quarantined_symbols
+from app.utils.logging_config import get_logger
+from app.utils.market_calendar import get_trading_date, is_trading_day
+from app.utils.slack_notifier import send_slack_error_log
+
+logger = get_logger(__name__)
+
+# JobManager 작업 종류 (수동 실행용)
+FILL_PRICE_GAPS_JOB = "fill-price-gaps"
+
+
+def get_expected_trading_dates(
+    country: Optional[str], start_day: date, end_day: date
+) -> List[str]:
+    """start_day~end_day(포함) 중 시장 캘린더 기준 거래일 (YYYY-MM-DD)"""
+    return [
+        (start_day + timedelta(days=offset)).isoformat()
+        for offset in range((end_day - start_day).days + 1)
+        if is_trading_day(country, start_day + timedelta(days=offset))
+    ]
+
+
+def find_price_gaps(
+    stocks: List[Dict[str, str]], stored: Dict[str, set], start_day: date
+) -> Dict[str, List[str]]:
+    """
+    심볼별 누락 거래일 (시장 캘린더의 거래일 - stock_prices에 저장된 날짜)
+
+    - 기간 끝은 국가별 기준 거래일 (일별 배치가 저장하는 날짜)
+    - 기간 안에 저장된 행이 있는 심볼은 첫 저장일 이전을 보지 않음
+      (신규 상장처럼 원래 데이터가 없는 날짜를 매번 다시 조회하지 않도록)
+
+    Returns:
+        Dict[str, List[str]]: 누락 거래일이 있는 심볼만 포함 (날짜 오름차순)
+    """
+    expected_by_country: Dict[Optional[str], List[str]] = {}
+    gaps: Dict[str, List[str]] = {}
+    for stock in stocks:
+        symbol = stock["symbol"]
+        country = stock.get("country")
+        if country not in expected_by_country:
+            end_day = datetime.strptime(get_trading_date(country), "%Y-%m-%d").date()
+            expected_by_country[country] = get_expected_trading_dates(country, start_day, end_day)
+
+        stored_dates = stored.get(symbol) or set()
+        first_stored = min(stored_dates) if stored_dates else None
+        missing = [
+            day
+            for day in expected_by_country[country]
+            if day not in stored_dates and (first_stored is None or day > first_stored)
+        ]
+        if missing:
+            gaps[symbol] = missing
+    return gaps
+
+
+async def fill_price_gaps(
+    request_symbols: Optional[List[str]] = None,
+    country: Optional[str] = None,
+    shard_index: Optional[int] = None,
+    shard_count: Optional[int] = None,
+    job: Optional[Job] = None,
+) -> Dict:
+    """
+    최근 settings.gap_scan_lookback_days일 동안 stock_prices에 빠진 (심볼, 거래일)을 찾아 다시 채웁니다.
+
+    - 대상 심볼(국가/샤드 필터, 격리 제외)의 기간 안 저장된 (symbol, date)를 심볼 IN 조건으로
+      페이지 단위 조회해 메모리에서 누락 거래일 계산
+    - 격리 중인 심볼은 제외
+    - 누락 거래일이 있는 심볼을 최대 settings.gap_fill_max_symbols개까지만 재수집
+      (남은 심볼은 다음 실행에서 이어서 처리)
+    - 심볼마다 누락 구간 전체를 기간 조회 한 번으로 받고, 누락된 날짜의 행만 대량 upsert
+    - 업스트림에 데이터가 없는 날짜(거래 정지 등)는 미충족으로 남고, 탐지 기간을 벗어나면 더 이상 조회하지 않음
+
+    Args:
+        request_symbols: 요청 본문의 심볼 목록 (None이면 환경변수/managed_stocks)
+        country: 국가 필터
+        shard_index: 이 실행이 담당할 샤드 번호
+        shard_count: 전체 샤드 수
+        job: 단계별 소요 시간을 기록할 작업
+
+    Returns:
+        Dict: 재수집 결과 (success, startDate, scannedSymbols, gapSymbols, gapCount,
+            targetSymbols, filledCount, failed)
+    """
+    job = job or Job(FILL_PRICE_GAPS_JOB)
+    try:
+        with job.phase("gap-scan"):
+            stocks = await determine_symbols(request_symbols, country)
+            if shard_count:
+                stocks = [
+                    s for s in stocks if get_symbol_shard(s["symbol"], shard_count) == shard_index
+                ]
+            quarantined = get_quarantined_symbols(await get_symbol_failures())
+            stocks = list(
+                {s["symbol"]: s for s in stocks if s["symbol"] not in quarantined}.values()
+            )
+
+            today = datetime.strptime(get_today_date(), "%Y-%m-%d").date()
+            start_day = today - timedelta(days=settings.gap_scan_lookback_days)
+            # 국가/샤드/격리 필터를 거친 심볼만 조회 (테이블 전체를 훑지 않음)
+            stored = await get_stock_price_dates(
+                start_day.isoformat(), today.isoformat(), [s["symbol"] for s in stocks]
+            )
+            gaps = find_price_gaps(stocks, stored, start_day)
+
+        gap_count = sum(len(days) for days in gaps.values())
+        targets = list(gaps.keys())
+        if settings.gap_fill_max_symbols:
+            targets = targets[: settings.gap_fill_max_symbols]
+        logger.info(
+            f"누락 거래일 탐지 ({start_day.isoformat()}~): {len(stocks)}개 심볼 중 "
+            f"{len(gaps)}개 심볼, {gap_count}개 거래일 누락 → 이번 실행에서 {len(targets)}개 심볼 재수집"
+        )
+
+        countries = {s["symbol"]: s.get("country") for s in stocks}
+        filled = 0
+        failed: Dict[str, str] = {}
+        if targets:
+            chunk_size = max(1, settings.backfill_symbols_per_chunk)
+            chunks = [targets[i : i + chunk_size] for i in range(0, len(targets), chunk_size)]
+            semaphore = asyncio.Semaphore(max(1, settings.backfill_concurrency))
+
+            async def refill_chunk(chunk: List[str]):
+                nonlocal filled
+                async with semaphore:
+                    records, errors = await fetch_history_records(
+                        [{"symbol": s, "country": countries.get(s)} for s in chunk],
+                        min(gaps[s][0] for s in chunk),
+                        max(gaps[s][-1] for s in chunk),
+                        dates={s: set(gaps[s]) for s in chunk},
+                    )
+                    written, upsert_failed = await upsert_stock_prices(records)
+                filled += written
+                failed.update(errors)
+                failed.update(upsert_failed)
+
+            with job.phase("gap-fill"):
+                await asyncio.gather(*[refill_chunk(chunk) for chunk in chunks])
+
+        logger.info(
+            f"누락 거래일 재수집 완료: {filled}개 행 저장, 실패 {len(failed)}개 심볼"
+        )
+        return {
+            "success": not failed,
+            "startDate": start_day.isoformat(),
+            "scannedSymbols": len(stocks),
+            "gapSymbols": len(gaps),
+            "gapCount": gap_count,
+            "targetSymbols": len(targets),
+            "filledCount": filled,
+            "failed": failed,
+        }
+
+    except Exception as e:
+        error_message = str(e)
+        logger.error(f"누락 거래일 재수집 중 오류 발생: {error_message}", exc_info=True)
+        send_slack_error_log(None, e)
+        raise StockPriceUpdaterException(
+            f"누락 거래일 재수집 중 오류가 발생했습니다: {error_message}"
+        ) from e
+
+
+async def update_stock_prices_with_gap_fill(
+    request_symbols: Optional[List[str]] = None,
+    country: Optional[str] = None,
+    shard_index: Optional[int] = None,
+    shard_count: Optional[int] = None,
+    refresh: bool = False,
+    tiered: bool = False,
+    intraday: bool = False,
+    job: Optional[Job] = None,
+) -> Dict:
+    """
+    update_stock_prices 후 스케줄 일별 배치면 누락 거래일 재수집까지 이어서 실행
+
+    심볼 지정/refresh/갱신 등급/장중 실행은 일별 배치가 아니므로 재수집하지 않고,
+    일별 배치면 같은 국가/샤드의 심볼만 탐지합니다.
+    settings.gap_fill_after_update로 끌 수 있으며, 재수집이 실패해도 가격 업데이트 결과는
+    그대로 반환합니다 (결과의 gapFill에 실패 원인 기록).
+    """
+    job = job or Job(UPDATE_PRICES_JOB)
+    result = await update_stock_prices(
+        request_symbols=request_symbols,
+        country=country,
+        shard_index=shard_index,
+        shard_count=shard_count,
+        refresh=refresh,
+        tiered=tiered,
+        intraday=intraday,
+        job=job,
+    )
+
+    daily_batch = not (request_symbols or refresh or tiered or intraday)
+    if settings.gap_fill_after_update and daily_batch:
+        try:
+            result["gapFill"] = await fill_price_gaps(
+                country=country, shard_index=shard_index, shard_count=shard_count, job=job
+            )
+        except StockPriceUpdaterException as e:
+            result["gapFill"] = {"success": False, "error": str(e)}
+    return result
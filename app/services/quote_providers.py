@@ -0,0 +1,525 @@
+"""시세 제공자(Quote Provider) 추상화와 국가별 라우팅/장애 전환"""
+
+import asyncio
+import hashlib
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+import FinanceDataReader as fdr
+import pandas as pd
+
+from app.config import settings
+from app.services.krx_prices import get_krx_quotes, to_krx_code
+from app.services.yahoo_finance import (
+    get_batch_price_history,
+    get_batch_quote_data,
+    get_quote_data,
+    ohlcv_from_bar,
+)
+from app.utils.market_calendar import is_trading_day
+from app.utils.blocking_executor import blocking_executor
+from app.utils.logging_config import get_logger
+from app.utils.rate_limiter import fdr_reader_limiter
+from app.utils.retry import (
+    RateLimitedReason,
+    UpstreamErrorReason,
+    retry_async,
+    upstream_error_reason,
+)
+
+logger = get_logger(__name__)
+
+# 심볼별 (quote_data, error_reason)
+QuoteResult = tuple[Optional[dict], Optional[str]]
+# 심볼별 (날짜별 quote_data 목록, error_reason) - 각 quote_data에 "date"(YYYY-MM-DD) 포함
+HistoryResult = tuple[Optional[List[dict]], Optional[str]]
+
+# 기간 첫날의 전일 대비 변동률을 계산하기 위해 시작일보다 앞서 조회하는 일수
+HISTORY_PREVIOUS_CLOSE_LOOKBACK_DAYS = 10
+
+
+def get_history_fetch_start(start: str) -> str:
+    """기간 조회 시 실제 요청 시작일 (첫날의 직전 종가까지 받도록 앞당김)"""
+    start_day = datetime.strptime(start, "%Y-%m-%d") - timedelta(
+        days=HISTORY_PREVIOUS_CLOSE_LOOKBACK_DAYS
+    )
+    return start_day.strftime("%Y-%m-%d")
+
+
+def history_to_daily_quotes(
+    history: Optional[pd.DataFrame], start: str, end: str
+) -> List[dict]:
+    """
+    일봉 DataFrame을 날짜별 quote_data 목록으로 변환합니다.
+    변동률은 직전 종가 기준으로 계산하고, start~end(포함) 밖의 행은 버립니다.
+    """
+    if history is None or history.empty or "Close" not in history.columns:
+        return []
+
+    quotes: List[dict] = []
+    previous_close: Optional[float] = None
+    bars = history[history["Close"].notna()].sort_index()
+    for index, bar in bars.iterrows():
+        day = pd.Timestamp(index).strftime("%Y-%m-%d")
+        price = float(bar["Close"])
+        change_percent = None
+        if previous_close:
+            change_percent = (price - previous_close) / previous_close * 100
+        previous_close = price
+
+        if start <= day <= end:
+            quotes.append(
+                {
+                    "date": day,
+                    "price": price,
+                    "currency": None,
+                    "name": None,
+                    "changePercent": change_percent,
+                    **ohlcv_from_bar(bar),
+                }
+            )
+    return quotes
+
+
+class QuoteProvider:
+    """
+    시세 제공자 기본 클래스
+
+    fetch_quotes는 심볼별 (quote_data, error_reason)을 반환합니다.
+    결과에 없는 심볼(해당 제공자가 모르는 심볼)과 실패한 심볼은 라우팅 순서상 다음 제공자로 넘어갑니다.
+    """
+
+    name: str = ""
+
+    async def fetch_quotes(
+        self, symbols: List[str], country: Optional[str] = None
+    ) -> Dict[str, QuoteResult]:
+        raise NotImplementedError
+
+    async def fetch_history(
+        self, symbols: List[str], start: str, end: str, country: Optional[str] = None
+    ) -> Dict[str, HistoryResult]:
+        """
+        start~end(YYYY-MM-DD, 포함) 기간의 날짜별 종가를 심볼별로 반환합니다.
+        기간 조회를 지원하지 않는 제공자는 빈 결과를 반환해 다음 제공자로 넘깁니다.
+        """
+        return {}
+
+
+class YahooQuoteProvider(QuoteProvider):
+    """yfinance: 멀티 티커 배치 조회 후, 배치 응답에 없는 심볼만 개별 조회"""
+
+    name = "yahoo"
+
+    async def fetch_quotes(
+        self, symbols: List[str], country: Optional[str] = None
+    ) -> Dict[str, QuoteResult]:
+        results = await get_batch_quote_data(symbols)
+
+        missing = [s for s in symbols if s not in results]
+        semaphore = asyncio.Semaphore(max(1, settings.fetch_concurrency))
+
+        async def fetch_single(symbol: str):
+            async with semaphore:
+                try:
+                    results[symbol] = await get_quote_data(symbol)
+                except Exception as e:
+                    results[symbol] = (None, upstream_error_reason(e))
+
+        await asyncio.gather(*[fetch_single(s) for s in missing])
+        return results
+
+    async def fetch_history(
+        self, symbols: List[str], start: str, end: str, country: Optional[str] = None
+    ) -> Dict[str, HistoryResult]:
+        histories = await get_batch_price_history(symbols, get_history_fetch_start(start), end)
+
+        results: Dict[str, HistoryResult] = {}
+        for symbol, (history, error_reason) in histories.items():
+            quotes = history_to_daily_quotes(history, start, end)
+            if quotes or error_reason:
+                results[symbol] = (quotes or None, error_reason)
+        return results
+
+
+def fetch_recent_history(symbol: str) -> pd.DataFrame:
+    """
+    동기 함수: FinanceDataReader.DataReader로 최근 10일 일봉 조회.
+    (비동기에서는 blocking_executor로 감쌉니다.)
+    """
+    start = (datetime.now(timezone.utc) - timedelta(days=10)).strftime("%Y-%m-%d")
+    return fdr.DataReader(symbol, start=start)
+
+
+def fetch_history_range(symbol: str, start: str, end: str) -> pd.DataFrame:
+    """동기 함수: FinanceDataReader.DataReader로 start~end(포함) 일봉 조회"""
+    return fdr.DataReader(symbol, start=start, end=end)
+
+
+class FdrQuoteProvider(QuoteProvider):
+    """FinanceDataReader: KR은 KRX 전 종목 스냅샷, 그 외는 심볼별 DataReader 최근 일봉"""
+
+    name = "fdr"
+
+    async def fetch_quotes(
+        self, symbols: List[str], country: Optional[str] = None
+    ) -> Dict[str, QuoteResult]:
+        if country == "KR":
+            return await get_krx_quotes(symbols)
+
+        results: Dict[str, QuoteResult] = {}
+        semaphore = asyncio.Semaphore(max(1, settings.fetch_concurrency))
+
+        async def fetch_single(symbol: str):
+            async with semaphore:
+                try:
+
+                    async def fetch_data():
+                        return await blocking_executor.run(fetch_recent_history, symbol)
+
+                    df = await retry_async(
+                        lambda: fdr_reader_limiter.add(fetch_data),
+                        f"{symbol} FDR DataReader 조회",
+                    )
+                except Exception as e:
+                    results[symbol] = (
+                        None,
+                        upstream_error_reason(e, f"FDR DataReader 오류: {str(e)}"),
+                    )
+                    return
+
+            if df is None or df.empty or "Close" not in df.columns:
+                return
+            closes = df["Close"].dropna()
+            if closes.empty:
+                return
+            bar = df.loc[closes.index[-1]]
+
+            price = float(closes.iloc[-1])
+            change_percent = None
+            if len(closes) >= 2 and float(closes.iloc[-2]):
+                previous_close = float(closes.iloc[-2])
+                change_percent = (price - previous_close) / previous_close * 100
+
+            results[symbol] = (
+                {
+                    "symbol": symbol,
+                    "price": price,
+                    "currency": None,
+                    "name": None,
+                    "changePercent": change_percent,
+                    **ohlcv_from_bar(bar),
+                },
+                None,
+            )
+
+        await asyncio.gather(*[fetch_single(s) for s in symbols])
+        return results
+
+    async def fetch_history(
+        self, symbols: List[str], start: str, end: str, country: Optional[str] = None
+    ) -> Dict[str, HistoryResult]:
+        """심볼별 DataReader 기간 조회 1회 (KRX 스냅샷은 당일 종가만 있으므로 KR도 DataReader 사용)"""
+        results: Dict[str, HistoryResult] = {}
+        fetch_start = get_history_fetch_start(start)
+        semaphore = asyncio.Semaphore(max(1, settings.fetch_concurrency))
+
+        async def fetch_single(symbol: str):
+            code = to_krx_code(symbol) if country == "KR" else symbol
+            async with semaphore:
+                try:
+
+                    async def fetch_data():
+                        return await blocking_executor.run(
+                            fetch_history_range, code, fetch_start, end
+                        )
+
+                    df = await retry_async(
+                        lambda: fdr_reader_limiter.add(fetch_data),
+                        f"{symbol} FDR DataReader 기간 조회 ({start}~{end})",
+                    )
+                except Exception as e:
+                    results[symbol] = (
+                        None,
+                        upstream_error_reason(e, f"FDR DataReader 오류: {str(e)}"),
+                    )
+                    return
+
+            quotes = history_to_daily_quotes(df, start, end)
+            if quotes:
+                results[symbol] = (quotes, None)
+
+        await asyncio.gather(*[fetch_single(s) for s in symbols])
+        return results
+
+
+def _fake_ohlcv(digest: int) -> dict:
+    """FakeQuoteProvider 가격(digest 기준) 주변의 결정적인 시가/고가/저가/거래량"""
+    price = float(10 + digest % 99000) / 100
+    return {
+        "open": round(price * (1 + (digest % 41 - 20) / 1000), 2),
+        "high": round(price * 1.02, 2),
+        "low": round(price * 0.98, 2),
+        "volume": digest % 10_000_000,
+    }
+
+
+class FakeQuoteProvider(QuoteProvider):
+    """로컬 개발/테스트용: 외부 호출 없이 심볼 해시로 결정적인 가격 생성"""
+
+    name = "fake"
+
+    async def fetch_quotes(
+        self, symbols: List[str], country: Optional[str] = None
+    ) -> Dict[str, QuoteResult]:
+        results: Dict[str, QuoteResult] = {}
+        for symbol in symbols:
+            digest = int(hashlib.md5(symbol.encode("utf-8")).hexdigest(), 16)
+            results[symbol] = (
+                {
+                    "symbol": symbol,
+                    "price": float(10 + digest % 99000) / 100,
+                    "currency": "KRW" if country == "KR" else "USD",
+                    "name": f"FAKE {symbol}",
+                    "changePercent": float(digest % 1000 - 500) / 100,
+                    **_fake_ohlcv(digest),
+                },
+                None,
+            )
+        return results
+
+    async def fetch_history(
+        self, symbols: List[str], start: str, end: str, country: Optional[str] = None
+    ) -> Dict[str, HistoryResult]:
+        """기간 내 거래일마다 fetch_quotes와 같은 방식으로 날짜 해시를 섞어 가격 생성"""
+        start_day = datetime.strptime(start, "%Y-%m-%d").date()
+        end_day = datetime.strptime(end, "%Y-%m-%d").date()
+        trading_days = [
+            start_day + timedelta(days=offset)
+            for offset in range((end_day - start_day).days + 1)
+            if is_trading_day(country, start_day + timedelta(days=offset))
+        ]
+
+        results: Dict[str, HistoryResult] = {}
+        for symbol in symbols:
+            quotes = []
+            for day in trading_days:
+                key = f"{symbol}:{day.isoformat()}"
+                digest = int(hashlib.md5(key.encode("utf-8")).hexdigest(), 16)
+                quotes.append(
+                    {
+                        "date": day.isoformat(),
+                        "price": float(10 + digest % 99000) / 100,
+                        "currency": "KRW" if country == "KR" else "USD",
+                        "name": f"FAKE {symbol}",
+                        "changePercent": float(digest % 1000 - 500) / 100,
+                        **_fake_ohlcv(digest),
+                    }
+                )
+            results[symbol] = (quotes, None)
+        return results
+
+
+class ProviderHealth:
+    """
+    제공자별 최근 호출 결과(슬라이딩 윈도우)로 장애 여부를 판단
+
+    최근 provider_health_window개 결과 중 오류 비율이 provider_failover_error_rate 이상이면
+    provider_cooldown_seconds 동안 장애(degraded)로 표시하고 라우팅에서 건너뜁니다.
+    오류는 업스트림 장애(429/네트워크/타임아웃/5xx)만 세고, 심볼별 데이터 없음은 세지 않습니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.outcomes: Deque[bool] = deque(maxlen=max(1, settings.provider_health_window))
+        self.rate_limited = 0
+        self.degraded_until = 0.0
+
+    def record(self, success: bool, rate_limited: bool = False) -> None:
+        self.outcomes.append(success)
+        if rate_limited:
+            self.rate_limited += 1
+
+        if len(self.outcomes) < settings.provider_failover_min_samples:
+            return
+
+        if self.error_rate() >= settings.provider_failover_error_rate:
+            self.degraded_until = time.monotonic() + settings.provider_cooldown_seconds
+            self.outcomes.clear()
+            logger.warning(
+                f"시세 제공자 '{self.name}' 장애 전환: "
+                f"{settings.provider_cooldown_seconds}초 동안 다음 제공자 사용"
+            )
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def is_degraded(self) -> bool:
+        return time.monotonic() < self.degraded_until
+
+    def stats(self) -> dict:
+        return {
+            "degraded": self.is_degraded(),
+            "errorRate": round(self.error_rate(), 3),
+            "samples": len(self.outcomes),
+            "rateLimited": self.rate_limited,
+        }
+
+
+def parse_provider_routes(routes: str) -> Dict[str, List[str]]:
+    """
+    "KR:fdr,yahoo;US:yahoo,fdr;*:yahoo" 형식의 라우팅 설정을 파싱
+
+    Returns:
+        Dict[str, List[str]]: 국가 코드(또는 "*")별 제공자 이름 목록 (우선순위 순)
+    """
+    parsed: Dict[str, List[str]] = {}
+    for entry in routes.split(";"):
+        if ":" not in entry:
+            continue
+        country, names = entry.split(":", 1)
+        parsed[country.strip().upper()] = [
+            n.strip().lower() for n in names.split(",") if n.strip()
+        ]
+    return parsed
+
+
+class QuoteRouter:
+    """국가별로 제공자 순서를 정하고, 실패/장애 시 다음 제공자로 넘기는 라우터"""
+
+    def __init__(self, providers: List[QuoteProvider], routes: Dict[str, List[str]]):
+        self.providers: Dict[str, QuoteProvider] = {p.name: p for p in providers}
+        self.routes = routes
+        self.health: Dict[str, ProviderHealth] = {
+            p.name: ProviderHealth(p.name) for p in providers
+        }
+
+    def route(self, country: Optional[str]) -> List[str]:
+        """국가에 해당하는 제공자 순서 반환 (등록되지 않은 이름은 무시)"""
+        names = self.routes.get((country or "").upper()) or self.routes.get("*") or ["yahoo"]
+        return [n for n in names if n in self.providers]
+
+    async def fetch_quotes(self, stocks: List[Dict[str, str]]) -> Dict[str, QuoteResult]:
+        """
+        심볼 목록을 국가별로 묶어 제공자 순서대로 조회합니다.
+
+        Args:
+            stocks: [{"symbol": "...", "country": "..."}]
+
+        Returns:
+            Dict[str, QuoteResult]: 모든 심볼에 대한 (quote_data, error_reason)
+        """
+        return await self._fetch_by_country(
+            stocks,
+            lambda provider, symbols, country: provider.fetch_quotes(symbols, country),
+        )
+
+    async def fetch_history(
+        self, stocks: List[Dict[str, str]], start: str, end: str
+    ) -> Dict[str, HistoryResult]:
+        """
+        심볼 목록의 start~end(YYYY-MM-DD, 포함) 날짜별 종가를 국가별 제공자 순서대로 조회합니다.
+
+        Args:
+            stocks: [{"symbol": "...", "country": "..."}]
+            start: 시작일
+            end: 종료일
+
+        Returns:
+            Dict[str, HistoryResult]: 모든 심볼에 대한 (날짜별 quote_data 목록, error_reason)
+        """
+        return await self._fetch_by_country(
+            stocks,
+            lambda provider, symbols, country: provider.fetch_history(
+                symbols, start, end, country
+            ),
+        )
+
+    async def _fetch_by_country(
+        self,
+        stocks: List[Dict[str, str]],
+        fetch: Callable[[QuoteProvider, List[str], Optional[str]], Awaitable[Dict]],
+    ) -> Dict[str, tuple]:
+        by_country: Dict[Optional[str], List[str]] = {}
+        for stock in stocks:
+            by_country.setdefault(stock.get("country", "KR"), []).append(stock["symbol"])
+
+        results: Dict[str, tuple] = {}
+        for country, symbols in by_country.items():
+            results.update(await self._fetch_with_failover(country, symbols, fetch))
+        return results
+
+    async def _fetch_with_failover(
+        self,
+        country: Optional[str],
+        symbols: List[str],
+        fetch: Callable[[QuoteProvider, List[str], Optional[str]], Awaitable[Dict]],
+    ) -> Dict[str, tuple]:
+        chain = self.route(country)
+        # 모든 제공자가 장애 상태면 순서대로 그대로 시도 (조회 자체를 포기하지 않음)
+        active = [n for n in chain if not self.health[n].is_degraded()] or chain
+
+        results: Dict[str, tuple] = {}
+        last_errors: Dict[str, str] = {}
+        pending = list(symbols)
+
+        for name in active:
+            if not pending:
+                break
+
+            provider = self.providers[name]
+            health = self.health[name]
+            try:
+                provider_results = await fetch(provider, pending, country)
+            except Exception as e:
+                logger.error(
+                    f"시세 제공자 '{name}' 조회 실패 ({len(pending)}개 심볼): {str(e)}\n"
+                    f"Traceback:\n{traceback.format_exc()}"
+                )
+                provider_results = {s: (None, upstream_error_reason(e)) for s in pending}
+
+            next_pending: List[str] = []
+            for symbol in pending:
+                quote_data, error_reason = provider_results.get(symbol, (None, None))
+                if quote_data:
+                    results[symbol] = (quote_data, None)
+                    health.record(True)
+                    continue
+
+                if symbol in provider_results:
+                    # 업스트림 장애(429/네트워크/5xx)만 장애 판단에 반영
+                    # (미보유 심볼, 심볼별 데이터 없음은 제공자 상태와 무관하므로 제외)
+                    if isinstance(error_reason, UpstreamErrorReason):
+                        health.record(False, rate_limited=isinstance(error_reason, RateLimitedReason))
+                    if error_reason:
+                        last_errors[symbol] = error_reason
+                next_pending.append(symbol)
+
+            if next_pending and name != active[-1]:
+                logger.info(
+                    f"시세 제공자 '{name}'에서 {len(next_pending)}개 심볼 미조회, 다음 제공자로 전환"
+                )
+            pending = next_pending
+
+        for symbol in pending:
+            results[symbol] = (None, last_errors.get(symbol))
+
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "routes": self.routes,
+            "providers": {name: h.stats() for name, h in self.health.items()},
+        }
+
+
+# 전역 QuoteRouter 인스턴스
+quote_router = QuoteRouter(
+    providers=[YahooQuoteProvider(), FdrQuoteProvider(), FakeQuoteProvider()],
+    routes=parse_provider_routes(settings.quote_provider_routes),
+)
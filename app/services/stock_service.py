@@ -1,20 +1,66 @@
 """주식 가격 업데이트 비즈니스 로직"""
 
-import traceback
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict
-from app.config import get_stock_symbols_override
+from app.config import settings, get_stock_symbols_override
 from app.repositories.supabase_client import (
+    acquire_stock_price_leases,
     get_managed_stocks,
-    get_today_stock_prices,
-    save_stock_price_to_db,
+    get_symbols_metadata,
+    get_stock_prices_for_dates,
+    get_symbol_failures,
+    get_today_date,
+    get_update_run,
+    release_stock_price_leases,
+    build_stock_price_record,
+    build_stock_price_tick_record,
+    touch_managed_stocks_fetched,
+    upsert_stock_price_ticks,
+    upsert_stock_prices,
+    upsert_update_run,
+)
+from app.services.intraday_prices import get_tick_bucket
+from app.services.job_manager import Job
+from app.services.quote_providers import quote_router
+from app.services.symbol_quarantine import (
+    get_quarantined_symbols,
+    is_symbol_specific_failure,
+    record_fetch_outcomes,
 )
-from app.services.yahoo_finance import get_quote_data
 from app.utils.logging_config import get_logger
+from app.utils.market_calendar import get_trading_date, is_market_open
+from app.utils.retry import batch_deadline
 from app.utils.slack_notifier import send_slack_error_log
-from app.exceptions import StockPriceUpdaterException
+from app.exceptions import StockPriceUpdaterException, ValidationException
 
 logger = get_logger(__name__)
 
+# JobManager 작업 종류 (중복 실행 방지 단위)
+UPDATE_PRICES_JOB = "update-prices"
+
+# managed_stocks.refresh_tier 갱신 등급
+REFRESH_TIER_HOT = "hot"
+REFRESH_TIER_WARM = "warm"
+REFRESH_TIER_COLD = "cold"
+
+# update_runs 체크포인트 상태
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+
+# 기존 행과 비교할 때의 소수점 자릿수 (stock_prices.close_price/change_percent는 DECIMAL(_, 2))
+PRICE_COMPARE_DECIMALS = 2
+
+# 체크포인트에 저장하는 실패 원인 최대 길이
+CHECKPOINT_ERROR_MAX_LENGTH = 200
+
+# 다른 실행이 리스를 잡고 있어 이번 실행에서 조회하지 않은 심볼의 결과 메시지
+LEASE_DEFERRED_MESSAGE = "다른 실행이 처리 중이어서 보류"
+
 
 class SymbolResult:
     """심볼 처리 결과"""
@@ -35,9 +81,63 @@ class SymbolResult:
         return result
 
 
+def apply_symbol_metadata(quote_data: dict, metadata: Optional[dict]) -> dict:
+    """배치 조회 결과에 없는 통화/종목명을 stock_names 메타데이터로 보강"""
+    if not metadata:
+        return quote_data
+    return {
+        **quote_data,
+        "currency": quote_data.get("currency") or metadata.get("currency"),
+        "name": quote_data.get("name") or metadata.get("name"),
+    }
+
+
+def _round_or_none(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(float(value), PRICE_COMPARE_DECIMALS)
+
+
+def is_quote_unchanged(existing: Optional[dict], quote_data: dict) -> bool:
+    """
+    조회한 시세가 이미 저장된 행과 같은지 확인 (같으면 upsert 생략)
+
+    Args:
+        existing: get_stock_prices_for_dates로 조회한 기존 행 (없으면 None)
+        quote_data: 조회한 시세 (메타데이터 보강 후)
+    """
+    if not existing:
+        return False
+    return (
+        _round_or_none(existing.get("price")) == _round_or_none(quote_data.get("price"))
+        and _round_or_none(existing.get("changePercent"))
+        == _round_or_none(quote_data.get("changePercent"))
+        and existing.get("name") == quote_data.get("name")
+        and existing.get("currency") == quote_data.get("currency")
+        and all(
+            _round_or_none(existing.get(key)) == _round_or_none(quote_data.get(key))
+            for key in ("open", "high", "low")
+        )
+        and existing.get("volume") == quote_data.get("volume")
+    )
+
+
+def get_refresh_due_cutoffs(now: Optional[datetime] = None) -> Dict[str, str]:
+    """갱신 등급(refresh_tier)별로 last_fetched_at이 이 시각보다 오래되면 갱신 대상"""
+    now = now or datetime.now(timezone.utc)
+    intervals = {
+        REFRESH_TIER_HOT: settings.refresh_tier_hot_minutes,
+        REFRESH_TIER_WARM: settings.refresh_tier_warm_minutes,
+        REFRESH_TIER_COLD: settings.refresh_tier_cold_minutes,
+    }
+    return {
+        tier: (now - timedelta(minutes=minutes)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for tier, minutes in intervals.items()
+    }
+
+
 async def determine_symbols(
     request_symbols: Optional[List[str]] = None,
     country: Optional[str] = None,
+    tiered: bool = False,
 ) -> List[Dict[str, str]]:
     """
     심볼 목록 결정 (우선순위: request body > 환경변수 > DB)
@@ -45,6 +145,7 @@ async def determine_symbols(
     Args:
         request_symbols: 요청 본문의 심볼 목록
         country: 국가 필터
+        tiered: DB 조회 시 갱신 등급별 주기가 지난 심볼만 조회
 
     Returns:
         List[Dict[str, str]]: 결정된 심볼 목록 (각 항목은 {"symbol": "...", "country": "..."})
@@ -75,175 +176,642 @@ async def determine_symbols(
             logger.info(f"환경변수에서 {len(stocks)}개 심볼 로드: {symbols_only}")
         else:
             # DB에서 활성화된 종목 조회 (symbol과 country 모두 포함)
-            stocks = await get_managed_stocks(country=country)
+            stocks = await get_managed_stocks(
+                country=country,
+                due_cutoffs=get_refresh_due_cutoffs() if tiered else None,
+            )
             symbols_only = [s["symbol"] for s in stocks]
             logger.info(f"DB에서 {len(stocks)}개 활성화된 종목 조회: {symbols_only}")
 
     return stocks
 
 
+def validate_shard(shard_index: Optional[int], shard_count: Optional[int]) -> None:
+    """샤드 파라미터 검증 (둘 다 없거나, 0 <= shard_index < shard_count)"""
+    if shard_index is None and shard_count is None:
+        return
+    if shard_index is None or shard_count is None:
+        raise ValidationException("shard_index와 shard_count는 함께 지정해야 합니다.")
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValidationException(
+            f"잘못된 샤드 지정입니다: shard_index={shard_index}, shard_count={shard_count}"
+        )
+
+
+def get_symbol_shard(symbol: str, shard_count: int) -> int:
+    """
+    심볼이 속한 샤드 번호 (MD5 기반이라 프로세스/인스턴스가 달라도 항상 같은 값)
+    """
+    digest = hashlib.md5(symbol.upper().encode()).hexdigest()
+    return int(digest, 16) % shard_count
+
+
 async def filter_symbols_to_fetch(
     stocks: List[Dict[str, str]],
-) -> tuple[List[Dict[str, str]], Dict[str, dict]]:
+    refresh: bool = False,
+) -> tuple[List[Dict[str, str]], Dict[str, dict], Dict[str, dict]]:
     """
     실제 API 호출이 필요한 심볼만 필터링 (N+1 문제 방지)
 
+    심볼마다 국가와 시장 캘린더로 기준 거래일을 계산하고(US는 KST 어제, 주말/휴장일은 직전 거래일),
+    해당 거래일 데이터가 이미 있는 심볼과 연속 실패로 격리 중인 심볼은 제외합니다.
+    refresh이면 이미 있는 심볼도 다시 조회합니다 (장중 갱신, 값이 바뀐 행만 저장).
+
     Args:
         stocks: 전체 심볼 목록 (각 항목은 {"symbol": "...", "country": "..."})
+        refresh: 기준 거래일 데이터가 이미 있어도 다시 조회할지 여부
 
     Returns:
-        tuple[List[Dict[str, str]], Dict[str, dict]]: (API 호출 필요한 심볼 목록, 이미 존재하는 가격 데이터)
+        tuple[List[Dict[str, str]], Dict[str, dict], Dict[str, dict]]:
+            (API 호출 필요한 심볼 목록, 이미 존재하는 가격 데이터, symbol_failures 실패 기록)
     """
     if not stocks:
-        return [], {}
-
-    # 심볼만 추출하여 조회
-    symbols = [s["symbol"] for s in stocks]
-    # 오늘 날짜 데이터를 한 번에 조회 (N+1 문제 방지)
-    existing_prices = await get_today_stock_prices(symbols)
+        return [], {}, {}
+
+    # 심볼별 기준 거래일 계산
+    symbol_dates = {
+        s["symbol"].upper(): get_trading_date(s.get("country", "KR")) for s in stocks
+    }
+    # 기준 거래일 데이터를 한 번에 조회 (N+1 문제 방지)
+    existing_prices = await get_stock_prices_for_dates(symbol_dates)
     existing_symbols = set(existing_prices.keys())
-    all_symbols = set(s["symbol"].upper() for s in stocks)
+    all_symbols = set(symbol_dates.keys())
 
-    # 메모리에서 비교: 수집해야 할 목록 - 이미 있는 목록 = API 호출할 목록
-    symbols_to_fetch_set = all_symbols - existing_symbols
+    # 연속 실패로 격리 중인 심볼 (다음 재시도 시각 전까지 API 호출 생략)
+    symbol_failures = await get_symbol_failures()
+    quarantined_symbols = set(get_quarantined_symbols(symbol_failures).keys())
+
+    # 메모리에서 비교: 수집해야 할 목록 - 이미 있는 목록 - 격리 목록 = API 호출할 목록
+    if refresh:
+        symbols_to_fetch_set = all_symbols - quarantined_symbols
+    else:
+        symbols_to_fetch_set = all_symbols - existing_symbols - quarantined_symbols
 
     # symbols_to_fetch를 원래 stocks 형태로 유지 (country 정보 포함)
     stocks_to_fetch = [s for s in stocks if s["symbol"] in symbols_to_fetch_set]
 
     logger.info(
         f"배치 작업 시작: 전체 {len(all_symbols)}개, "
-        f"이미 있음 {len(existing_symbols)}개, "
+        f"이미 있음 {len(existing_symbols)}개{' (refresh: 다시 조회)' if refresh else ''}, "
+        f"격리 중 {len((all_symbols - existing_symbols) & quarantined_symbols)}개, "
         f"API 호출 필요 {len(stocks_to_fetch)}개"
     )
 
-    return stocks_to_fetch, existing_prices
+    return stocks_to_fetch, existing_prices, symbol_failures
+
+
+def build_run_key(
+    request_symbols: Optional[List[str]] = None,
+    country: Optional[str] = None,
+    shard_index: Optional[int] = None,
+    shard_count: Optional[int] = None,
+    refresh: bool = False,
+    tiered: bool = False,
+    tick_bucket: Optional[datetime] = None,
+) -> str:
+    """
+    가격 업데이트 실행 키 (같은 날 같은 파라미터의 실행은 같은 키)
+
+    스케줄러 재시도나 인스턴스 재시작 후 다시 호출된 실행이 이전 체크포인트를 찾는 데 사용합니다.
+    """
+    symbols = sorted({s.strip().upper() for s in request_symbols or [] if s.strip()})
+    payload = json.dumps(
+        {
+            "date": get_today_date(),
+            "symbols": symbols,
+            "country": country,
+            "shard": [shard_index, shard_count],
+            "refresh": refresh,
+            "tiered": tiered,
+            "tickBucket": tick_bucket.isoformat() if tick_bucket else None,
+        },
+        sort_keys=True,
+    )
+    return hashlib.md5(payload.encode()).hexdigest()
+
+
+class PriceUpdateRun:
+    """
+    가격 업데이트 실행 1건의 상태 (파이프라인 조회 단계와 저장 단계가 공유)
+    """
+
+    def __init__(
+        self,
+        run_key: str,
+        params: dict,
+        job: Job,
+        tick_bucket: Optional[datetime] = None,
+    ):
+        self.run_key = run_key
+        self.params = params
+        self.job = job
+        # 장중 모드면 스냅샷을 저장할 시간 버킷 시작 시각 (UTC), 아니면 None
+        self.tick_bucket = tick_bucket
+        self.stocks_to_fetch: List[Dict[str, str]] = []
+        # 심볼별 처리 결과 (None이면 성공, 문자열이면 실패 원인), 삽입 순서 = 결과 순서
+        self.done: Dict[str, Optional[str]] = {}
+        self.symbol_failures: Dict[str, dict] = {}
+        # 기준 거래일에 이미 저장된 행 (값이 같으면 저장 생략)
+        self.existing_prices: Dict[str, dict] = {}
+        self.total_symbols = 0
+        # 리스 소유자 (호출마다 고유, 재개한 실행도 새 값을 쓰므로 중단된 실행의 리스는 TTL 만료 후 넘겨받음)
+        self.lease_owner = f"{run_key}:{uuid.uuid4().hex}"
+        # 다른 실행이 리스를 잡고 있어 조회하지 않은 심볼 (성공/실패로 세지 않음)
+        self.deferred: List[str] = []
+        # 저장 통계 (written: 저장한 행, skipped_unchanged: 값이 같아 저장을 생략한 행)
+        self.written = 0
+        self.skipped_unchanged = 0
+        # 이번 호출의 조회 결과 누계 (실행이 끝난 뒤 한 번에 symbol_failures 갱신)
+        self.fetch_attempted = 0
+        self.fetch_failed: Dict[str, str] = {}
+        self.fetch_succeeded: List[str] = []
+
+    async def save_checkpoint(self, status: str) -> None:
+        """update_runs 체크포인트 저장 (실패해도 배치는 계속 진행)"""
+        await upsert_update_run(
+            {
+                "run_key": self.run_key,
+                "status": status,
+                "params": self.params,
+                "pending": [
+                    {"symbol": s["symbol"], "country": s.get("country")}
+                    for s in self.stocks_to_fetch
+                    if s["symbol"] not in self.done
+                ],
+                "done": {
+                    symbol: error[:CHECKPOINT_ERROR_MAX_LENGTH] if error else None
+                    for symbol, error in self.done.items()
+                },
+                "total": self.total_symbols,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+
+
+async def _acquire_chunk_leases(
+    chunk: List[Dict[str, str]], owner: str, skip_saved: bool
+) -> tuple[List[Dict[str, str]], List[str], List[str]]:
+    """
+    청크의 (심볼, 기준 거래일) 리스를 획득
+
+    리스는 저장이 끝나면 해제되므로, 다른 실행이 이미 저장하고 해제한 심볼의 리스를 받을 수 있습니다.
+    skip_saved이면 획득한 심볼 중 기준 거래일 행이 이미 있는 심볼은 조회하지 않고 바로 해제합니다.
+
+    Returns:
+        tuple[List[Dict[str, str]], List[str], List[str]]:
+            (리스를 획득해 조회할 심볼 목록, 다른 인스턴스가 처리 중인 심볼 목록,
+             다른 실행이 이미 저장한 심볼 목록)
+    """
+    if not settings.stock_price_lease_enabled:
+        return chunk, [], []
+
+    symbol_dates = {s["symbol"]: get_trading_date(s.get("country", "KR")) for s in chunk}
+    acquired, error = await acquire_stock_price_leases(
+        symbol_dates, owner, settings.stock_price_lease_ttl_seconds
+    )
+    if error:
+        # 리스 테이블 장애로 배치를 멈추지 않도록 리스 없이 진행
+        logger.warning(f"리스 획득 실패로 리스 없이 진행: {error}")
+        return chunk, [], []
+
+    acquired_symbols = set(acquired)
+    saved: List[str] = []
+    if skip_saved and acquired:
+        saved = list(await get_stock_prices_for_dates({s: symbol_dates[s] for s in acquired}))
+        if saved:
+            await release_stock_price_leases(saved, owner)
+            acquired_symbols.difference_update(saved)
+    return (
+        [s for s in chunk if s["symbol"] in acquired_symbols],
+        [s["symbol"] for s in chunk if s["symbol"] not in acquired and s["symbol"] not in saved],
+        saved,
+    )
+
+
+async def _fetch_chunk(
+    run: PriceUpdateRun,
+    chunk: List[Dict[str, str]],
+    fetch_deadline: Optional[float],
+    offset: int,
+) -> List[tuple[Dict[str, str], Optional[dict], Optional[str]]]:
+    """
+    파이프라인 조회 단계: 청크 시세 조회 → 메타데이터 보강
+
+    Args:
+        run: 실행 상태
+        chunk: 조회할 심볼 목록
+        fetch_deadline: 시세 조회 데드라인 (time.monotonic 기준, None이면 제한 없음)
+        offset: 로그 번호 시작 위치 (이미 조회된 심볼 수)
+
+    Returns:
+        List[tuple[Dict[str, str], Optional[dict], Optional[str]]]:
+            청크 순서대로 (심볼 정보, 시세 데이터, 실패 원인)
+    """
+    # 국가별 시세 제공자 라우팅으로 일괄 조회 (실패/장애 시 다음 제공자로 전환)
+    # 데드라인은 청크 간에 공유 (이미 지났으면 남은 심볼은 시도하지 않고 실패 처리)
+    remaining = None if fetch_deadline is None else max(fetch_deadline - time.monotonic(), 1e-3)
+    with run.job.phase("fetch"), batch_deadline(remaining):
+        quotes = await quote_router.fetch_quotes(chunk)
+
+    # 통화/종목명이 없는 시세는 stock_names 메타데이터로 한 번에 보강
+    needs_metadata = [
+        symbol
+        for symbol, (quote_data, _) in quotes.items()
+        if quote_data and not (quote_data.get("name") and quote_data.get("currency"))
+    ]
+    with run.job.phase("metadata"):
+        symbols_metadata = await get_symbols_metadata(needs_metadata)
+
+    fetched: List[tuple[Dict[str, str], Optional[dict], Optional[str]]] = []
+    for idx, stock_info in enumerate(chunk, start=offset + 1):
+        symbol = stock_info["symbol"]
+        quote_data, error_reason = quotes.get(symbol, (None, None))
+        if quote_data:
+            quote_data = apply_symbol_metadata(quote_data, symbols_metadata.get(symbol))
+        else:
+            # error_reason이 있으면 구체적인 원인 사용, 없으면 기본 메시지
+            error_reason = error_reason or "가격 정보를 찾을 수 없습니다."
+            logger.error(
+                f"🚨 [{idx}/{run.total_symbols}] '{symbol}' 업데이트 실패 - {error_reason}"
+            )
+            # Slack 상세 에러 리포트 전송
+            send_slack_error_log(symbol, Exception(error_reason))
+            run.job.record(False)
+        fetched.append((stock_info, quote_data, error_reason))
+    return fetched
+
+
+async def _save_fetched_quotes(
+    run: PriceUpdateRun,
+    fetched: List[tuple[Dict[str, str], Optional[dict], Optional[str]]],
+) -> None:
+    """
+    파이프라인 저장 단계: 대량 upsert → 조회 결과 누계 → run.done에 결과 기록
+
+    - 일반 모드: 기준 거래일 행이 이미 있고 가격/등락률/종목명/통화가 같으면 저장 생략
+    - 장중 모드: 일별 행 대신 stock_price_ticks에 시간 버킷 스냅샷으로 저장
+    """
+    offset = len(run.done)
+    quoted = [(stock_info, quote_data) for stock_info, quote_data, _ in fetched if quote_data]
+
+    with run.job.phase("save"):
+        if run.tick_bucket:
+            records = [
+                build_stock_price_tick_record(
+                    stock_info["symbol"],
+                    quote_data,
+                    run.tick_bucket,
+                    country=stock_info.get("country", "KR"),
+                )
+                for stock_info, quote_data in quoted
+            ]
+            _, save_errors = await upsert_stock_price_ticks(records)
+        else:
+            # 조회된 시세를 청크 단위 대량 upsert (청크 실패 시 해당 청크만 실패)
+            records = [
+                build_stock_price_record(
+                    stock_info["symbol"],
+                    quote_data,
+                    country=stock_info.get("country", "KR"),  # 기본값은 KR
+                )
+                for stock_info, quote_data in quoted
+                if not is_quote_unchanged(
+                    run.existing_prices.get(stock_info["symbol"]), quote_data
+                )
+            ]
+            skipped_unchanged = len(quoted) - len(records)
+            _, save_errors = await upsert_stock_prices(records)
+            run.skipped_unchanged += skipped_unchanged
+            if skipped_unchanged:
+                logger.info(f"값이 바뀌지 않은 {skipped_unchanged}개 행은 저장 생략")
+        run.written += len(records) - len(save_errors)
+
+        # 갱신 등급별 주기 계산용 마지막 조회 시각 기록 (저장 생략한 심볼도 조회는 했으므로 포함)
+        await touch_managed_stocks_fetched(
+            [
+                stock_info["symbol"]
+                for stock_info, _ in quoted
+                if stock_info["symbol"] not in save_errors
+            ]
+        )
+
+    # 심볼별 연속 실패 기록용 누계 (업스트림 전체 문제로 인한 실패는 제외)
+    run.fetch_attempted += len(fetched)
+    run.fetch_failed.update(
+        {
+            stock_info["symbol"]: error_reason
+            for stock_info, quote_data, error_reason in fetched
+            if not quote_data and is_symbol_specific_failure(error_reason)
+        }
+    )
+    run.fetch_succeeded.extend(stock_info["symbol"] for stock_info, _ in quoted)
+
+    # 저장이 끝난 심볼의 리스 해제 (다른 파라미터의 실행이 TTL까지 기다리지 않도록)
+    if not run.tick_bucket and settings.stock_price_lease_enabled:
+        await release_stock_price_leases(
+            [stock_info["symbol"] for stock_info, _, _ in fetched], run.lease_owner
+        )
+
+    # fetched 순서대로 결과 기록 (results 순서는 항상 동일)
+    for idx, (stock_info, quote_data, fetch_error) in enumerate(fetched, start=offset + 1):
+        symbol = stock_info["symbol"]
+        if not quote_data:
+            run.done[symbol] = fetch_error
+        elif symbol in save_errors:
+            error_msg = save_errors[symbol]
+            run.done[symbol] = error_msg
+            run.job.record(False)
+            logger.error(
+                f"🚨 [{idx}/{run.total_symbols}] '{symbol}' 업데이트 실패 - {error_msg}"
+            )
+        else:
+            run.done[symbol] = None
+            run.job.record(True)
+            logger.info(f"✅ [{idx}/{run.total_symbols}] '{symbol}' 업데이트 성공")
+
+
+async def _run_save_stage(run: PriceUpdateRun, queue: asyncio.Queue) -> None:
+    """
+    파이프라인 저장 단계 워커
+
+    큐에서 조회 결과를 꺼내, 이미 쌓여 있는 결과는 upsert 청크 크기까지 모아 한 번에 저장하고
+    저장이 끝날 때마다 체크포인트를 갱신합니다. None을 받으면 종료합니다.
+    """
+    finished = False
+    while not finished:
+        items = [await queue.get()]
+        while (
+            items[-1] is not None
+            and not queue.empty()
+            and sum(len(fetched) for _, _, fetched in items) < settings.stock_price_upsert_chunk_size
+        ):
+            items.append(queue.get_nowait())
+        if items[-1] is None:
+            finished = True
+            items.pop()
+
+        for leased_elsewhere, saved_elsewhere, _ in items:
+            for symbol in leased_elsewhere:
+                run.deferred.append(symbol)
+                logger.info(f"'{symbol}' - {LEASE_DEFERRED_MESSAGE}")
+            # 리스를 받는 사이 다른 실행이 저장을 마친 종목은 성공으로 처리
+            for symbol in saved_elsewhere:
+                run.done[symbol] = None
+                run.job.record(True)
+                logger.info(f"'{symbol}' - 다른 실행이 이미 DB에 저장하여 스킵")
+
+        fetched = [entry for _, _, chunk_fetched in items for entry in chunk_fetched]
+        if fetched:
+            await _save_fetched_quotes(run, fetched)
+
+        if items and len(run.done) < run.total_symbols:
+            await run.save_checkpoint(RUN_RUNNING)
+
+
+async def _put_to_save_stage(queue: asyncio.Queue, item, writer: asyncio.Task) -> None:
+    """
+    저장 단계 큐에 넣기 (큐가 가득 차면 대기 = 백프레셔)
+
+    저장 단계가 예외로 먼저 종료되면 영원히 기다리지 않고 그 예외를 올립니다.
+    """
+    put = asyncio.ensure_future(queue.put(item))
+    await asyncio.wait({put, writer}, return_when=asyncio.FIRST_COMPLETED)
+    if not put.done():
+        put.cancel()
+        writer.result()
+        raise StockPriceUpdaterException("저장 단계가 예기치 않게 종료되었습니다.")
 
 
 async def update_stock_prices(
     request_symbols: Optional[List[str]] = None,
     country: Optional[str] = None,
+    shard_index: Optional[int] = None,
+    shard_count: Optional[int] = None,
+    refresh: bool = False,
+    tiered: bool = False,
+    intraday: bool = False,
+    job: Optional[Job] = None,
 ) -> Dict:
     """
     주식 가격을 업데이트하는 메인 비즈니스 로직
 
     성능 최적화:
     1. managed_stocks에서 활성화된 심볼 목록 조회 (쿼리 1번)
-    2. stock_prices에서 오늘 날짜 데이터를 한 번에 조회 (쿼리 1번)
+    2. stock_prices에서 심볼별 기준 거래일 데이터를 한 번에 조회 (쿼리 1번)
     3. 메모리에서 비교하여 실제 API 호출이 필요한 심볼만 필터링
-    4. 각 심볼에 대해 개별 try-except로 실패 격리
+    4. 국가별 시세 제공자 라우팅으로 조회 (기본: KR은 KRX 종가 스냅샷 → Yahoo,
+       US는 Yahoo 멀티 티커 배치 → FDR), 실패/장애 시 다음 제공자로 전환
+    5. 각 심볼별로 실패 격리 (연속 실패한 심볼은 symbol_failures로 지수적으로 늘어나는 기간 동안 조회 생략)
+    6. 조회된 시세를 청크 단위 대량 upsert (청크 실패 시 해당 청크 심볼만 실패 처리)
+    7. 체크포인트 단위마다 완료/남은 심볼을 update_runs에 기록하여, 중단된 실행을
+       다시 호출하면 심볼 결정/필터링 없이 남은 심볼부터 이어서 처리
+    8. 조회 단계와 저장 단계를 크기 제한 큐로 연결한 파이프라인으로 실행하여
+       다음 청크 조회와 이전 청크 저장을 겹쳐 처리 (큐 크기로 메모리 사용량 제한)
+    9. shard_index/shard_count로 심볼 해시 기준 일부만 처리하고, stock_price_leases 리스로
+       여러 인스턴스가 같은 날 같은 심볼을 중복 조회하지 않도록 보장
+    10. tiered이면 managed_stocks의 갱신 등급별 주기가 지난 심볼만 한 번의 쿼리로 조회
+    11. intraday이면 일별 행을 덮어쓰지 않고 시간 버킷 스냅샷을 대량 upsert
 
     Args:
         request_symbols: 요청 본문의 심볼 목록
         country: 국가 필터
+        shard_index: 이 실행이 담당할 샤드 번호 (0부터 시작)
+        shard_count: 전체 샤드 수
+        refresh: 기준 거래일 데이터가 이미 있는 심볼도 다시 조회 (값이 바뀐 행만 저장)
+        tiered: managed_stocks의 갱신 등급(hot/warm/cold)별 주기가 지난 심볼만 조회
+            (주기가 지난 심볼은 refresh처럼 기준 거래일 데이터가 있어도 다시 조회)
+        intraday: 장중 스냅샷 모드 - 정규장이 열려 있는 심볼만 조회하여 일별 행 대신
+            stock_price_ticks에 시간 버킷 단위로 저장 (종가 반영은 rollup_intraday_prices)
+        job: 진행 상황/단계별 소요 시간을 기록할 작업 (백그라운드 실행 시 JobManager가 전달)
 
     Returns:
-        Dict: 업데이트 결과 (success, total, successCount, failureCount, results)
+        Dict: 업데이트 결과 (success, total, successCount, failureCount,
+            writtenCount, skippedUnchangedCount, results)
     """
+    job = job or Job(UPDATE_PRICES_JOB)
     try:
-        # 1. 심볼 목록 결정
-        stocks = await determine_symbols(request_symbols, country)
-
-        if not stocks:
-            return {
-                "success": True,
-                "total": 0,
-                "successCount": 0,
-                "failureCount": 0,
-                "results": [],
-            }
+        # 장중 모드는 시간 버킷마다 별도 실행 (같은 버킷 안의 재호출만 체크포인트를 이어받음)
+        tick_bucket = get_tick_bucket() if intraday else None
+        # 갱신 주기가 지난 심볼/장중 스냅샷은 당일 데이터가 있어도 다시 조회해야 하므로 refresh로 처리
+        refresh = refresh or tiered or intraday
+        run_key = build_run_key(
+            request_symbols, country, shard_index, shard_count, refresh, tiered, tick_bucket
+        )
+        run = PriceUpdateRun(
+            run_key,
+            params={
+                "symbols": request_symbols,
+                "country": country,
+                "shardIndex": shard_index,
+                "shardCount": shard_count,
+                "refresh": refresh,
+                "tiered": tiered,
+                "intraday": intraday,
+            },
+            job=job,
+            tick_bucket=tick_bucket,
+        )
+
+        with job.phase("prepare"):
+            checkpoint = await get_update_run(run_key)
+            resumed = bool(checkpoint and checkpoint.get("status") == RUN_RUNNING)
+
+            if resumed:
+                # 중단된 실행 재개: 심볼 결정/기준 거래일 조회 없이 남은 심볼만 처리
+                # (기존 행을 다시 조회하지 않으므로 변경 여부 비교 없이 저장)
+                run.done = dict(checkpoint.get("done") or {})
+                run.stocks_to_fetch = [
+                    s for s in (checkpoint.get("pending") or []) if s["symbol"] not in run.done
+                ]
+                run.symbol_failures = await get_symbol_failures()
+                logger.info(
+                    f"♻️ 중단된 배치 작업 재개 ({run_key}) - "
+                    f"완료 {len(run.done)}개, 남은 종목 {len(run.stocks_to_fetch)}개"
+                )
+            else:
+                # 1. 심볼 목록 결정
+                stocks = await determine_symbols(request_symbols, country, tiered)
+
+                # 샤드 지정 시 이 샤드에 속한 심볼만 처리
+                if shard_count:
+                    stocks = [
+                        s for s in stocks if get_symbol_shard(s["symbol"], shard_count) == shard_index
+                    ]
+                    logger.info(f"샤드 {shard_index}/{shard_count}: {len(stocks)}개 심볼 담당")
+
+                # 장중 모드는 정규장이 열려 있는 시장의 심볼만 조회
+                if intraday:
+                    stocks = [s for s in stocks if is_market_open(s.get("country", "KR"))]
+                    logger.info(f"장중 스냅샷 ({tick_bucket.isoformat()}): 장 운영 중 {len(stocks)}개 심볼")
+
+                if not stocks:
+                    return {
+                        "success": True,
+                        "total": 0,
+                        "successCount": 0,
+                        "failureCount": 0,
+                        "writtenCount": 0,
+                        "skippedUnchangedCount": 0,
+                        "deferredCount": 0,
+                        "results": [],
+                    }
+
+                # 2. API 호출이 필요한 심볼 필터링
+                (
+                    run.stocks_to_fetch,
+                    run.existing_prices,
+                    run.symbol_failures,
+                ) = await filter_symbols_to_fetch(stocks, refresh=refresh)
+                fetch_symbols = {s["symbol"] for s in run.stocks_to_fetch}
+                skipped_existing = [s for s in run.existing_prices if s not in fetch_symbols]
+                quarantined_symbols = list(
+                    dict.fromkeys(
+                        s["symbol"]
+                        for s in stocks
+                        if s["symbol"] not in run.existing_prices
+                        and s["symbol"] not in fetch_symbols
+                    )
+                )
+                total_symbols = (
+                    len(run.stocks_to_fetch) + len(skipped_existing) + len(quarantined_symbols)
+                )
 
-        # 2. API 호출이 필요한 심볼 필터링
-        stocks_to_fetch, existing_prices = await filter_symbols_to_fetch(stocks)
+                # 이미 있는 종목은 성공으로 처리
+                for idx, symbol in enumerate(skipped_existing, start=1):
+                    run.done[symbol] = None
+                    logger.info(f"[{idx}/{total_symbols}] '{symbol}' - 이미 DB에 존재하여 스킵")
+
+                # 격리 중인 종목은 조회하지 않고 실패로 처리 (Slack 알림 생략)
+                for idx, symbol in enumerate(quarantined_symbols, start=len(run.done) + 1):
+                    failure = run.symbol_failures.get(symbol) or {}
+                    error_msg = (
+                        f"연속 {failure.get('failure_count', 0)}회 실패로 격리 중 "
+                        f"(다음 재시도: {failure.get('next_retry_at')})"
+                    )
+                    run.done[symbol] = error_msg
+                    logger.info(f"[{idx}/{total_symbols}] '{symbol}' - {error_msg}")
 
         # 전체 업데이트 대상 종목 수 계산
-        total_symbols = len(stocks_to_fetch) + len(existing_prices)
+        run.total_symbols = len(run.done) + len(run.stocks_to_fetch)
+        total_symbols = run.total_symbols
+        job.set_total(total_symbols)
+        job.record(True, sum(1 for error in run.done.values() if error is None))
+        job.record(False, sum(1 for error in run.done.values() if error is not None))
 
         # 🚀 시작 로그
         logger.info(f"🚀 배치 작업 시작 - 업데이트 대상: {total_symbols}개 종목")
 
-        # 3. 각 심볼에 대해 개별 try-except로 실패 격리
-        results: List[SymbolResult] = []
-        failed_symbols: List[str] = []  # 실패한 종목 리스트
-
-        # 이미 있는 종목은 성공으로 처리
-        for idx, symbol in enumerate(existing_prices.keys(), start=1):
-            results.append(SymbolResult(symbol=symbol, success=True))
-            logger.info(f"[{idx}/{total_symbols}] '{symbol}' - 이미 DB에 존재하여 스킵")
-
-        # API 호출이 필요한 종목 처리
-        processed_count = len(existing_prices)
-        for stock_info in stocks_to_fetch:
-            symbol = stock_info["symbol"]
-            stock_country = stock_info.get("country", "KR")  # 기본값은 KR
-            processed_count += 1
-            try:
-                # 진행 상황 로그: 시작
-                logger.info(
-                    f"[{processed_count}/{total_symbols}] '{symbol}' 데이터 업데이트 시도..."
-                )
-
-                # Yahoo Finance API에서 데이터 가져오기
-                quote_data, error_reason = await get_quote_data(symbol)
-
-                if not quote_data:
-                    # error_reason이 있으면 구체적인 원인 사용, 없으면 기본 메시지
-                    error_msg = error_reason or "가격 정보를 찾을 수 없습니다."
-                    results.append(
-                        SymbolResult(
-                            symbol=symbol,
-                            success=False,
-                            error=error_msg,
-                        )
+        # 3. 체크포인트 단위로 조회 → 저장 → 체크포인트 갱신
+        #    (인스턴스가 중간에 재시작되어도 다음 실행이 남은 심볼부터 이어서 처리)
+        stocks_to_fetch = run.stocks_to_fetch
+        if stocks_to_fetch:
+            await run.save_checkpoint(RUN_RUNNING)
+
+        # 조회 단계(이 함수)와 저장 단계(writer)를 크기 제한 큐로 연결하여
+        # 네트워크 조회와 DB 저장을 겹쳐 실행
+        # 재시도 대기는 배치 데드라인 안에서만 수행하여 최악의 경우 소요 시간을 제한
+        fetch_deadline = (
+            time.monotonic() + settings.batch_deadline_seconds
+            if settings.batch_deadline_seconds
+            else None
+        )
+        chunk_size = max(1, settings.update_checkpoint_chunk_size)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, settings.update_pipeline_queue_size))
+        writer = asyncio.create_task(_run_save_stage(run, queue))
+        try:
+            fetched_count = len(run.done)
+            for start in range(0, len(stocks_to_fetch), chunk_size):
+                chunk = stocks_to_fetch[start : start + chunk_size]
+                # 장중 스냅샷은 버킷마다 다시 조회해야 하므로 (심볼, 거래일) 리스를 쓰지 않음
+                leased_elsewhere: List[str] = []
+                saved_elsewhere: List[str] = []
+                if not intraday:
+                    chunk, leased_elsewhere, saved_elsewhere = await _acquire_chunk_leases(
+                        chunk, run.lease_owner, skip_saved=not refresh
                     )
-                    failed_symbols.append(symbol)
-                    logger.error(f"🚨 '{symbol}' 업데이트 실패 - {error_msg}")
-                    # Slack 상세 에러 리포트 전송
-                    send_slack_error_log(symbol, Exception(error_msg))
-                    continue
-
-                # Supabase에 저장 (country 정보 전달)
-                saved, save_error = await save_stock_price_to_db(
-                    symbol, quote_data, country=stock_country
+                fetched_count += len(leased_elsewhere) + len(saved_elsewhere)
+                fetched = (
+                    await _fetch_chunk(run, chunk, fetch_deadline, fetched_count) if chunk else []
                 )
-
-                if saved:
-                    results.append(SymbolResult(symbol=symbol, success=True))
-                    logger.info(f"✅ '{symbol}' 업데이트 성공")
-                else:
-                    # 구체적인 에러 메시지 사용 (없으면 기본 메시지)
-                    error_msg = save_error or "Supabase 저장 실패"
-                    results.append(
-                        SymbolResult(
-                            symbol=symbol,
-                            success=False,
-                            error=error_msg,
-                        )
-                    )
-                    failed_symbols.append(symbol)
-                    logger.error(f"🚨 '{symbol}' 업데이트 실패 - {error_msg}")
-                    # Slack 상세 에러 리포트 전송
-                    send_slack_error_log(symbol, Exception(error_msg))
-
-            except Exception as e:
-                # 실패 격리: 한 종목 실패가 전체를 중단시키지 않음
-                error_message = str(e)
-                results.append(
-                    SymbolResult(symbol=symbol, success=False, error=error_message)
+                fetched_count += len(chunk)
+                await _put_to_save_stage(
+                    queue, (leased_elsewhere, saved_elsewhere, fetched), writer
                 )
-                failed_symbols.append(symbol)
 
-                # 상세 에러 로그 (traceback 포함)
-                error_traceback = traceback.format_exc()
-                logger.error(
-                    f"🚨 '{symbol}' 업데이트 실패 - {error_message}\n"
-                    f"Traceback:\n{error_traceback}"
-                )
-                # Slack 상세 에러 리포트 전송 (Block Kit 사용)
-                send_slack_error_log(symbol, e)
+            await _put_to_save_stage(queue, None, writer)
+            await writer
+        finally:
+            if not writer.done():
+                writer.cancel()
+
+        # 심볼별 연속 실패 기록 갱신 (실패 비율은 저장 묶음이 아니라 실행 전체 기준으로 판단)
+        with job.phase("save"):
+            await record_fetch_outcomes(
+                previous_failures=run.symbol_failures,
+                failed=run.fetch_failed,
+                succeeded=run.fetch_succeeded,
+                attempted=run.fetch_attempted,
+            )
+
+        if stocks_to_fetch or resumed:
+            await run.save_checkpoint(RUN_COMPLETED)
+
+        results = [
+            SymbolResult(symbol=symbol, success=error is None, error=error)
+            for symbol, error in run.done.items()
+        ]
+        failed_symbols = [r.symbol for r in results if not r.success]
 
         # 통계 계산
         success_count = sum(1 for r in results if r.success)
         failure_count = sum(1 for r in results if not r.success)
+        # 보류한 심볼은 성공/실패 어느 쪽에도 세지 않고 결과에만 남김
+        results += [
+            SymbolResult(symbol=symbol, success=False, error=LEASE_DEFERRED_MESSAGE)
+            for symbol in run.deferred
+        ]
+        if run.deferred:
+            logger.info(f"다른 실행이 처리 중이어서 보류한 종목: {', '.join(run.deferred)}")
 
         # 🏁 최종 요약 로그
         if failed_symbols:
@@ -263,6 +831,9 @@ async def update_stock_prices(
             "total": len(results),
             "successCount": success_count,
             "failureCount": failure_count,
+            "writtenCount": run.written,
+            "skippedUnchangedCount": run.skipped_unchanged,
+            "deferredCount": len(run.deferred),
             "results": [r.to_dict() for r in results],
         }
 
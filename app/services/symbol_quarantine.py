@@ -0,0 +1,117 @@
+"""계속 실패하는 심볼의 격리(negative cache / circuit breaker)"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.repositories.supabase_client import (
+    delete_symbol_failures,
+    upsert_symbol_failures,
+)
+from app.utils.logging_config import get_logger
+from app.utils.retry import DEADLINE_EXCEEDED_REASON, RateLimitedReason
+
+logger = get_logger(__name__)
+
+
+def compute_cooldown(failure_count: int) -> timedelta:
+    """
+    연속 실패 횟수에 따른 격리 시간
+
+    settings.symbol_failure_threshold회 미만이면 격리하지 않고(0),
+    이후에는 base부터 실패할 때마다 2배씩 늘려 max까지 격리합니다.
+    """
+    if failure_count < settings.symbol_failure_threshold:
+        return timedelta(0)
+    exponent = failure_count - settings.symbol_failure_threshold
+    minutes = min(
+        settings.symbol_cooldown_base_minutes * (2**exponent),
+        settings.symbol_cooldown_max_minutes,
+    )
+    return timedelta(minutes=minutes)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def get_quarantined_symbols(
+    failures: Dict[str, dict], now: Optional[datetime] = None
+) -> Dict[str, dict]:
+    """실패 기록 중 다음 재시도 시각이 아직 오지 않은 심볼만 반환"""
+    now = now or datetime.now(timezone.utc)
+    quarantined: Dict[str, dict] = {}
+    for symbol, failure in failures.items():
+        next_retry_at = _parse_timestamp(failure.get("next_retry_at"))
+        if next_retry_at and next_retry_at > now:
+            quarantined[symbol] = failure
+    return quarantined
+
+
+def is_symbol_specific_failure(error_reason: Optional[str]) -> bool:
+    """
+    심볼 자체의 문제로 볼 수 있는 실패인지 확인
+    (429/배치 데드라인 초과처럼 업스트림 전체 상태로 인한 실패는 기록하지 않음)
+    """
+    if isinstance(error_reason, RateLimitedReason):
+        return False
+    return not (error_reason or "").startswith(DEADLINE_EXCEEDED_REASON)
+
+
+async def record_fetch_outcomes(
+    previous_failures: Dict[str, dict],
+    failed: Dict[str, str],
+    succeeded: List[str],
+    attempted: int,
+) -> None:
+    """
+    이번 실행의 조회 결과로 symbol_failures를 갱신합니다.
+
+    - 실패한 심볼: failure_count를 1 늘리고 격리 시간(next_retry_at)을 다시 계산
+    - 실패 기록이 있던 심볼이 성공: 기록 삭제
+    - 조회 대상의 settings.symbol_failure_max_ratio 이상이 실패하면 업스트림 장애로 보고 기록하지 않음
+
+    Args:
+        previous_failures: 실행 전 symbol_failures 기록
+        failed: 심볼별 실패 원인 (심볼 자체 문제로 판단된 것만)
+        succeeded: 조회에 성공한 심볼 목록
+        attempted: 이번 실행에서 조회를 시도한 심볼 수
+    """
+    recovered = [s for s in succeeded if s in previous_failures]
+    if recovered:
+        deleted, _ = await delete_symbol_failures(recovered)
+        logger.info(f"실패 기록 해제: {deleted}개 심볼 ({', '.join(recovered)})")
+
+    if not failed:
+        return
+
+    if attempted and len(failed) / attempted >= settings.symbol_failure_max_ratio:
+        logger.warning(
+            f"조회 대상 {attempted}개 중 {len(failed)}개 실패: 업스트림 장애로 보고 실패 기록 생략"
+        )
+        return
+
+    now = datetime.now(timezone.utc)
+    records = []
+    for symbol, error_reason in failed.items():
+        failure_count = (previous_failures.get(symbol) or {}).get("failure_count", 0) + 1
+        cooldown = compute_cooldown(failure_count)
+        records.append(
+            {
+                "symbol": symbol,
+                "failure_count": failure_count,
+                "last_error": (error_reason or "")[:500],
+                "last_failed_at": now.isoformat(),
+                "next_retry_at": (now + cooldown).isoformat() if cooldown else None,
+            }
+        )
+        if cooldown:
+            logger.warning(
+                f"'{symbol}' 연속 {failure_count}회 실패로 "
+                f"{int(cooldown.total_seconds() // 60)}분 동안 격리"
+            )
+
+    await upsert_symbol_failures(records)
@@ -1,238 +1,244 @@
 import asyncio
 import yfinance as yf
-import json
-from typing import Optional
-from app.utils.rate_limiter import request_queue
+import pandas as pd
+from typing import Callable, Dict, List, Optional
+from app.utils.blocking_executor import blocking_executor
+from app.utils.rate_limiter import yahoo_limiter
+from app.services.yahoo_session import yahoo_session
+from app.utils.retry import (
+    RATE_LIMIT,
+    TRANSIENT,
+    classify_error,
+    retry_async,
+    upstream_error_reason,
+)
 from app.config import settings
 from app.utils.logging_config import get_logger
 from app.utils.slack_notifier import send_slack_error_log
-from app.exceptions import YahooFinanceException, RateLimitException
+from app.exceptions import (
+    DeadlineExceededException,
+    RateLimitException,
+    YahooFinanceException,
+)
 
 logger = get_logger(__name__)
 
+# quote_data의 시가/고가/저가/거래량 키와 일봉 DataFrame 컬럼
+OHLCV_COLUMNS = {"open": "Open", "high": "High", "low": "Low", "volume": "Volume"}
+
+# yf.download는 결과/오류를 모듈 전역(yf.shared)에 모아두므로 재진입이 안전하지 않음.
+# 동시에 실행되면 청크끼리 결과가 섞이거나 지워지므로 한 번에 하나만 실행.
+# 블로킹 스레드/limiter 슬롯을 잡은 채 기다리지 않도록 이벤트 루프에서 잠금
+_DOWNLOAD_LOCK = asyncio.Lock()
+
+
+def _number_or_none(value) -> Optional[float]:
+    return None if value is None or pd.isna(value) else float(value)
+
+
+def ohlcv_from_bar(bar: pd.Series) -> dict:
+    """일봉 한 행에서 quote_data용 시가/고가/저가/거래량 추출 (컬럼이 없거나 NaN이면 None)"""
+    values = {key: _number_or_none(bar.get(column)) for key, column in OHLCV_COLUMNS.items()}
+    if values["volume"] is not None:
+        values["volume"] = int(values["volume"])
+    return values
+
+
+def load_ticker_info(symbol: str) -> dict:
+    """
+    동기 함수: yf.Ticker 생성 후 info를 호출하여 실제 API 요청 발생.
+    (블로킹 HTTP 호출이므로 비동기에서는 blocking_executor로 감쌉니다.)
+    """
+    return yf.Ticker(symbol, session=yahoo_session.session).info
+
+
+def load_fast_info(symbol: str) -> dict:
+    """
+    동기 함수: yf.Ticker.fast_info에서 가격/통화와 당일 시가/고가/저가/거래량을 읽음.
+    모두 차트(chart) 응답 한 번(1년 일봉, fast_info 내부 캐시)으로 채워지므로
+    quoteSummary 전체를 받는 info보다 가볍고, 필드를 더 읽어도 요청이 늘지 않습니다.
+    (previous_close는 시간봉을 추가로 요청하므로 regular_market_previous_close를 사용)
+    """
+    fast_info = yf.Ticker(symbol, session=yahoo_session.session).fast_info
+    return {
+        "lastPrice": fast_info.last_price,
+        "previousClose": fast_info.regular_market_previous_close,
+        "currency": fast_info.currency,
+        "open": fast_info.open,
+        "dayHigh": fast_info.day_high,
+        "dayLow": fast_info.day_low,
+        "volume": fast_info.last_volume,
+    }
+
+
+def classify_yahoo_error(error: BaseException) -> str:
+    """
+    Yahoo 오류 분류: crumb/쿠키 인증 실패는 공용 세션의 crumb를 갱신한 뒤 재시도 대상으로 취급
+    """
+    if yahoo_session.is_auth_error(error):
+        yahoo_session.refresh_crumb()
+        return TRANSIENT
+    return classify_error(error)
+
+
+async def fetch_with_retry(
+    symbol: str, loader: Callable[[str], dict] = load_ticker_info
+) -> dict:
+    """
+    Yahoo Finance API에서 주식 정보를 가져옴 (공통 재시도 정책 적용)
+
+    Args:
+        symbol: 심볼
+        loader: 블로킹 조회 함수 (load_ticker_info 또는 load_fast_info)
+
+    Raises:
+        RateLimitException: 재시도 후에도 429 응답
+        YahooFinanceException: 그 외 재시도 불가/재시도 소진 오류
+        DeadlineExceededException: 배치 데드라인 초과
+    """
+
+    # Rate limiting 적용 (yfinance는 동기 함수이므로 전용 스레드 풀에서 실행)
+    async def fetch_info():
+        return await blocking_executor.run(loader, symbol)
 
-async def fetch_with_retry(symbol: str, retry_count: int = 0) -> Optional[yf.Ticker]:
-    """Yahoo Finance API에서 주식 정보를 가져오고 재시도 로직 적용"""
     try:
-        # Rate limiting 적용 (yfinance는 동기 함수이므로 asyncio.to_thread로 래핑)
-        async def fetch_ticker():
-            # yfinance 기본 기능 사용 (curl_cffi 제거)
-            ticker = yf.Ticker(symbol)
-            # info를 호출하여 실제 API 요청 발생
-            _ = ticker.info
-            return ticker
-
-        ticker = await request_queue.add(fetch_ticker)
-        return ticker
-    except json.JSONDecodeError as error:
-        # JSON 디코드 오류는 보통 rate limit이나 빈 응답으로 인해 발생
-        # "Expecting value: line 1 column 1 (char 0)"는 빈 응답을 의미
-        error_message = str(error)
-        logger.warning(
-            f"JSON 디코드 오류 (rate limit 가능성): {error_message} - 심볼: {symbol}"
+        return await retry_async(
+            lambda: yahoo_limiter.add(fetch_info),
+            f"{symbol} Yahoo Finance 조회",
+            classify=classify_yahoo_error,
         )
+    except DeadlineExceededException:
+        raise
+    except Exception as error:
+        # Slack 알림은 호출자(get_quote_data)에서 한 번만 전송
+        if classify_error(error) == RATE_LIMIT:
+            raise RateLimitException(f"Rate limit 오류: {str(error)}") from error
+        raise YahooFinanceException(
+            f"Yahoo Finance API 오류: {type(error).__name__}: {str(error)}"
+        ) from error
 
-        if retry_count < settings.max_retries:
-            delay = min(
-                settings.initial_retry_delay_ms * (2**retry_count),
-                settings.max_retry_delay_ms,
-            )
-
-            logger.warning(
-                f"JSON 파싱 실패로 인한 재시도. {delay}ms 후 재시도 "
-                f"({retry_count + 1}/{settings.max_retries}): {symbol}"
-            )
-
-            await asyncio.sleep(delay / 1000)
-            return await fetch_with_retry(symbol, retry_count + 1)
-
-        error_msg = f"JSON 디코드 오류: {error_message}"
-        send_slack_error_log(symbol, YahooFinanceException(error_msg))
-        raise YahooFinanceException(error_msg) from error
-    except AttributeError as error:
-        # 'str' object has no attribute 'name' 같은 AttributeError 처리
-        error_message = str(error)
-        logger.warning(
-            f"AttributeError 발생 (yfinance 내부 오류 가능성): {error_message} - 심볼: {symbol}"
-        )
 
-        if retry_count < settings.max_retries:
-            delay = min(
-                settings.initial_retry_delay_ms * (2**retry_count),
-                settings.max_retry_delay_ms,
-            )
+def _quote_from_fast_info(
+    symbol: str, fast_info: dict
+) -> tuple[Optional[dict], Optional[str]]:
+    """load_fast_info 결과를 quote_data로 변환 (종목명은 stock_names/캐시에서 보강)"""
+    last_price = fast_info.get("lastPrice")
+    if not last_price or pd.isna(last_price):
+        error_reason = "가격 정보가 응답에 없음 (fast_info.last_price 없음)"
+        logger.warning(f"{symbol}: {error_reason}")
+        return None, error_reason
+
+    price = float(last_price)
+    change_percent = None
+    previous_close = fast_info.get("previousClose")
+    if previous_close and not pd.isna(previous_close):
+        change_percent = (price - float(previous_close)) / float(previous_close) * 100
 
-            logger.warning(
-                f"AttributeError로 인한 재시도. {delay}ms 후 재시도 "
-                f"({retry_count + 1}/{settings.max_retries}): {symbol}"
-            )
+    volume = _number_or_none(fast_info.get("volume"))
+    return {
+        "symbol": symbol.upper(),
+        "price": price,
+        "currency": fast_info.get("currency"),
+        "name": None,
+        "changePercent": change_percent,
+        "open": _number_or_none(fast_info.get("open")),
+        "high": _number_or_none(fast_info.get("dayHigh")),
+        "low": _number_or_none(fast_info.get("dayLow")),
+        "volume": int(volume) if volume is not None else None,
+    }, None
 
-            await asyncio.sleep(delay / 1000)
-            return await fetch_with_retry(symbol, retry_count + 1)
 
-        error_msg = f"Yahoo Finance API 오류: {error_message}"
-        send_slack_error_log(symbol, YahooFinanceException(error_msg))
-        raise YahooFinanceException(error_msg) from error
-    except Exception as error:
-        error_message = str(error)
-        is_rate_limit_error = (
-            "429" in error_message
-            or "Too Many Requests" in error_message
-            or "rate limit" in error_message.lower()
-            or "JSONDecodeError" in error_message
+def _quote_from_info(symbol: str, info) -> tuple[Optional[dict], Optional[str]]:
+    """ticker.info 응답을 검증하여 quote_data로 변환"""
+    # info가 None이거나 빈 딕셔너리인지 체크
+    if info is None:
+        error_reason = "ticker.info가 None"
+        logger.warning(f"{symbol}: {error_reason}")
+        return None, error_reason
+
+    # info가 문자열인 경우 처리 (yfinance가 때때로 문자열을 반환할 수 있음)
+    if isinstance(info, str):
+        error_reason = f"ticker.info가 문자열로 반환됨 (값: {info[:100] if len(info) > 100 else info})"
+        logger.warning(f"{symbol}: {error_reason}")
+        return None, error_reason
+
+    if not isinstance(info, dict):
+        error_reason = (
+            f"ticker.info가 딕셔너리가 아님 (타입: {type(info).__name__})"
         )
+        logger.warning(f"{symbol}: {error_reason}")
+        return None, error_reason
+
+    # 빈 딕셔너리 체크
+    if not info:
+        error_reason = "ticker.info가 빈 딕셔너리"
+        logger.warning(f"{symbol}: {error_reason}")
+        return None, error_reason
 
-        if is_rate_limit_error and retry_count < settings.max_retries:
-            delay = min(
-                settings.initial_retry_delay_ms * (2**retry_count),
-                settings.max_retry_delay_ms,
-            )
+    # 가격 정보 추출
+    regular_market_price = (
+        info.get("regularMarketPrice")
+        or info.get("currentPrice")
+        or info.get("previousClose")
+    )
 
-            logger.warning(
-                f"Rate limit 오류 발생. {delay}ms 후 재시도 "
-                f"({retry_count + 1}/{settings.max_retries}): {symbol}"
-            )
+    if not regular_market_price:
+        error_reason = "가격 정보가 응답에 없음 (regularMarketPrice, currentPrice, previousClose 모두 없음)"
+        logger.warning(
+            f"{symbol}: {error_reason} - 응답 키: {list(info.keys())[:10] if info else '없음'}"
+        )
+        return None, error_reason
 
-            await asyncio.sleep(delay / 1000)
-            return await fetch_with_retry(symbol, retry_count + 1)
+    quote_data = {
+        "symbol": info.get("symbol", symbol).upper(),
+        "price": float(regular_market_price),
+        "currency": info.get("currency"),
+        "name": (info.get("shortName") or info.get("longName") or info.get("name")),
+        "changePercent": info.get("regularMarketChangePercent"),
+        "open": info.get("regularMarketOpen"),
+        "high": info.get("regularMarketDayHigh"),
+        "low": info.get("regularMarketDayLow"),
+        "volume": info.get("regularMarketVolume"),
+    }
 
-        if is_rate_limit_error:
-            error_msg = f"Rate limit 오류: {error_message}"
-            send_slack_error_log(symbol, RateLimitException(error_msg))
-            raise RateLimitException(error_msg) from error
-        error_msg = f"Yahoo Finance API 오류: {error_message}"
-        send_slack_error_log(symbol, YahooFinanceException(error_msg))
-        raise YahooFinanceException(error_msg) from error
+    return quote_data, None
 
 
 async def get_quote_data(symbol: str) -> tuple[Optional[dict], Optional[str]]:
     """
     심볼에 대한 주식 정보를 가져와서 정제된 데이터로 반환
 
+    settings.yahoo_quote_mode가 "fast"(기본값)이면 fast_info(차트 응답)로 가격/통화만 가져오고,
+    "info"면 전체 ticker.info를 사용합니다. fast 모드에서 가격을 얻지 못하면
+    settings.yahoo_info_fallback이 켜진 경우에만 info로 한 번 더 조회합니다.
+    재시도는 fetch_with_retry 한 곳에서만 수행합니다.
+
     Returns:
         tuple[Optional[dict], Optional[str]]: (quote_data, error_reason)
         - quote_data: 성공 시 가격 정보 딕셔너리, 실패 시 None
         - error_reason: 실패 시 에러 원인 문자열, 성공 시 None
     """
     try:
-        ticker = await fetch_with_retry(symbol)
+        if settings.yahoo_quote_mode == "info":
+            return _quote_from_info(symbol, await fetch_with_retry(symbol))
 
-        if ticker is None:
-            error_reason = "Ticker 객체를 가져오지 못함"
-            logger.error(f"{symbol}: {error_reason}")
-            return None, error_reason
-
-        # ticker.info 접근 시에도 예외가 발생할 수 있으므로 다시 시도
-        try:
-            info = ticker.info
-        except AttributeError as e:
-            # 'str' object has no attribute 'name' 같은 AttributeError 처리
-            error_msg = str(e)
-            logger.warning(
-                f"{symbol}: ticker.info 접근 시 AttributeError 발생: {error_msg}"
-            )
-            # 한 번 더 재시도
-            ticker = await fetch_with_retry(symbol)
-            if ticker is None:
-                error_reason = "재시도 후에도 Ticker 객체를 가져오지 못함"
-                logger.error(f"{symbol}: {error_reason}")
-                send_slack_error_log(symbol, Exception(error_reason))
-                return None, error_reason
-            try:
-                info = ticker.info
-            except AttributeError as retry_error:
-                error_reason = f"재시도 후에도 ticker.info 접근 실패 (AttributeError): {str(retry_error)}"
-                logger.error(f"{symbol}: {error_reason}")
-                send_slack_error_log(symbol, retry_error)
-                return None, error_reason
-            except Exception as retry_error:
-                error_reason = (
-                    f"재시도 후에도 ticker.info 접근 실패: {str(retry_error)}"
-                )
-                logger.error(f"{symbol}: {error_reason}")
-                send_slack_error_log(symbol, retry_error)
-                return None, error_reason
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.warning(f"{symbol}: ticker.info 접근 실패, 재시도: {str(e)}")
-            # 한 번 더 재시도
-            ticker = await fetch_with_retry(symbol)
-            if ticker is None:
-                error_reason = "재시도 후에도 Ticker 객체를 가져오지 못함"
-                logger.error(f"{symbol}: {error_reason}")
-                send_slack_error_log(symbol, Exception(error_reason))
-                return None, error_reason
-            try:
-                info = ticker.info
-            except Exception as retry_error:
-                error_reason = (
-                    f"재시도 후에도 ticker.info 접근 실패: {str(retry_error)}"
-                )
-                logger.error(f"{symbol}: {error_reason}")
-                send_slack_error_log(symbol, retry_error)
-                return None, error_reason
-
-        # info가 None이거나 빈 딕셔너리인지 체크
-        if info is None:
-            error_reason = "ticker.info가 None"
-            logger.warning(f"{symbol}: {error_reason}")
-            return None, error_reason
-
-        # info가 문자열인 경우 처리 (yfinance가 때때로 문자열을 반환할 수 있음)
-        if isinstance(info, str):
-            error_reason = f"ticker.info가 문자열로 반환됨 (값: {info[:100] if len(info) > 100 else info})"
-            logger.warning(f"{symbol}: {error_reason}")
-            return None, error_reason
-
-        if not isinstance(info, dict):
-            error_reason = (
-                f"ticker.info가 딕셔너리가 아님 (타입: {type(info).__name__})"
-            )
-            logger.warning(f"{symbol}: {error_reason}")
-            return None, error_reason
-
-        # 빈 딕셔너리 체크
-        if not info:
-            error_reason = "ticker.info가 빈 딕셔너리"
-            logger.warning(f"{symbol}: {error_reason}")
-            return None, error_reason
-
-        # 가격 정보 추출
-        regular_market_price = (
-            info.get("regularMarketPrice")
-            or info.get("currentPrice")
-            or info.get("previousClose")
+        quote_data, error_reason = _quote_from_fast_info(
+            symbol, await fetch_with_retry(symbol, load_fast_info)
         )
-
-        if not regular_market_price:
-            error_reason = "가격 정보가 응답에 없음 (regularMarketPrice, currentPrice, previousClose 모두 없음)"
-            logger.warning(
-                f"{symbol}: {error_reason} - 응답 키: {list(info.keys())[:10] if info else '없음'}"
-            )
-            return None, error_reason
-
-        quote_data = {
-            "symbol": info.get("symbol", symbol).upper(),
-            "price": float(regular_market_price),
-            "currency": info.get("currency"),
-            "name": (info.get("shortName") or info.get("longName") or info.get("name")),
-            "changePercent": info.get("regularMarketChangePercent"),
-        }
-
-        return quote_data, None
-    except json.JSONDecodeError as e:
-        error_reason = f"JSON 디코드 오류: {str(e)}"
-        logger.error(f"JSON 디코드 오류 ({symbol}): {str(e)}", exc_info=True)
-        logger.error(f"yfinance 응답 파싱 실패 - 심볼: {symbol}")
-        # Slack 상세 에러 리포트 전송
-        send_slack_error_log(symbol, e)
-        # JSONDecodeError는 이미 fetch_with_retry에서 재시도했으므로 여기서는 None 반환
+        if quote_data is None and settings.yahoo_info_fallback:
+            logger.info(f"{symbol}: fast_info로 가격 조회 실패, ticker.info로 대체 조회")
+            return _quote_from_info(symbol, await fetch_with_retry(symbol))
+        return quote_data, error_reason
+    except DeadlineExceededException as e:
+        error_reason = str(e)
+        logger.warning(f"{symbol}: {error_reason}")
         return None, error_reason
     except RateLimitException as e:
         error_reason = f"Rate limit 오류 (429 Too Many Requests)"
         # Slack 상세 에러 리포트 전송
         send_slack_error_log(symbol, e)
         # 커스텀 예외는 이미 로깅되었으므로 None 반환
-        return None, error_reason
+        return None, upstream_error_reason(e, error_reason)
     except YahooFinanceException as e:
         # 예외 메시지가 이미 "Yahoo Finance API 오류:"로 시작하면 중복 방지
         error_msg = str(e)
@@ -243,16 +249,224 @@ async def get_quote_data(symbol: str) -> tuple[Optional[dict], Optional[str]]:
         # Slack 상세 에러 리포트 전송
         send_slack_error_log(symbol, e)
         # 커스텀 예외는 이미 로깅되었으므로 None 반환
-        return None, error_reason
+        return None, upstream_error_reason(e, error_reason)
     except Exception as e:
         error_message = str(e)
-        # Rate limit 관련 오류는 None 반환 (재시도는 이미 했음)
-        if "429" in error_message or "Too Many Requests" in error_message:
-            error_reason = f"Rate limit 오류: {error_message}"
-            logger.error(f"{symbol}: Rate limit 오류로 인한 실패")
-            send_slack_error_log(symbol, RateLimitException(error_reason))
-            return None, error_reason
         logger.error(f"{symbol} 조회 실패: {error_message}", exc_info=True)
         error_reason = f"{symbol} 조회 실패: {error_message}"
         send_slack_error_log(symbol, e)
         raise YahooFinanceException(error_reason) from e
+
+
+def download_quote_history(
+    symbols: List[str], start: Optional[str] = None, end: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    동기 함수: yfinance 멀티 티커 download 호출.
+    기본은 최근 5일 일봉을 받아 종가와 전일 대비 변동률을 계산하는 데 사용하고,
+    start/end(YYYY-MM-DD, end는 미포함)를 주면 해당 기간의 일봉을 한 번에 받습니다.
+    download는 재진입이 안전하지 않으므로 download_with_retry에서 _DOWNLOAD_LOCK으로 직렬화합니다.
+    """
+    period_kwargs = {"start": start, "end": end} if start else {"period": "5d"}
+    rate_limited_before = yahoo_session.rate_limited_counts(symbols)
+    df = yf.download(
+        tickers=symbols,
+        **period_kwargs,
+        interval="1d",
+        group_by="ticker",
+        auto_adjust=False,
+        threads=settings.quote_batch_threads,
+        progress=False,
+        session=yahoo_session.session,
+    )
+    rate_limited_after = yahoo_session.rate_limited_counts(symbols)
+
+    # download는 심볼별 오류를 예외로 올리지 않고 해당 컬럼을 비워서 돌려주므로,
+    # 이 download의 심볼 요청이 429를 받았고 그 심볼의 종가가 비었으면 예외로 올려 rate limiter가 속도를 줄이도록 함
+    rate_limited = [s for s in symbols if rate_limited_after[s] > rate_limited_before[s]]
+    missing = [s for s in rate_limited if _select_symbol_history(s, df) is None]
+    if missing:
+        raise RateLimitException(
+            f"배치 조회 중 {len(rate_limited)}개 심볼 429 응답, {len(missing)}개 심볼 가격 없음"
+        )
+    return df
+
+
+def _select_symbol_history(symbol: str, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """멀티 티커 download 결과에서 단일 심볼의 일봉만 골라냄 (없거나 종가가 모두 비었으면 None)"""
+    if df is None or df.empty:
+        return None
+
+    if isinstance(df.columns, pd.MultiIndex):
+        if symbol not in df.columns.get_level_values(0):
+            return None
+        history = df[symbol]
+    else:
+        history = df
+
+    # 조회에 실패한 심볼도 멀티 티커 결과에는 빈(NaN) 컬럼으로 남음
+    if "Close" not in history.columns or history["Close"].isna().all():
+        return None
+    return history
+
+
+def _extract_quote_from_history(symbol: str, df: pd.DataFrame) -> Optional[dict]:
+    """
+    download 결과에서 단일 심볼의 최신 종가 정보를 추출합니다.
+
+    Returns:
+        Optional[dict]: quote_data (가격 데이터가 없으면 None)
+    """
+    history = _select_symbol_history(symbol, df)
+    if history is None:
+        return None
+
+    closes = history["Close"].dropna()
+    if closes.empty:
+        return None
+
+    price = float(closes.iloc[-1])
+    change_percent = None
+    if len(closes) >= 2:
+        previous_close = float(closes.iloc[-2])
+        if previous_close:
+            change_percent = (price - previous_close) / previous_close * 100
+
+    return {
+        "symbol": symbol.upper(),
+        "price": price,
+        "currency": None,
+        "name": None,
+        "changePercent": change_percent,
+        **ohlcv_from_bar(history.loc[closes.index[-1]]),
+    }
+
+
+async def download_with_retry(
+    symbols: List[str], start: Optional[str] = None, end: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    멀티 티커 download를 rate limiting/공통 재시도 정책과 함께 실행
+    (시도마다 limiter 슬롯과 블로킹 스레드를 잡기 전에 _DOWNLOAD_LOCK을 먼저 획득)
+    """
+
+    async def fetch_history():
+        return await blocking_executor.run(download_quote_history, symbols, start, end)
+
+    async def download_once():
+        async with _DOWNLOAD_LOCK:
+            return await yahoo_limiter.add(fetch_history)
+
+    try:
+        return await retry_async(
+            download_once,
+            f"배치 조회 ({len(symbols)}개 심볼{f', {start}~{end}' if start else ''})",
+            classify=classify_yahoo_error,
+        )
+    except DeadlineExceededException:
+        raise
+    except Exception as error:
+        if classify_error(error) == RATE_LIMIT:
+            raise RateLimitException(f"Rate limit 오류: {str(error)}") from error
+        raise YahooFinanceException(f"Yahoo Finance API 오류: {str(error)}") from error
+
+
+async def get_batch_quote_data(
+    symbols: List[str],
+) -> Dict[str, tuple[Optional[dict], Optional[str]]]:
+    """
+    여러 심볼의 가격 정보를 청크 단위 멀티 티커 요청으로 가져옵니다.
+
+    청크 크기는 settings.quote_batch_size로 조절합니다.
+    청크 요청 자체가 실패하면 해당 청크의 심볼만 실패로 기록하고,
+    응답에 가격이 없는 심볼은 결과에서 빠지므로 호출자가 get_quote_data로 개별 조회합니다.
+    download 결과에는 통화/종목명이 없으므로 None으로 채워집니다.
+
+    Returns:
+        Dict[str, tuple[Optional[dict], Optional[str]]]: 심볼별 (quote_data, error_reason)
+    """
+    results: Dict[str, tuple[Optional[dict], Optional[str]]] = {}
+    if not symbols:
+        return results
+
+    normalized_symbols = list(dict.fromkeys(s.strip().upper() for s in symbols))
+    chunk_size = max(1, settings.quote_batch_size)
+    chunks = [
+        normalized_symbols[i : i + chunk_size]
+        for i in range(0, len(normalized_symbols), chunk_size)
+    ]
+
+    # download는 프로세스 전체에서 직렬화되므로 청크도 순서대로 요청
+    for chunk_no, chunk in enumerate(chunks, start=1):
+        try:
+            df = await download_with_retry(chunk)
+        except (RateLimitException, YahooFinanceException, DeadlineExceededException) as e:
+            error_reason = upstream_error_reason(e)
+            logger.error(f"배치 조회 실패 ({len(chunk)}개 심볼): {error_reason}")
+            send_slack_error_log(None, e)
+            for symbol in chunk:
+                results[symbol] = (None, error_reason)
+            continue
+
+        found = 0
+        for symbol in chunk:
+            quote_data = _extract_quote_from_history(symbol, df)
+            if quote_data:
+                results[symbol] = (quote_data, None)
+                found += 1
+
+        logger.info(
+            f"배치 조회 완료: {found}/{len(chunk)}개 심볼 가격 수신 "
+            f"(청크 {chunk_no}/{len(chunks)})"
+        )
+
+    return results
+
+
+async def get_batch_price_history(
+    symbols: List[str], start: str, end: str
+) -> Dict[str, tuple[Optional[pd.DataFrame], Optional[str]]]:
+    """
+    여러 심볼의 기간 일봉을 청크 단위 멀티 티커 download로 가져옵니다.
+
+    청크 크기는 get_batch_quote_data와 같이 settings.quote_batch_size를 따르고,
+    download가 직렬화되므로 청크는 순서대로 요청합니다. 응답에 일봉이 없는 심볼은 결과에서 빠집니다.
+
+    Args:
+        symbols: 심볼 목록
+        start: 시작일 (YYYY-MM-DD, 포함)
+        end: 종료일 (YYYY-MM-DD, 포함)
+
+    Returns:
+        Dict[str, tuple[Optional[pd.DataFrame], Optional[str]]]: 심볼별 (일봉, error_reason)
+    """
+    results: Dict[str, tuple[Optional[pd.DataFrame], Optional[str]]] = {}
+    if not symbols:
+        return results
+
+    # yfinance download의 end는 미포함이므로 하루 뒤로 넘김
+    end_exclusive = (pd.Timestamp(end) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    normalized_symbols = list(dict.fromkeys(s.strip().upper() for s in symbols))
+    chunk_size = max(1, settings.quote_batch_size)
+    chunks = [
+        normalized_symbols[i : i + chunk_size]
+        for i in range(0, len(normalized_symbols), chunk_size)
+    ]
+
+    for chunk in chunks:
+        try:
+            df = await download_with_retry(chunk, start, end_exclusive)
+        except (RateLimitException, YahooFinanceException, DeadlineExceededException) as e:
+            error_reason = upstream_error_reason(e)
+            logger.error(f"기간 일봉 조회 실패 ({len(chunk)}개 심볼): {error_reason}")
+            send_slack_error_log(None, e)
+            for symbol in chunk:
+                results[symbol] = (None, error_reason)
+            continue
+
+        for symbol in chunk:
+            history = _select_symbol_history(symbol, df)
+            if history is not None:
+                results[symbol] = (history, None)
+
+    return results
@@ -0,0 +1,164 @@
+"""yfinance 호출 공용 HTTP 세션 (쿠키/crumb와 커넥션을 프로세스 전체에서 재사용)"""
+
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import unquote
+
+from curl_cffi import CurlInfo
+from curl_cffi import requests as curl_requests
+from yfinance.data import YfData
+
+from app.config import settings
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 인증(crumb/쿠키) 실패로 보는 HTTP 상태 코드와 yfinance 오류 메시지
+AUTH_FAILURE_STATUS_CODES = {401, 403}
+AUTH_FAILURE_MESSAGES = ("Invalid Crumb", "Invalid Cookie", "Unauthorized")
+
+# 요청 한도 초과로 보는 HTTP 상태 코드
+RATE_LIMIT_STATUS_CODE = 429
+
+# 일봉 조회(chart) URL에서 티커를 꺼내는 패턴 (429를 요청한 티커별로 집계)
+_CHART_URL_PATTERN = re.compile(r"/v8/finance/chart/([^/?#]+)")
+
+
+def _chart_symbol(url) -> Optional[str]:
+    """chart 요청 URL의 티커 (chart 요청이 아니면 None)"""
+    match = _CHART_URL_PATTERN.search(str(url or ""))
+    return unquote(match.group(1)).upper() if match else None
+
+
+class _CountingSession(curl_requests.Session):
+    """요청/응답을 YahooSession 통계에 기록하는 세션"""
+
+    def request(self, method, url, *args, **kwargs):
+        yahoo_session.record_request()
+        response = super().request(method, url, *args, **kwargs)
+        yahoo_session.record_response(response, url)
+        return response
+
+
+class YahooSession:
+    """
+    yf.Ticker / yf.download에 session=으로 넘기는 프로세스 공용 세션
+
+    yfinance는 세션마다 쿠키/crumb 핸드셰이크를 하므로, 하나의 세션을 재사용하면
+    대량 배치에서도 핸드셰이크와 TCP/TLS 연결 비용을 한 번만 지불합니다.
+    인증 실패(401/403, Invalid Crumb) 시 refresh_crumb로 crumb만 다시 발급받습니다.
+    """
+
+    def __init__(self):
+        self._session: Optional[_CountingSession] = None
+        self._lock = threading.Lock()
+        self._last_refresh_at = 0.0
+        self.sessions_created = 0
+        self.requests = 0
+        self.connections_opened = 0
+        self.reused_requests = 0
+        self.auth_failures = 0
+        self.rate_limited_responses = 0
+        self.rate_limited_by_symbol: Dict[str, int] = {}
+        self.crumb_refreshes = 0
+
+    @property
+    def session(self) -> _CountingSession:
+        """공용 세션 반환 (최초 호출 시 생성)"""
+        with self._lock:
+            if self._session is None:
+                self._session = self._create_session()
+                self.sessions_created += 1
+            return self._session
+
+    def _create_session(self) -> _CountingSession:
+        # yfinance는 브라우저 TLS 지문을 흉내 내는 curl_cffi 세션만 받음.
+        # 요청마다 새로 연 커넥션 수(NUM_CONNECTS)를 받아 커넥션 재사용률을 집계
+        return _CountingSession(impersonate="chrome", curl_infos=[CurlInfo.NUM_CONNECTS])
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_response(self, response, url=None) -> None:
+        new_connections = getattr(response, "infos", {}).get(CurlInfo.NUM_CONNECTS)
+        if new_connections is not None:
+            with self._lock:
+                self.connections_opened += new_connections
+                if new_connections == 0:
+                    self.reused_requests += 1
+
+        status_code = getattr(response, "status_code", None)
+        if status_code in AUTH_FAILURE_STATUS_CODES:
+            with self._lock:
+                self.auth_failures += 1
+        elif status_code == RATE_LIMIT_STATUS_CODE:
+            symbol = _chart_symbol(url)
+            with self._lock:
+                self.rate_limited_responses += 1
+                if symbol:
+                    self.rate_limited_by_symbol[symbol] = (
+                        self.rate_limited_by_symbol.get(symbol, 0) + 1
+                    )
+
+    def rate_limited_counts(self, symbols: List[str]) -> Dict[str, int]:
+        """
+        심볼별로 지금까지 받은 chart 요청 429 응답 수
+        (호출 전후 차이로 특정 download의 429 여부를 판단하며,
+        같은 시각 다른 심볼의 fast_info/info 조회에서 받은 429는 섞이지 않음)
+        """
+        with self._lock:
+            return {s: self.rate_limited_by_symbol.get(s.upper(), 0) for s in symbols}
+
+    def is_auth_error(self, error: BaseException) -> bool:
+        """crumb/쿠키 인증 실패로 발생한 예외인지 확인"""
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+        if status_code in AUTH_FAILURE_STATUS_CODES:
+            return True
+        # yfinance는 crumb 오류를 응답 본문의 메시지로만 알려줌
+        return any(message in str(error) for message in AUTH_FAILURE_MESSAGES)
+
+    def refresh_crumb(self) -> None:
+        """
+        yfinance에 캐시된 쿠키/crumb를 비워 다음 요청에서 다시 발급받게 함
+        (동시에 여러 스레드가 실패해도 짧은 시간 안에는 한 번만 갱신)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_refresh_at < settings.yahoo_crumb_refresh_interval_seconds:
+                return
+            self._last_refresh_at = now
+            self.crumb_refreshes += 1
+
+        data = YfData(session=self.session)
+        cookie_lock = getattr(data, "_cookie_lock", None)
+        if cookie_lock is not None:
+            with cookie_lock:
+                data._crumb = None
+                data._cookie = None
+        else:
+            data._crumb = None
+            data._cookie = None
+        logger.warning("Yahoo Finance 인증 실패, 쿠키/crumb 재발급 예정")
+
+    def stats(self) -> dict:
+        """
+        세션 재사용 현황 반환
+        (reusedRequests: 새 커넥션 없이 기존 커넥션으로 보낸 요청 수)
+        """
+        with self._lock:
+            return {
+                "sessionsCreated": self.sessions_created,
+                "requests": self.requests,
+                "connectionsOpened": self.connections_opened,
+                "reusedRequests": self.reused_requests,
+                "authFailures": self.auth_failures,
+                "rateLimitedResponses": self.rate_limited_responses,
+                "crumbRefreshes": self.crumb_refreshes,
+            }
+
+
+# 전역 YahooSession 인스턴스
+yahoo_session = YahooSession()
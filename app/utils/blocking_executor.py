@@ -0,0 +1,85 @@
+"""블로킹 외부 호출 전용 스레드 풀"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+from app.config import settings
+
+T = TypeVar("T")
+
+
+class BlockingExecutor:
+    """
+    yfinance, FinanceDataReader 같은 동기(블로킹) 호출을 실행하는 전용 스레드 풀
+
+    asyncio 기본 executor(asyncio.to_thread)와 분리하여, 긴 배치 작업 중에도
+    이벤트 루프와 다른 to_thread 호출이 스레드를 빼앗기지 않도록 합니다.
+    """
+
+    def __init__(self, max_workers: int, name: str):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """블로킹 함수를 스레드 풀에서 실행하고 결과를 기다림"""
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            self.queued += 1
+
+        def execute() -> T:
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+            try:
+                result = fn(*args)
+            except Exception:
+                with self._lock:
+                    self.failed += 1
+                raise
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+            return result
+
+        future = self._executor.submit(execute)
+        try:
+            return await asyncio.wrap_future(future, loop=loop)
+        except asyncio.CancelledError:
+            # 실행 전에 취소된 작업은 execute가 호출되지 않으므로 대기열 카운트를 직접 정리
+            if future.cancelled():
+                with self._lock:
+                    self.queued -= 1
+            raise
+
+    def stats(self) -> dict:
+        """현재 스레드 풀 상태 반환"""
+        with self._lock:
+            return {
+                "name": self.name,
+                "maxWorkers": self.max_workers,
+                "queueDepth": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+    def shutdown(self) -> None:
+        """스레드 풀 종료 (대기 중인 작업은 취소)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 전역 BlockingExecutor 인스턴스 (yfinance / FinanceDataReader 호출용)
+blocking_executor = BlockingExecutor(
+    max_workers=settings.blocking_executor_workers, name="blocking-io"
+)
@@ -0,0 +1,163 @@
+"""시장별 거래일 계산 (주말/휴장일 반영)"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+from app.config import settings
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+# 시장별 현지 시간대와 정규장 시작/종료 시각 (목록에 없는 국가는 KR 기준)
+MARKET_SESSIONS: Dict[str, Tuple[ZoneInfo, time, time]] = {
+    "KR": (ZoneInfo("Asia/Seoul"), time(9, 0), time(15, 30)),
+    "US": (ZoneInfo("America/New_York"), time(9, 30), time(16, 0)),
+}
+
+# 시장별 휴장일 (주말 제외, YYYY-MM-DD)
+# 매년 거래소 공지에 맞춰 갱신하며, 임시 휴장일은 MARKET_HOLIDAYS_KR/US 환경변수로 추가합니다.
+# 표에 없는 연도의 날짜를 계산하면 (국가, 연도)마다 한 번 경고 로그를 남깁니다.
+MARKET_HOLIDAYS: Dict[str, Set[str]] = {
+    "KR": {
+        # 2025
+        "2025-01-01", "2025-01-27", "2025-01-28", "2025-01-29", "2025-01-30",
+        "2025-03-03", "2025-05-01", "2025-05-05", "2025-05-06", "2025-06-03",
+        "2025-06-06", "2025-08-15", "2025-10-03", "2025-10-06", "2025-10-07",
+        "2025-10-08", "2025-10-09", "2025-12-25", "2025-12-31",
+        # 2026
+        "2026-01-01", "2026-02-16", "2026-02-17", "2026-02-18", "2026-03-02",
+        "2026-05-01", "2026-05-05", "2026-05-25", "2026-06-03", "2026-08-17",
+        "2026-09-24", "2026-09-25", "2026-10-05", "2026-10-09", "2026-12-25",
+        "2026-12-31",
+    },
+    "US": {
+        # 2025
+        "2025-01-01", "2025-01-09", "2025-01-20", "2025-02-17", "2025-04-18",
+        "2025-05-26", "2025-06-19", "2025-07-04", "2025-09-01", "2025-11-27",
+        "2025-12-25",
+        # 2026
+        "2026-01-01", "2026-01-19", "2026-02-16", "2026-04-03", "2026-05-25",
+        "2026-06-19", "2026-07-03", "2026-09-07", "2026-11-26", "2026-12-25",
+    },
+}
+
+
+# 휴장일 표가 없는 연도라고 이미 경고한 (국가, 연도)
+_uncovered_years_warned: Set[Tuple[str, int]] = set()
+
+
+def _warn_if_holidays_uncovered(country: Optional[str], year: int, holidays: Set[str]) -> None:
+    """
+    휴장일 표에 해당 연도가 없으면 (국가, 연도)마다 한 번 경고
+    (주말만 휴장으로 보므로 공휴일이 거래일로 계산됨)
+    """
+    if country not in MARKET_HOLIDAYS or (country, year) in _uncovered_years_warned:
+        return
+    if any(day.startswith(f"{year}-") for day in holidays):
+        return
+    _uncovered_years_warned.add((country, year))
+    logger.warning(
+        f"{country} 시장 {year}년 휴장일이 등록되어 있지 않아 주말만 휴장으로 계산합니다. "
+        f"MARKET_HOLIDAYS 또는 MARKET_HOLIDAYS_{country} 환경변수에 휴장일을 추가하세요."
+    )
+
+
+def get_market_holidays(country: Optional[str]) -> Set[str]:
+    """기본 휴장일 + 환경변수로 추가된 휴장일 반환"""
+    holidays = set(MARKET_HOLIDAYS.get(country or "", set()))
+
+    extra = {
+        "KR": settings.market_holidays_kr,
+        "US": settings.market_holidays_us,
+    }.get(country or "")
+    if extra:
+        holidays.update(d.strip() for d in extra.split(",") if d.strip())
+
+    return holidays
+
+
+def is_trading_day(country: Optional[str], day: date) -> bool:
+    """해당 날짜가 거래일인지 확인 (주말/휴장일 제외)"""
+    if day.weekday() >= 5:
+        return False
+    holidays = get_market_holidays(country)
+    _warn_if_holidays_uncovered(country, day.year, holidays)
+    return day.strftime("%Y-%m-%d") not in holidays
+
+
+def get_latest_trading_day(country: Optional[str], day: date) -> date:
+    """day 이하의 가장 최근 거래일 반환"""
+    holidays = get_market_holidays(country)
+    _warn_if_holidays_uncovered(country, day.year, holidays)
+    while day.weekday() >= 5 or day.strftime("%Y-%m-%d") in holidays:
+        day -= timedelta(days=1)
+    return day
+
+
+def get_trading_date(country: Optional[str], now: Optional[datetime] = None) -> str:
+    """
+    국가별 stock_prices 저장 기준 거래일을 YYYY-MM-DD 형식으로 반환
+
+    - 한국 시간(KST) 기준 날짜에서 출발합니다.
+    - 미국 주식은 시차 때문에 KST 어제 날짜를 기준으로 합니다.
+    - 기준 날짜가 주말/휴장일이면 직전 거래일을 사용합니다.
+      (휴장일에는 이미 저장된 직전 거래일 데이터와 비교되어 API 호출이 생략됩니다.)
+
+    Args:
+        country: 국가 코드 (KR, US 등)
+        now: 기준 시각 (None이면 현재 시각)
+
+    Returns:
+        str: 거래일 (YYYY-MM-DD)
+    """
+    now = now or datetime.now(timezone.utc)
+    base_day = now.astimezone(KST).date()
+    if country == "US":
+        base_day -= timedelta(days=1)
+    return get_latest_trading_day(country, base_day).strftime("%Y-%m-%d")
+
+
+def _get_market_session(country: Optional[str]) -> Tuple[ZoneInfo, time, time]:
+    return MARKET_SESSIONS.get(country or "", MARKET_SESSIONS["KR"])
+
+
+def get_session_date(country: Optional[str], now: Optional[datetime] = None) -> str:
+    """
+    시장 현지 날짜 기준 세션 날짜를 YYYY-MM-DD 형식으로 반환 (장중 스냅샷 저장용)
+
+    미국 정규장 중(KST 밤~새벽)에도 뉴욕 날짜를 사용하므로, 장 마감 후 get_trading_date로
+    계산되는 일별 행 날짜와 같습니다.
+    """
+    now = now or datetime.now(timezone.utc)
+    tz, _, _ = _get_market_session(country)
+    return now.astimezone(tz).strftime("%Y-%m-%d")
+
+
+def is_market_open(country: Optional[str], now: Optional[datetime] = None) -> bool:
+    """현재 정규장이 열려 있는지 확인 (주말/휴장일 제외)"""
+    now = now or datetime.now(timezone.utc)
+    tz, open_time, close_time = _get_market_session(country)
+    local_now = now.astimezone(tz)
+    if not is_trading_day(country, local_now.date()):
+        return False
+    return open_time <= local_now.time() < close_time
+
+
+def get_market_close(country: Optional[str], day: date) -> datetime:
+    """해당 날짜의 정규장 종료 시각 (UTC)"""
+    tz, _, close_time = _get_market_session(country)
+    return datetime.combine(day, close_time, tzinfo=tz).astimezone(timezone.utc)
+
+
+def get_latest_closed_session_date(
+    country: Optional[str], now: Optional[datetime] = None
+) -> str:
+    """정규장이 이미 끝난 가장 최근 거래일 (YYYY-MM-DD, 장중 스냅샷 롤업 기본 대상)"""
+    now = now or datetime.now(timezone.utc)
+    tz, _, _ = _get_market_session(country)
+    day = get_latest_trading_day(country, now.astimezone(tz).date())
+    if now < get_market_close(country, day):
+        day = get_latest_trading_day(country, day - timedelta(days=1))
+    return day.strftime("%Y-%m-%d")
@@ -1,68 +1,278 @@
 import asyncio
 import time
-from typing import Callable, TypeVar, Awaitable
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+import yfinance as yf
 from app.config import settings
+from app.exceptions import RateLimitException
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 T = TypeVar("T")
 
+# yfinance 0.2.54 미만에는 YFRateLimitError가 없으므로 getattr로 조회
+YF_RATE_LIMIT_ERROR = getattr(getattr(yf, "exceptions", None), "YFRateLimitError", None)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    예외가 업스트림의 429(Too Many Requests) 응답에서 발생했는지 타입/HTTP 상태 코드로 판별
+    (원인 예외(__cause__)까지 확인)
+    """
+    current: Optional[BaseException] = error
+    while current is not None:
+        if isinstance(current, RateLimitException):
+            return True
+        if YF_RATE_LIMIT_ERROR is not None and isinstance(current, YF_RATE_LIMIT_ERROR):
+            return True
+        response = getattr(current, "response", None)
+        if getattr(response, "status_code", None) == 429:
+            return True
+        current = current.__cause__
+    return False
+
+
+class _QueuedRequest:
+    """대기열 항목 (실행할 함수, 결과를 전달할 future, 등록 시각)"""
+
+    __slots__ = ("execute", "future", "enqueued_at")
+
+    def __init__(self, execute: Callable[[], Awaitable[Any]], future: asyncio.Future):
+        self.execute = execute
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
 
 class RequestQueue:
-    """Rate limiting을 적용한 요청 큐"""
+    """
+    토큰 버킷 rate limiting을 적용한 요청 큐 (외부 업스트림별로 하나씩 사용)
+
+    - deque 기반 FIFO 대기열 (O(1) 추가/꺼내기)
+    - max_concurrent개의 고정 디스패치 워커가 대기열을 소비 (재귀 없음)
+    - 초당 rate_per_sec개 토큰이 최대 burst개까지 쌓이며, 요청마다 lock 안에서 토큰을 예약하여
+      동시 호출에서도 허용 속도를 정확히 지킴
+    - 호출자가 취소하면 대기 중인 요청은 건너뛰고, 실행 중인 요청은 함께 취소
+    - AIMD 속도 조절: 429 응답이 관측되면 모든 호출자에 대해 속도/동시 실행 수를 배율로 줄이고,
+      성공할 때마다 설정된 최대치까지 조금씩 다시 올림
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_sec: float,
+        burst: int = 1,
+        max_concurrent: int = 1,
+    ):
+        self.name = name
+        self.max_rate_per_sec = max(0.001, rate_per_sec)
+        self.min_rate_per_sec = self.max_rate_per_sec * settings.rate_limit_min_rate_fraction
+        self.burst = max(1, burst)
+        self.max_concurrent = max(1, max_concurrent)
+
+        # AIMD로 조절되는 현재 속도/동시 실행 한도
+        self.rate_per_sec = self.max_rate_per_sec
+        self.concurrency_limit = self.max_concurrent
+        self.rate_limited = 0
+        self._success_streak = 0
+        self._last_decrease_at = 0.0
+
+        self.queue: Deque[_QueuedRequest] = deque()
+        self.in_flight = 0
+        self._active = 0  # 대기열에서 꺼내 시작 슬롯 대기/실행 중인 요청 수
+        self.completed = 0
+        self.cancelled = 0
+        self._total_wait_ms = 0.0
+        # 토큰 버킷 상태 (음수면 이미 예약된 미래 시작 슬롯이 있다는 뜻)
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._condition: Optional[asyncio.Condition] = None
+        self._slot_lock: Optional[asyncio.Lock] = None
+        self._workers: List[asyncio.Task] = []
 
-    def __init__(self):
-        self.queue: list[dict] = []
-        self.running = 0
-        self.last_request_time = 0
-        self.lock = asyncio.Lock()
+    def _ensure_workers(self) -> None:
+        """현재 이벤트 루프에 디스패치 워커가 없으면 생성"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+
+        self._loop = loop
+        self._condition = asyncio.Condition()
+        self._slot_lock = asyncio.Lock()
+        self._workers = [
+            loop.create_task(self._worker()) for _ in range(self.max_concurrent)
+        ]
 
     async def add(self, fn: Callable[[], Awaitable[T]]) -> T:
-        """요청을 큐에 추가하고 실행"""
-        future = asyncio.Future()
+        """요청을 큐에 추가하고 실행 결과를 기다림"""
+        self._ensure_workers()
+        future: asyncio.Future = self._loop.create_future()
 
-        async with self.lock:
-            self.queue.append({
-                "execute": fn,
-                "future": future,
-            })
+        async with self._condition:
+            self.queue.append(_QueuedRequest(fn, future))
+            self._condition.notify()
 
-        await self._process()
+        # 호출자가 취소되면 future도 취소되어 워커가 건너뛰거나 실행 중인 작업을 취소함
         return await future
 
-    async def _process(self):
-        """큐에서 요청을 처리"""
-        async with self.lock:
-            if (
-                self.running >= settings.max_concurrent_requests
-                or len(self.queue) == 0
-            ):
-                return
+    async def _reserve_slot(self) -> None:
+        """토큰 하나를 예약하고, 토큰이 채워지는 시각까지 대기"""
+        async with self._slot_lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst),
+                self._tokens + (now - self._refilled_at) * self.rate_per_sec,
+            )
+            self._refilled_at = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate_per_sec if self._tokens < 0 else 0.0
 
-            self.running += 1
-            task = self.queue.pop(0)
+        if delay > 0:
+            await asyncio.sleep(delay)
 
-        try:
-            # Rate limiting: 최소 요청 간격 확인
-            now = time.time() * 1000  # 밀리초
-            time_since_last = now - self.last_request_time
-            min_delay = settings.min_request_delay_ms
+    def on_rate_limited(self) -> None:
+        """429 관측 시 속도와 동시 실행 한도를 배율로 감소 (짧은 시간 내 연속 429는 한 번만 반영)"""
+        self.rate_limited += 1
+        self._success_streak = 0
+
+        now = time.monotonic()
+        if now - self._last_decrease_at < settings.rate_limit_decrease_cooldown_seconds:
+            return
+        self._last_decrease_at = now
+
+        factor = settings.rate_limit_decrease_factor
+        self.rate_per_sec = max(self.min_rate_per_sec, self.rate_per_sec * factor)
+        self.concurrency_limit = max(1, int(self.concurrency_limit * factor))
+        # 쌓여 있던 토큰도 비워서 감소된 속도가 즉시 적용되도록 함
+        self._tokens = min(self._tokens, 0.0)
+
+        logger.warning(
+            f"Rate limiter '{self.name}': 429 감지, "
+            f"속도 {self.rate_per_sec:.2f}/s, 동시 실행 {self.concurrency_limit}개로 감소"
+        )
+
+    def on_success(self) -> None:
+        """성공 시 속도를 조금씩 증가시키고, 연속 성공이 쌓이면 동시 실행 한도를 1 증가"""
+        if self.rate_per_sec < self.max_rate_per_sec:
+            self.rate_per_sec = min(
+                self.max_rate_per_sec,
+                self.rate_per_sec + settings.rate_limit_increase_per_success,
+            )
+
+        self._success_streak += 1
+        if (
+            self.concurrency_limit < self.max_concurrent
+            and self._success_streak >= settings.rate_limit_concurrency_probe_successes
+        ):
+            self.concurrency_limit += 1
+            self._success_streak = 0
 
-            if time_since_last < min_delay:
-                await asyncio.sleep((min_delay - time_since_last) / 1000)
+    async def _worker(self) -> None:
+        """대기열에서 요청을 하나씩 꺼내 실행하는 디스패치 워커"""
+        while True:
+            async with self._condition:
+                while not self.queue or self._active >= self.concurrency_limit:
+                    await self._condition.wait()
+                request = self.queue.popleft()
+                self._active += 1
 
-            # 요청 실행
-            result = await task["execute"]()
-            self.last_request_time = time.time() * 1000
+            try:
+                if request.future.done():
+                    # 대기 중 호출자가 취소한 요청
+                    self.cancelled += 1
+                    continue
 
-            task["future"].set_result(result)
+                await self._reserve_slot()
+                if request.future.done():
+                    self.cancelled += 1
+                    continue
+
+                self._total_wait_ms += (time.monotonic() - request.enqueued_at) * 1000
+                await self._run(request)
+            finally:
+                async with self._condition:
+                    self._active -= 1
+                    # 동시 실행 한도가 늘었을 수 있으므로 대기 중인 워커를 모두 깨움
+                    self._condition.notify_all()
+
+    async def _run(self, request: _QueuedRequest) -> None:
+        """요청 실행 후 결과/예외를 future에 전달하고 AIMD 상태를 갱신"""
+        self.in_flight += 1
+        task = asyncio.ensure_future(request.execute())
+
+        def cancel_task_if_cancelled(future: asyncio.Future) -> None:
+            if future.cancelled():
+                task.cancel()
+
+        request.future.add_done_callback(cancel_task_if_cancelled)
+        try:
+            result = await task
+            self.on_success()
+            if not request.future.done():
+                request.future.set_result(result)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            if not request.future.cancelled():
+                # 호출자 취소가 아닌 워커 자체 취소 (이벤트 루프 종료 등)
+                request.future.cancel()
+                raise
         except Exception as e:
-            task["future"].set_exception(e)
+            if is_rate_limit_error(e):
+                self.on_rate_limited()
+            if not request.future.done():
+                request.future.set_exception(e)
         finally:
-            async with self.lock:
-                self.running -= 1
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> dict:
+        """현재 큐 상태 반환"""
+        started = self.completed + self.in_flight
+        return {
+            "name": self.name,
+            "ratePerSec": round(self.rate_per_sec, 3),
+            "maxRatePerSec": self.max_rate_per_sec,
+            "burst": self.burst,
+            "queueDepth": len(self.queue),
+            "inFlight": self.in_flight,
+            "concurrencyLimit": self.concurrency_limit,
+            "maxConcurrent": self.max_concurrent,
+            "rateLimited": self.rate_limited,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "avgWaitMs": round(self._total_wait_ms / started, 1) if started else 0.0,
+        }
 
-            # 다음 요청 처리
-            await self._process()
 
+# 업스트림별 전역 RequestQueue 인스턴스 (서로의 속도 제한에 영향을 주지 않음)
+yahoo_limiter = RequestQueue(
+    name="yahoo",
+    rate_per_sec=settings.yahoo_rate_per_sec,
+    burst=settings.yahoo_burst,
+    max_concurrent=settings.yahoo_max_concurrent,
+)
+fdr_listing_limiter = RequestQueue(
+    name="fdr_listing",
+    rate_per_sec=settings.fdr_listing_rate_per_sec,
+    burst=settings.fdr_listing_burst,
+    max_concurrent=settings.fdr_listing_max_concurrent,
+)
+fdr_reader_limiter = RequestQueue(
+    name="fdr_reader",
+    rate_per_sec=settings.fdr_reader_rate_per_sec,
+    burst=settings.fdr_reader_burst,
+    max_concurrent=settings.fdr_reader_max_concurrent,
+)
+data_go_limiter = RequestQueue(
+    name="data_go",
+    rate_per_sec=settings.data_go_rate_per_sec,
+    burst=settings.data_go_burst,
+    max_concurrent=settings.data_go_max_concurrent,
+)
 
-# 전역 RequestQueue 인스턴스
-request_queue = RequestQueue()
+rate_limiters: Dict[str, RequestQueue] = {
+    limiter.name: limiter
+    for limiter in (yahoo_limiter, fdr_listing_limiter, fdr_reader_limiter, data_go_limiter)
+}
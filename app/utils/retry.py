@@ -0,0 +1,234 @@
+"""공통 재시도 엔진 (full jitter 백오프, 시도 횟수 예산, 배치 데드라인)"""
+
+import asyncio
+import json
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
+
+import httpx
+import requests
+
+from app.config import settings
+from app.exceptions import DeadlineExceededException
+from app.utils.logging_config import get_logger
+from app.utils.rate_limiter import is_rate_limit_error
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# 오류 분류
+RATE_LIMIT = "rate_limit"  # 429: 재시도 (rate limiter가 전체 속도도 줄임)
+TRANSIENT = "transient"  # 네트워크/타임아웃/5xx/빈 응답: 재시도
+PERMANENT = "permanent"  # 그 외: 즉시 실패
+
+# 재시도하면 성공할 수 있는 PostgreSQL 오류 코드 (statement timeout, 직렬화 실패, 데드락)
+TRANSIENT_POSTGRES_CODES = {"57014", "40001", "40P01"}
+
+# 배치 데드라인 초과로 시도하지 못한 경우의 실패 원인 접두어
+DEADLINE_EXCEEDED_REASON = "배치 데드라인 초과"
+
+# 네트워크/타임아웃으로 보는 예외 타입
+TRANSPORT_ERRORS = (
+    asyncio.TimeoutError,
+    TimeoutError,
+    ConnectionError,
+    httpx.TransportError,
+    requests.ConnectionError,
+    requests.Timeout,
+)
+
+# 현재 배치의 데드라인 (time.monotonic 기준, None이면 제한 없음)
+_batch_deadline: ContextVar[Optional[float]] = ContextVar("batch_deadline", default=None)
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    예외 타입/HTTP 상태 코드로 재시도 여부를 분류 (메시지 문자열은 보지 않음)
+    감싼 예외는 __cause__를 따라가 원인 예외 기준으로 분류합니다.
+
+    Returns:
+        str: RATE_LIMIT, TRANSIENT, PERMANENT 중 하나
+    """
+    if is_rate_limit_error(error):
+        return RATE_LIMIT
+
+    # yfinance는 빈 응답/일시적 응답 이상을 JSONDecodeError, AttributeError, KeyError로 드러냄
+    if isinstance(error, (json.JSONDecodeError, AttributeError, KeyError)):
+        return TRANSIENT
+
+    if isinstance(error, TRANSPORT_ERRORS):
+        return TRANSIENT
+
+    status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if status_code is not None:
+        return TRANSIENT if status_code >= 500 or status_code == 408 else PERMANENT
+
+    # postgrest APIError는 PostgreSQL 오류 코드를 code 속성으로 제공
+    if str(getattr(error, "code", "")) in TRANSIENT_POSTGRES_CODES:
+        return TRANSIENT
+
+    # 메시지만 바꿔 다시 던진 예외(raise ... from e)는 원인 예외로 분류
+    if error.__cause__ is not None:
+        return classify_error(error.__cause__)
+
+    return PERMANENT
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    업스트림 자체 장애(429, 네트워크/타임아웃, 5xx)로 인한 예외인지 확인 (원인 예외까지 확인)
+    심볼별 데이터 없음/응답 파싱 오류처럼 업스트림은 정상 응답한 경우는 제외합니다.
+    """
+    if is_rate_limit_error(error):
+        return True
+    current: Optional[BaseException] = error
+    while current is not None:
+        if isinstance(current, TRANSPORT_ERRORS):
+            return True
+        status_code = getattr(getattr(current, "response", None), "status_code", None)
+        if status_code is not None and status_code >= 500:
+            return True
+        current = current.__cause__
+    return False
+
+
+class UpstreamErrorReason(str):
+    """
+    업스트림 장애로 실패한 심볼의 실패 원인 문자열
+    (일반 문자열과 같이 쓰이며, 시세 제공자 장애 판단에서만 구분)
+    """
+
+
+class RateLimitedReason(UpstreamErrorReason):
+    """
+    429(rate limit)로 실패한 심볼의 실패 원인 문자열
+    (메시지 내용이 아닌 타입으로 구분하므로 429.HK 같은 심볼이 섞여도 오판하지 않음)
+    """
+
+
+def upstream_error_reason(error: BaseException, reason: Optional[str] = None) -> str:
+    """
+    예외를 심볼별 실패 원인 문자열로 변환
+    (429면 RateLimitedReason, 그 밖의 업스트림 장애면 UpstreamErrorReason)
+
+    Args:
+        error: 실패 원인 예외
+        reason: 실패 원인 문자열 (None이면 str(error))
+    """
+    reason = str(error) if reason is None else reason
+    if is_rate_limit_error(error):
+        return RateLimitedReason(reason)
+    return UpstreamErrorReason(reason) if is_upstream_failure(error) else reason
+
+
+class RetryPolicy:
+    """
+    재시도 정책
+
+    - max_attempts: 첫 시도를 포함한 총 시도 횟수 예산
+    - 대기 시간은 full jitter: uniform(0, min(max_delay, base_delay * 2^(attempt-1)))
+    """
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay_ms: Optional[int] = None,
+        max_delay_ms: Optional[int] = None,
+    ):
+        self.max_attempts = max(
+            1, max_attempts if max_attempts is not None else settings.max_retries + 1
+        )
+        self.base_delay_ms = (
+            base_delay_ms if base_delay_ms is not None else settings.initial_retry_delay_ms
+        )
+        self.max_delay_ms = (
+            max_delay_ms if max_delay_ms is not None else settings.max_retry_delay_ms
+        )
+
+    def compute_delay(self, attempt: int) -> float:
+        """attempt번째 시도 실패 후 대기할 시간(초)"""
+        cap = min(self.max_delay_ms, self.base_delay_ms * (2 ** (attempt - 1)))
+        return random.uniform(0, cap) / 1000
+
+
+@contextmanager
+def batch_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    블록 안에서 시작된 모든 재시도(하위 task 포함)에 공통 데드라인을 적용
+
+    이미 더 이른 데드라인이 설정되어 있으면 그 값을 유지합니다.
+    """
+    current = _batch_deadline.get()
+    deadline = time.monotonic() + seconds if seconds else None
+    if current is not None and (deadline is None or current < deadline):
+        deadline = current
+
+    token = _batch_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _batch_deadline.reset(token)
+
+
+def deadline_remaining() -> Optional[float]:
+    """현재 배치 데드라인까지 남은 시간(초), 데드라인이 없으면 None"""
+    deadline = _batch_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+async def retry_async(
+    fn: Callable[[], Awaitable[T]],
+    description: str,
+    policy: Optional[RetryPolicy] = None,
+    classify: Callable[[BaseException], str] = classify_error,
+) -> T:
+    """
+    fn을 재시도 정책에 따라 실행
+
+    PERMANENT 오류, 시도 횟수 예산 소진, 다음 대기가 배치 데드라인을 넘는 경우에는
+    마지막 예외를 그대로 올립니다. 데드라인이 이미 지났으면 시도하지 않고
+    DeadlineExceededException을 올립니다.
+
+    Args:
+        fn: 매 시도마다 호출할 코루틴 함수
+        description: 로그용 작업 설명 (예: "AAPL 시세 조회")
+        policy: 재시도 정책 (None이면 settings 기본값)
+        classify: 오류 분류 함수
+    """
+    policy = policy or DEFAULT_RETRY_POLICY
+    attempt = 0
+
+    while True:
+        remaining = deadline_remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededException(f"{DEADLINE_EXCEEDED_REASON}: {description}")
+
+        attempt += 1
+        try:
+            return await fn()
+        except Exception as error:
+            kind = classify(error)
+            if kind == PERMANENT or attempt >= policy.max_attempts:
+                raise
+
+            delay = policy.compute_delay(attempt)
+            remaining = deadline_remaining()
+            if remaining is not None and delay >= remaining:
+                logger.warning(f"{description}: 배치 데드라인이 임박하여 재시도 중단")
+                raise
+
+            logger.warning(
+                f"{description} 실패 ({kind}), {delay * 1000:.0f}ms 후 재시도 "
+                f"({attempt}/{policy.max_attempts - 1}): {type(error).__name__}: {str(error)}"
+            )
+            await asyncio.sleep(delay)
+
+
+# 기본 재시도 정책 (settings.max_retries / initial_retry_delay_ms / max_retry_delay_ms)
+DEFAULT_RETRY_POLICY = RetryPolicy()
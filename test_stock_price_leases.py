@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""stock_price_leases 리스 테스트 스크립트
+
+같은 체크포인트를 재개하는 두 실행이 동시에 돌아도 같은 (심볼, 기준 거래일)을
+한 번만 조회하는지 확인합니다. Supabase/시세 제공자 호출은 메모리 저장소로 대체합니다.
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 설정 로딩에 필요한 값 (실제 Supabase에는 접속하지 않음)
+for key, value in {
+    "SUPABASE_URL": "https://example.supabase.co",
+    "SUPABASE_ANON_KEY": "test",
+    "CRON_SECRET": "test",
+    "DATA_GO_API_KEY": "test",
+}.items():
+    os.environ.setdefault(key, value)
+
+import app.services.stock_service as stock_service
+import app.services.symbol_quarantine as symbol_quarantine
+
+SYMBOLS = [f"T{i:02d}" for i in range(20)]
+
+
+class InMemoryStore:
+    """update_runs / stock_price_leases / stock_prices를 흉내 내는 메모리 저장소"""
+
+    def __init__(self, run_key: str):
+        self.run_key = run_key
+        self.runs = {
+            run_key: {
+                "run_key": run_key,
+                "status": stock_service.RUN_RUNNING,
+                "pending": [{"symbol": s, "country": "US"} for s in SYMBOLS],
+                "done": {},
+                "total": len(SYMBOLS),
+            }
+        }
+        self.leases = {}
+        self.fetch_counts = {}
+        self.owners = set()
+        self.saved = {}
+
+    async def get_update_run(self, run_key):
+        return self.runs.get(run_key)
+
+    async def upsert_update_run(self, record):
+        # 재개 판단은 처음 읽은 체크포인트로 끝나므로 실행 중 갱신은 기록만 함
+        return 1, None
+
+    async def acquire_stock_price_leases(self, symbol_dates, owner, ttl_seconds):
+        self.owners.add(owner)
+        now = datetime.now(timezone.utc)
+        for symbol, date in symbol_dates.items():
+            lease = self.leases.get((symbol, date))
+            if lease is None or lease["expires_at"] < now:
+                self.leases[(symbol, date)] = {
+                    "owner": owner,
+                    "expires_at": now + timedelta(seconds=ttl_seconds),
+                }
+        acquired = [
+            symbol
+            for symbol, date in symbol_dates.items()
+            if self.leases[(symbol, date)]["owner"] == owner
+        ]
+        return acquired, None
+
+    async def release_stock_price_leases(self, symbols, owner):
+        released = [
+            key for key, lease in self.leases.items() if key[0] in symbols and lease["owner"] == owner
+        ]
+        for key in released:
+            del self.leases[key]
+        return len(released), None
+
+    async def get_stock_prices_for_dates(self, symbol_dates):
+        return {s: self.saved[s] for s in symbol_dates if s in self.saved}
+
+    async def upsert_stock_prices(self, records):
+        for record in records:
+            self.saved[record["symbol"]] = record
+        return len(records), {}
+
+    async def fetch_quotes(self, stocks):
+        # 두 실행이 겹치도록 조회마다 잠시 대기
+        await asyncio.sleep(0.05)
+        results = {}
+        for stock in stocks:
+            symbol = stock["symbol"]
+            self.fetch_counts[symbol] = self.fetch_counts.get(symbol, 0) + 1
+            results[symbol] = (
+                {"symbol": symbol, "price": 1.0, "currency": "USD", "name": symbol, "changePercent": None},
+                None,
+            )
+        return results
+
+
+async def _noop_count(*args, **kwargs):
+    return 0, None
+
+
+async def _no_metadata(symbols):
+    return {}
+
+
+async def _no_failures():
+    return {}
+
+
+def _install(store: InMemoryStore) -> None:
+    stock_service.get_update_run = store.get_update_run
+    stock_service.upsert_update_run = store.upsert_update_run
+    stock_service.acquire_stock_price_leases = store.acquire_stock_price_leases
+    stock_service.release_stock_price_leases = store.release_stock_price_leases
+    stock_service.get_symbol_failures = _no_failures
+    stock_service.get_symbols_metadata = _no_metadata
+    stock_service.upsert_stock_prices = store.upsert_stock_prices
+    stock_service.get_stock_prices_for_dates = store.get_stock_prices_for_dates
+    stock_service.touch_managed_stocks_fetched = _noop_count
+    stock_service.quote_router.fetch_quotes = store.fetch_quotes
+    symbol_quarantine.upsert_symbol_failures = _noop_count
+    symbol_quarantine.delete_symbol_failures = _noop_count
+    stock_service.settings.stock_price_lease_enabled = True
+    stock_service.settings.update_checkpoint_chunk_size = 5
+
+
+def test_concurrent_resumed_runs_do_not_share_leases():
+    """같은 체크포인트를 동시에 재개한 두 실행이 같은 심볼을 중복 조회하지 않음"""
+    store = InMemoryStore(stock_service.build_run_key(None, None))
+    _install(store)
+
+    async def run_both():
+        return await asyncio.gather(
+            stock_service.update_stock_prices(), stock_service.update_stock_prices()
+        )
+
+    first, second = asyncio.run(run_both())
+
+    duplicated = {s: n for s, n in store.fetch_counts.items() if n > 1}
+    assert not duplicated, f"중복 조회된 심볼: {duplicated}"
+    assert len(store.owners) == 2, f"리스 소유자가 실행마다 달라야 함: {store.owners}"
+    assert sorted(store.fetch_counts) == SYMBOLS
+    assert sorted(store.saved) == SYMBOLS
+    # 한쪽이 보류한 심볼은 다른 쪽이 저장하므로 보류 수는 전체를 넘지 않음
+    assert first["deferredCount"] + second["deferredCount"] <= len(SYMBOLS)
+    assert not store.leases, "저장이 끝난 심볼의 리스는 해제되어야 함"
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        test_concurrent_resumed_runs_do_not_share_leases()
+        print("✅ 동시에 재개한 실행이 같은 심볼을 중복 조회하지 않습니다.")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"❌ 테스트 실패: {e}")
+        sys.exit(1)